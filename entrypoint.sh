@@ -35,7 +35,7 @@ echo "Starting container initialization..."
 echo "yay for progress displays"
 
 # Validate required environment variables
-echo "[1/5] Validating environment variables..."
+echo "[1/3] Validating environment variables..."
 MISSING_VARS=""
 [ -z "$DB_NAME" ] && MISSING_VARS="$MISSING_VARS DB_NAME"
 [ -z "$DB_USER" ] && MISSING_VARS="$MISSING_VARS DB_USER"
@@ -49,54 +49,18 @@ if [ -n "$MISSING_VARS" ]; then
 fi
 echo "    Environment variables OK"
 
-# Wait for database to be ready
-echo "[2/5] Waiting for PostgreSQL at $DB_HOST:$DB_PORT..."
-MAX_RETRIES=30
-RETRY_COUNT=0
-while ! python -c "import psycopg2; psycopg2.connect(dbname='$DB_NAME', user='$DB_USER', password='$DB_PASSWORD', host='$DB_HOST', port='$DB_PORT')" 2>/dev/null; do
-    RETRY_COUNT=$((RETRY_COUNT + 1))
-    if [ $RETRY_COUNT -ge $MAX_RETRIES ]; then
-        echo "!!! FATAL: Database connection timeout after $MAX_RETRIES attempts"
-        echo "!!! Check PostgreSQL container status and credentials"
-        exit 1
-    fi
-    echo "    Attempt $RETRY_COUNT/$MAX_RETRIES - Database not ready, waiting..."
-    sleep 2
-done
-echo "    PostgreSQL connection established!"
-
-# Run migrations
-echo "[3/5] Applying database migrations..."
-if ! python manage.py migrate --noinput 2>&1; then
-    echo "!!! FATAL: Migration failed"
-    echo "!!! Check Django model definitions and migration files"
+# Wait for the database, migrate if needed and seed an empty database -
+# one Django process instead of a connect loop, migrate, shell and loaddata
+echo "[2/3] Preparing database at $DB_HOST:$DB_PORT..."
+if ! python manage.py bootstrap --wait 60 2>&1; then
+    echo "!!! FATAL: Database bootstrap failed"
+    echo "!!! Check PostgreSQL container status, credentials, migrations and seed_data.json"
     exit 1
 fi
-echo "    Migrations applied successfully"
-
-# Load seed data only if no users exist (first run)
-echo "[4/5] Checking seed data..."
-USER_COUNT=$(python manage.py shell -c "from core.models import User; print(User.objects.count())" 2>/dev/null || echo "ERROR")
-
-if [ "$USER_COUNT" = "ERROR" ]; then
-    echo "!!! WARNING: Could not query user count, attempting seed anyway..."
-    USER_COUNT=0
-fi
-
-if [ "$USER_COUNT" -eq "0" ]; then
-    echo "    No users found, loading seed data..."
-    if ! python manage.py loaddata core/fixtures/seed_data.json 2>&1; then
-        echo "!!! FATAL: Failed to load seed data"
-        echo "!!! Check seed_data.json for valid JSON and correct model references"
-        exit 1
-    fi
-    echo "    Seed data loaded successfully!"
-else
-    echo "    Database already seeded ($USER_COUNT users found), skipping..."
-fi
+echo "    Database ready"
 
 # Start server
-echo "[5/5] Starting Django server..."
+echo "[3/3] Starting Django server..."
 echo ""
 echo "============================================="
 echo "   B-EV Case Management System READY"
@@ -110,9 +74,33 @@ echo "     - user_basis     (BASIS role)"
 echo "     - user_erweitert (ERWEITERT role)"
 echo "     - user_admin     (ADMIN role)"
 echo ""
+echo "   Server mode: ${SERVER_MODE:-runserver}"
 echo "   Press Ctrl+C to stop the server"
 echo "============================================="
 echo ""
 
-# Start Django development server
-exec python manage.py runserver 0.0.0.0:8002
+# Start server - SERVER_MODE selects how:
+#   runserver (default)  Django development server, single process
+#   gunicorn             production WSGI: gunicorn workers (see gunicorn.conf.py)
+#   uvicorn              production ASGI: uvicorn workers managed by gunicorn
+SERVER_MODE=${SERVER_MODE:-runserver}
+
+case "$SERVER_MODE" in
+    gunicorn|uvicorn)
+        echo "Collecting static files..."
+        python manage.py collectstatic --noinput
+        if [ "$SERVER_MODE" = "uvicorn" ]; then
+            export GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker
+            exec gunicorn -c gunicorn.conf.py B_EV.asgi:application
+        fi
+        exec gunicorn -c gunicorn.conf.py B_EV.wsgi:application
+        ;;
+    runserver)
+        # Start Django development server
+        exec python manage.py runserver 0.0.0.0:8002
+        ;;
+    *)
+        echo "!!! FATAL: Unknown SERVER_MODE '$SERVER_MODE' (runserver, gunicorn or uvicorn)"
+        exit 1
+        ;;
+esac
@@ -0,0 +1,16 @@
+"""
+Celery application for B_EV.
+
+Start a worker with:
+    celery -A B_EV worker -l info
+Configuration comes from the CELERY_* entries in settings.py.
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'B_EV.settings')
+
+app = Celery('B_EV')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -34,6 +34,8 @@ SECRET_KEY = os.getenv('SECRET_KEY', 'django-insecure-fallback-key-only-for-test
 DEBUG = os.getenv('DEBUG', 'False') == 'True'
 
 ALLOWED_HOSTS = ['localhost', '127.0.0.1', 'testserver']
+# extra host names for production serving, comma separated
+ALLOWED_HOSTS += [host.strip() for host in os.getenv('ALLOWED_HOSTS', '').split(',') if host.strip()]
 
 
 
@@ -46,12 +48,17 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # pg_trgm lookups for the alias search
+    'django_filters',  # facet filters on the case list
     'core'
 ]
 
 # custom user model
 AUTH_USER_MODEL = 'core.User'
 
+# loads role + permissions with the user and caches it (core/backends.py)
+AUTHENTICATION_BACKENDS = ['core.backends.CachedRoleBackend']
+
 LOGIN_URL = '/login/'  # ← ADD THIS
 LOGIN_REDIRECT_URL = '/cases/'  # ← ADD THIS (where to go after successful login)
 LOGOUT_REDIRECT_URL = '/login/'  # ← ADD THIS (where to go after logout)
@@ -59,10 +66,13 @@ LOGOUT_REDIRECT_URL = '/login/'  # ← ADD THIS (where to go after logout)
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # serves collected static files when running under gunicorn (no runserver)
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.SessionActivityMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -80,6 +90,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.permissions',
             ],
         },
     },
@@ -90,6 +101,7 @@ WSGI_APPLICATION = 'B_EV.wsgi.application'
 
 # Database
 # changing to postgresql
+# Driver: psycopg 3 (requirements.txt), which Django picks over psycopg2
 
 DATABASES = {
     'default': {
@@ -102,9 +114,70 @@ DATABASES = {
         'OPTIONS': {
             'connect_timeout': 10, #timeout for connection so it doesnt hang when its unreachable
         },
+        # Reuse the connection of a worker across requests instead of paying
+        # TCP + auth on every request; 0 = close after each request.
+        # Under ASGI (SERVER_MODE=uvicorn) sync queries run in a thread pool
+        # and persistent connections pile up per thread, so the default is 0
+        'CONN_MAX_AGE': int(os.getenv(
+            'DB_CONN_MAX_AGE', '0' if os.getenv('SERVER_MODE') == 'uvicorn' else '60'
+        )),
+        # Ping a reused connection before the request uses it, so a database
+        # restart costs one reconnect instead of a failed request
+        'CONN_HEALTH_CHECKS': True,
+        # Behind PgBouncer in transaction pooling mode named server-side
+        # cursors (QuerySet.iterator()) do not survive between transactions
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DB_PGBOUNCER', 'False') == 'True',
     }
 }
 
+# Connection pool per worker process (psycopg 3 pool, Django >= 5.1).
+# Replaces persistent connections: Django rejects CONN_MAX_AGE together with a pool.
+if os.getenv('DB_POOL', 'False') == 'True':
+    from psycopg_pool import ConnectionPool
+
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+        # seconds a request waits for a free connection before failing
+        'timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+        # health check when a connection is handed out
+        'check': ConnectionPool.check_connection,
+    }
+
+
+# Cache
+# Shared Redis cache when REDIS_URL is set (sessions, permission cache and
+# counts are then shared by all workers), otherwise per-process memory.
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
+# Sessions
+# With Redis: read from the shared cache, written through to the database
+# so a cache restart does not log everybody out. Without it the cache is
+# per process and a logout in one worker would leave the session alive in
+# the others' caches, so sessions are read from the database directly.
+# Activity is tracked in core.Session (core/middleware.py), written at most
+# once per minute per session. Run `python manage.py cleanup_sessions`
+# regularly (cron): it runs clearsessions and purges ended core.Session rows.
+if os.getenv('REDIS_URL'):
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -159,6 +232,35 @@ DATETIME_INPUT_FORMATS = [
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
 STATIC_URL = 'static/'
+# target of collectstatic, served by WhiteNoise in the production serving mode
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    # gzip/brotli copies are written at collectstatic time, not per request
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedStaticFilesStorage',
+    },
+}
+
+# Uploaded / generated files (PDF reports). Not served as public URLs,
+# downloads go through permission-checked views.
+MEDIA_ROOT = BASE_DIR / 'media'
+
+
+# Background jobs (PDF reports, see core/services/report_jobs.py)
+# 'thread' = in-process worker pool, 'celery' = Celery worker via broker, 'sync' = inline
+REPORT_JOB_BACKEND = os.getenv('REPORT_JOB_BACKEND', 'thread')
+
+# Finished reports (PDF + job row) are deleted after this many hours by
+# `python manage.py cleanup_report_jobs` (run it from cron)
+REPORT_JOB_EXPIRY_HOURS = int(os.getenv('REPORT_JOB_EXPIRY_HOURS', '24'))
+
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TIMEZONE = TIME_ZONE
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -0,0 +1,65 @@
+"""
+Authentication backend of the core app.
+
+Django's AuthenticationMiddleware loads request.user through the backend's
+get_user() on every request; role and permissions were then fetched
+lazily with two more queries. This backend joins both into the user query
+and keeps the resolved user in the cache for USER_CACHE_SECONDS.
+
+The cache may be per process (LocMem), where the invalidation in
+core/signals.py only reaches the current worker. So on a cache hit the
+password hash, is_active, is_staff, is_superuser and role_id are still
+read from the database (one primary key lookup): deactivating a user,
+revoking admin rights or changing a password takes effect on the next
+request in every worker, a changed role reloads the user. Only the
+role's PermissionSet may be served stale, for at most USER_CACHE_SECONDS
+(the same TTL as the permission cache).
+"""
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from core.models import User
+from core.permissions import PERMISSION_CACHE_SECONDS
+
+
+USER_CACHE_SECONDS = PERMISSION_CACHE_SECONDS
+
+
+def user_cache_key(user_id) -> str:
+    return f'auth:user:{user_id}'
+
+
+def invalidate_cached_users(user_ids) -> None:
+    cache.delete_many([user_cache_key(user_id) for user_id in user_ids])
+
+
+class CachedRoleBackend(ModelBackend):
+    """
+    ModelBackend whose get_user() loads role__permissions with the user
+    and serves repeated lookups from the cache.
+    """
+
+    def get_user(self, user_id):
+        cache_key = user_cache_key(user_id)
+        user = cache.get(cache_key)
+        if user is not None:
+            current = User._default_manager.filter(pk=user_id).values(
+                'password', 'is_active', 'is_staff', 'is_superuser', 'role_id'
+            ).first()
+            if current is None:
+                cache.delete(cache_key)
+                return None
+            if current['role_id'] != user.role_id:
+                user = None
+            else:
+                user.password = current['password']
+                user.is_active = current['is_active']
+                user.is_staff = current['is_staff']
+                user.is_superuser = current['is_superuser']
+        if user is None:
+            try:
+                user = User._default_manager.select_related('role__permissions').get(pk=user_id)
+            except User.DoesNotExist:
+                return None
+            cache.set(cache_key, user, USER_CACHE_SECONDS)
+        return user if self.user_can_authenticate(user) else None
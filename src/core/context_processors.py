@@ -0,0 +1,14 @@
+"""
+Template context processors of the core app.
+"""
+from django.utils.functional import SimpleLazyObject
+
+from core.permissions import get_request_permissions
+
+
+def permissions(request):
+    """
+    Expose the resolved PermissionSet flags as {{ permissions.can_edit_cases }}.
+    Lazy, so pages that never check a flag do not resolve them.
+    """
+    return {'permissions': SimpleLazyObject(lambda: get_request_permissions(request))}
@@ -10,6 +10,8 @@ from functools import wraps
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.decorators import login_required
 
+from core.permissions import get_request_permissions
+
 
 def permission_required_custom(permission_flag):
     """
@@ -31,25 +33,26 @@ def permission_required_custom(permission_flag):
     def decorator(view_func):
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
+            # Role + PermissionSet are resolved once per request (and cached per role)
+            permissions = get_request_permissions(request)
+            
             # Check user has role assigned
-            if not hasattr(request.user, 'role') or request.user.role is None:
+            if not permissions.has_role:
                 raise PermissionDenied(
                     "Benutzer hat keine Rolle zugewiesen. Kontaktieren Sie einen Administrator."
                 )
             
             # Check role has permissions configured
-            if not hasattr(request.user.role, 'permissions') or request.user.role.permissions is None:
+            if not permissions.is_configured:
                 raise PermissionDenied(
                     "Rolle hat keine Berechtigungen konfiguriert. Kontaktieren Sie einen Administrator."
                 )
             
             # Check specific permission flag
-            has_permission = getattr(request.user.role.permissions, permission_flag, False)
-            
-            if not has_permission:
+            if not permissions.has(permission_flag):
                 raise PermissionDenied(
                     f"Fehlende Berechtigung: {permission_flag}. "
-                    f"Ihre Rolle ({request.user.role.name}) erlaubt diese Aktion nicht."
+                    f"Ihre Rolle ({permissions.role_name}) erlaubt diese Aktion nicht."
                 )
             
             return view_func(request, *args, **kwargs)
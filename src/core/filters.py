@@ -0,0 +1,121 @@
+"""
+Filter layer for the case list (django-filter).
+
+FallFilter turns the GET parameters of case_list into a Fall queryset.
+compute_facet_counts() returns the "(n)" numbers shown next to every filter
+option; all counts come from ONE aggregate query with filtered COUNTs,
+instead of one GROUP BY per facet.
+
+Matching composite indexes are declared on Fall / PersonenbezogeneDaten
+(migration 0011).
+"""
+import django_filters
+from django.db.models import Count, Q, QuerySet
+
+from core.models import Fall, PersonenbezogeneDaten
+
+
+class FallFilter(django_filters.FilterSet):
+    """
+    Facet filters for the case list.
+
+    GET parameters:
+        zustaendige_beratungsstelle, status, ist_abgeschlossen, wohnort,
+        letzte_beratung_after / letzte_beratung_before (dates)
+    """
+    zustaendige_beratungsstelle = django_filters.MultipleChoiceFilter(
+        choices=Fall.BERATUNGSSTELLE_CHOICES,
+        label='Beratungsstelle',
+    )
+    status = django_filters.ChoiceFilter(
+        choices=Fall.STATUS_CHOICES,
+        label='Status',
+        empty_label='Alle',
+    )
+    ist_abgeschlossen = django_filters.BooleanFilter(
+        label='Abgeschlossen',
+    )
+    letzte_beratung = django_filters.DateFromToRangeFilter(
+        label='Letzte Beratung',
+    )
+    wohnort = django_filters.MultipleChoiceFilter(
+        field_name='personenbezogene_daten__wohnort',
+        choices=PersonenbezogeneDaten.WOHNORT_CHOICES,
+        label='Wohnort',
+    )
+
+    class Meta:
+        model = Fall
+        fields = [
+            'zustaendige_beratungsstelle',
+            'status',
+            'ist_abgeschlossen',
+            'letzte_beratung',
+            'wohnort',
+        ]
+
+
+# facet name -> (lookup path, choices); every choice becomes one COUNT column
+FACETS = {
+    'zustaendige_beratungsstelle': ('zustaendige_beratungsstelle', Fall.BERATUNGSSTELLE_CHOICES),
+    'status': ('status', Fall.STATUS_CHOICES),
+    'ist_abgeschlossen': ('ist_abgeschlossen', [(True, 'Ja'), (False, 'Nein')]),
+    'wohnort': ('personenbezogene_daten__wohnort', PersonenbezogeneDaten.WOHNORT_CHOICES),
+}
+
+
+def compute_facet_counts(queryset: QuerySet) -> dict:
+    """
+    Count the rows of `queryset` per facet value in a single query.
+
+    Returns:
+        {facet_name: [(value, label, count), ...], ...}
+    """
+    aggregates = {}
+    for facet_name, (lookup, choices) in FACETS.items():
+        for index, (value, _label) in enumerate(choices):
+            aggregates[f'{facet_name}__{index}'] = Count('pk', filter=Q(**{lookup: value}))
+
+    # order_by() drops the list ordering, it would only slow the aggregate down
+    totals = queryset.order_by().aggregate(**aggregates)
+
+    return {
+        facet_name: [
+            (value, label, totals[f'{facet_name}__{index}'])
+            for index, (value, label) in enumerate(choices)
+        ]
+        for facet_name, (_lookup, choices) in FACETS.items()
+    }
+
+
+def build_facet_options(facet_counts: dict, data) -> dict:
+    """
+    Mark the currently selected values for the template.
+
+    Args:
+        facet_counts: result of compute_facet_counts()
+        data: the GET QueryDict the FallFilter was bound to
+
+    Returns:
+        {facet_name: [{'value', 'label', 'count', 'selected'}, ...], ...}
+    """
+    options = {}
+    for facet_name, entries in facet_counts.items():
+        selected_values = set(data.getlist(facet_name))
+        options[facet_name] = [
+            {
+                'value': _as_param(value),
+                'label': label,
+                'count': count,
+                'selected': _as_param(value) in selected_values,
+            }
+            for value, label, count in entries
+        ]
+    return options
+
+
+def _as_param(value) -> str:
+    """GET representation of a facet value (booleans as 'true'/'false')."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
@@ -7,13 +7,14 @@ Exports all form classes for easy import in views.
 from .fall_forms import FallCreateForm
 from .beratung_forms import BeratungForm
 from .gewalttat_forms import GewalttatForm, TAETER_GESCHLECHT_CHOICES, TAETER_VERHAELTNIS_CHOICES
-from .folgen_forms import FolgenDerGewaltForm
+from .folgen_forms import FolgenDerGewaltForm, FolgenBulkAddForm
 
 __all__ = [
     'FallCreateForm',
     'BeratungForm',
     'GewalttatForm',
     'FolgenDerGewaltForm',
+    'FolgenBulkAddForm',
     'TAETER_GESCHLECHT_CHOICES',
     'TAETER_VERHAELTNIS_CHOICES',
 ]
@@ -5,8 +5,73 @@ Uses Django ModelForm for Fall_FolgenDerGewalt junction table.
 Allows selecting a consequence type and adding optional details.
 """
 
+import uuid
 from django import forms
-from core.models import FolgenDerGewalt, Fall_FolgenDerGewalt
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from core.models import Fall, FolgenDerGewalt, Fall_FolgenDerGewalt
+from core.services.reference_data import folgen_cache
+
+
+class CachedFolgeField(forms.ModelChoiceField):
+    """
+    Single choice over FolgenDerGewalt backed by the cached reference snapshot.
+    The form sets `available` (the selectable folgen); choices and cleaning
+    are computed from it without touching the database.
+    """
+    
+    def set_available(self, folgen):
+        self.available = {str(folge.folge_id): folge for folge in folgen}
+        self.choices = [('', self.empty_label)] + [
+            (folge_id, str(folge)) for folge_id, folge in self.available.items()
+        ]
+    
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            folge = self.available.get(str(uuid.UUID(str(value))))
+        except ValueError:
+            folge = None
+        if folge is None:
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return folge
+
+
+class CachedFolgenMultipleField(forms.ModelMultipleChoiceField):
+    """
+    Multiple choice over FolgenDerGewalt backed by the cached reference snapshot.
+    Choices are grouped by Kategorie for the checkbox list.
+    """
+    
+    def set_available(self, folgen):
+        self.available = {str(folge.folge_id): folge for folge in folgen}
+        kategorien = dict(FolgenDerGewalt.FOLGEN_KATEGORIE_CHOICES)
+        grouped = {}
+        for folge_id, folge in self.available.items():
+            label = kategorien.get(folge.kategorie, folge.kategorie)
+            grouped.setdefault(label, []).append((folge_id, folge.name))
+        self.choices = list(grouped.items())
+    
+    def _check_values(self, value):
+        folgen = []
+        for pk in value:
+            try:
+                folge = self.available.get(str(uuid.UUID(str(pk))))
+            except ValueError:
+                folge = None
+            if folge is None:
+                raise ValidationError(
+                    self.error_messages['invalid_choice'],
+                    code='invalid_choice',
+                    params={'value': pk},
+                )
+            folgen.append(folge)
+        return folgen
 
 
 class FolgenDerGewaltForm(forms.ModelForm):
@@ -19,7 +84,7 @@ class FolgenDerGewaltForm(forms.ModelForm):
     """
     
     # Override folge field to show hierarchical display
-    folge = forms.ModelChoiceField(
+    folge = CachedFolgeField(
         queryset=FolgenDerGewalt.objects.all().order_by('kategorie', 'name'),
         widget=forms.Select(attrs={'class': 'form-control'}),
         label='Folge der Gewalt',
@@ -52,21 +117,23 @@ class FolgenDerGewaltForm(forms.ModelForm):
         self.fall = kwargs.pop('fall', None)
         super().__init__(*args, **kwargs)
         
-        # Get the folge field (it's a ModelChoiceField with queryset attribute)
-        folge_field = self.fields['folge']
         self.fields['weitere_informationen'].required = False
         
-        # If adding new (not editing), exclude already linked consequences
-        if self.fall and not self.instance.pk:
-            # Get already linked consequence IDs
-            existing_folgen_ids = Fall_FolgenDerGewalt.objects.filter(
-                fall=self.fall
-            ).values_list('folge_id', flat=True)
-            
-            # Exclude them from the queryset
-            folge_field.queryset = FolgenDerGewalt.objects.exclude(  # type: ignore[union-attr]
-                folge_id__in=existing_folgen_ids
-            ).order_by('kategorie', 'name')
+        # Already linked consequences: the only query, the rest comes from the snapshot
+        self.linked_folgen_ids = set()
+        if self.fall:
+            self.linked_folgen_ids = {
+                str(folge_id) for folge_id in Fall_FolgenDerGewalt.objects.filter(
+                    fall=self.fall
+                ).values_list('folge_id', flat=True)
+            }
+        
+        # Exclude linked consequences (except the one being edited)
+        self.available_folgen = folgen_cache.get().available(
+            self.linked_folgen_ids,
+            keep_id=self.instance.folge_id if self.instance.pk else None,
+        )
+        self.fields['folge'].set_available(self.available_folgen)  # type: ignore[attr-defined]
     
     def clean(self):
         """
@@ -76,8 +143,8 @@ class FolgenDerGewaltForm(forms.ModelForm):
         folge = cleaned_data.get('folge')
         
         if self.fall and folge and not self.instance.pk:
-            # Check for existing link
-            if Fall_FolgenDerGewalt.objects.filter(fall=self.fall, folge=folge).exists():
+            # Check for existing link (unique_together still guards races)
+            if str(folge.folge_id) in self.linked_folgen_ids:
                 raise forms.ValidationError(
                     f'Die Folge "{folge.name}" ist bereits mit diesem Fall verknüpft.'
                 )
@@ -94,6 +161,48 @@ class FolgenDerGewaltForm(forms.ModelForm):
             folgen_relation.fall = self.fall
         
         if commit:
-            folgen_relation.save()
+            with transaction.atomic():
+                if self.fall and not self.instance.pk:
+                    # same case lock as FallManager.linkFolgen
+                    list(Fall.objects.select_for_update().filter(pk=self.fall.pk).values_list('pk', flat=True))
+                folgen_relation.save()
         
         return folgen_relation
+
+
+class FolgenBulkAddForm(forms.Form):
+    """
+    Form for linking many consequences to a case in one submit.
+    Replaces the "Save & Add Another" loop when a case has many Folgen.
+    """
+    
+    folgen = CachedFolgenMultipleField(
+        queryset=FolgenDerGewalt.objects.all().order_by('kategorie', 'name'),
+        widget=forms.CheckboxSelectMultiple,
+        label='Folgen der Gewalt',
+        error_messages={'required': 'Bitte wählen Sie mindestens eine Folge aus.'},
+    )
+    weitere_informationen = forms.CharField(
+        required=False,
+        label='Weitere Informationen',
+        widget=forms.Textarea(attrs={
+            'rows': 3,
+            'class': 'form-control',
+            'placeholder': 'Optional, wird für alle ausgewählten Folgen übernommen...'
+        }),
+    )
+    
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize form with Fall instance; only unlinked consequences are offered.
+        """
+        self.fall = kwargs.pop('fall')
+        super().__init__(*args, **kwargs)
+        
+        linked_folgen_ids = {
+            str(folge_id) for folge_id in Fall_FolgenDerGewalt.objects.filter(
+                fall=self.fall
+            ).values_list('folge_id', flat=True)
+        }
+        self.available_folgen = folgen_cache.get().available(linked_folgen_ids)
+        self.fields['folgen'].set_available(self.available_folgen)  # type: ignore[attr-defined]
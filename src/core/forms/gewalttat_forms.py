@@ -7,11 +7,13 @@ Also the form where we finally got the dynamic formset working lol
 """
 
 import json
+import uuid
 from django import forms
 from django.core.exceptions import ValidationError
 from core.models import Gewalttat, GewalttatArt
 from core.models.fall_models import PersonenbezogeneDaten
-from core.validators.json_validators import validate_taeterinnen_details
+from core.services.reference_data import gewalttat_art_cache
+from core.validators.json_validators import validate_taeterinnen_details, taeterinnen_validation_scope
 
 
 # choices for taeterinnen dynamic formset - reuse from PersonenbezogeneDaten
@@ -31,6 +33,39 @@ TAETER_VERHAELTNIS_CHOICES = [
 ]
 
 
+class CachedGewalttatArtField(forms.ModelMultipleChoiceField):
+    """
+    Multiple choice over GewalttatArt that checks submitted ids against the
+    cached hierarchy instead of querying the table (services/reference_data.py).
+    """
+    
+    def _check_values(self, value):
+        try:
+            value = frozenset(value)
+        except TypeError:
+            raise ValidationError(self.error_messages['invalid_list'], code='invalid_list')
+        
+        by_id = gewalttat_art_cache.get().by_id
+        selected = []
+        for pk in value:
+            try:
+                art = by_id.get(str(uuid.UUID(str(pk))))
+            except ValueError:
+                raise ValidationError(
+                    self.error_messages['invalid_pk_value'],
+                    code='invalid_pk_value',
+                    params={'pk': pk},
+                )
+            if art is None:
+                raise ValidationError(
+                    self.error_messages['invalid_choice'],
+                    code='invalid_choice',
+                    params={'value': pk},
+                )
+            selected.append(art)
+        return selected
+
+
 class GewalttatForm(forms.ModelForm):
     """
     Form for adding/editing violence incidents.
@@ -44,7 +79,7 @@ class GewalttatForm(forms.ModelForm):
     
     # Override M2M field to use checkboxes instead of default multi-select
     # template renders these hierarchically with JS for subcategory handling
-    gewalttat_arten = forms.ModelMultipleChoiceField(
+    gewalttat_arten = CachedGewalttatArtField(
         queryset=GewalttatArt.objects.all(),
         widget=forms.CheckboxSelectMultiple,
         label="Art der Gewalt",
@@ -136,40 +171,32 @@ class GewalttatForm(forms.ModelForm):
         # template uses this to show parent/child checkbox relationships
         self._build_gewalttat_hierarchy()
     
+    def full_clean(self):
+        """
+        Validate the form and the model instance in one validation scope:
+        the parsed taeterinnen_details list is checked once, not three times.
+        """
+        with taeterinnen_validation_scope():
+            super().full_clean()
+    
     def _build_gewalttat_hierarchy(self):
         """
         Prepares hierarchical data for gewalttat_arten checkboxes.
         Groups main categories with their subcategories for proper rendering.
         Basically the secret sauce for the conditional subcategory display
         """
-        all_arten = GewalttatArt.objects.all().order_by('name')
-        
-        # separate main categories from subcategories
-        main_categories = []
-        subcategories_map = {}  # hauptkategorie_id -> [subcats]
-        
-        for art in all_arten:
-            if not art.ist_unterkategorie:
-                main_categories.append(art)
-                subcategories_map[str(art.art_id)] = []
-            else:
-                parent_id = str(art.hauptkategorie_id) if art.hauptkategorie_id else None
-                if parent_id and parent_id in subcategories_map:
-                    subcategories_map[parent_id].append(art)
+        # static reference data: cached and only rebuilt after admin changes
+        hierarchy = gewalttat_art_cache.get()
         
         # store for template access
         self.gewalttat_hierarchy = {
-            'main_categories': main_categories,
-            'subcategories_map': subcategories_map,
+            'main_categories': hierarchy.main_categories,
+            'subcategories_map': hierarchy.subcategories_map,
         }
         
-        # find the Sexuelle Belästigung category for JS reference
+        # Sexuelle Belästigung category id for JS reference
         # need this id in template for conditional subcategory logic
-        self.sexuelle_belaestigung_id = None
-        for art in main_categories:
-            if 'Sexuelle Belästigung' in art.name and not art.ist_unterkategorie:
-                self.sexuelle_belaestigung_id = str(art.art_id)
-                break
+        self.sexuelle_belaestigung_id = hierarchy.sexuelle_belaestigung_id
     
     def clean_taeterinnen_details(self):
         """
@@ -0,0 +1,75 @@
+"""
+Compare per-request database latency: new connection per request vs. the
+configured connection handling (CONN_MAX_AGE / DB_POOL).
+
+Each simulated request does what Django does around a view: close
+unusable/expired connections at request start and end, and runs one
+small query in between. The baseline uses a separate connection with
+CONN_MAX_AGE=0 and no pool, i.e. TCP connect + auth on every request.
+
+Usage:
+    python manage.py benchmark_db_connections
+    python manage.py benchmark_db_connections --requests 500
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def _simulate_requests(db, anzahl: int) -> list[float]:
+    """Run `anzahl` request cycles on `db`, return latencies in ms."""
+    latencies = []
+    for _ in range(anzahl):
+        started = time.perf_counter()
+        db.close_if_unusable_or_obsolete()
+        with db.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        db.close_if_unusable_or_obsolete()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def _direct_connection(db):
+    """A second wrapper for the same database without reuse or pool."""
+    settings_dict = dict(db.settings_dict)
+    settings_dict['CONN_MAX_AGE'] = 0
+    settings_dict['OPTIONS'] = {
+        key: value for key, value in settings_dict['OPTIONS'].items() if key != 'pool'
+    }
+    return type(db)(settings_dict, alias='benchmark_direct')
+
+
+class Command(BaseCommand):
+    help = "Measure per-request DB latency with and without connection reuse"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Simulated requests per variant')
+
+    def _report(self, label, latencies):
+        quantiles = statistics.quantiles(latencies, n=20)
+        self.stdout.write(
+            f"{label:<28} Mittel {statistics.mean(latencies):7.2f} ms   "
+            f"p50 {statistics.median(latencies):7.2f} ms   p95 {quantiles[18]:7.2f} ms"
+        )
+
+    def handle(self, *args, **options):
+        anzahl = options['requests']
+        db = connections[DEFAULT_DB_ALIAS]
+        settings_dict = db.settings_dict
+        if settings_dict['OPTIONS'].get('pool'):
+            konfiguriert = 'Pool'
+        else:
+            konfiguriert = f"CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}"
+        self.stdout.write(f"{anzahl} Requests je Variante gegen {db.vendor}")
+
+        direct = _direct_connection(db)
+        try:
+            self._report('neue Verbindung je Request', _simulate_requests(direct, anzahl))
+        finally:
+            direct.close()
+
+        db.close()
+        self._report(konfiguriert, _simulate_requests(db, anzahl))
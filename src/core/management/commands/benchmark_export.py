@@ -0,0 +1,80 @@
+"""
+Compare peak memory of the case export: openpyxl write-only vs. pandas.
+
+The pandas variant is the one from the "Using Django for Export" notes
+(DataFrame(queryset.values(...)).to_excel()); it needs pandas, which is
+not in requirements.txt (pip install pandas). Without pandas the command
+fails unless --ohne-pandas is given. Peak memory is measured with tracemalloc.
+
+Usage:
+    python manage.py benchmark_export
+    python manage.py benchmark_export --limit 100000
+    python manage.py benchmark_export --ohne-pandas
+"""
+import io
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Fall
+from core.services.case_export import case_export_queryset
+from core.services.xlsx_export import build_case_workbook
+
+
+def _measure(func):
+    """Run func, return (seconds, peak traced memory in MiB)."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        func()
+        elapsed = time.perf_counter() - started
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+class Command(BaseCommand):
+    help = "Measure peak memory of the XLSX case export (write-only vs. pandas)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='Only export the newest N cases')
+        parser.add_argument('--ohne-pandas', action='store_true', help='Only measure the write-only export')
+
+    def handle(self, *args, **options):
+        pd = None
+        if not options['ohne_pandas']:
+            try:
+                import pandas as pd
+            except ImportError:
+                raise CommandError(
+                    "pandas ist nicht installiert (pip install pandas), "
+                    "für den Vergleich ohne pandas --ohne-pandas angeben"
+                )
+
+        cases = Fall.objects.all()
+        if options['limit']:
+            limited_ids = list(
+                cases.order_by('-erstellungsdatum', '-fall_id').values_list('pk', flat=True)[:options['limit']]
+            )
+            cases = Fall.objects.filter(pk__in=limited_ids)
+        anzahl = cases.count()
+        self.stdout.write(f"Exportiere {anzahl} Fälle")
+
+        def write_only():
+            build_case_workbook(cases).close()
+
+        elapsed, peak = _measure(write_only)
+        self.stdout.write(f"openpyxl write-only: {elapsed:6.2f} s, Peak {peak:8.1f} MiB")
+
+        if pd is None:
+            return
+
+        def with_pandas():
+            frame = pd.DataFrame(list(case_export_queryset(cases)))
+            frame['fall_id'] = frame['fall_id'].astype(str)
+            frame.to_excel(io.BytesIO(), index=False)
+
+        elapsed, peak = _measure(with_pandas)
+        self.stdout.write(f"pandas DataFrame:    {elapsed:6.2f} s, Peak {peak:8.1f} MiB")
@@ -0,0 +1,77 @@
+"""
+Prepare the database for serving, in one Django process.
+
+1. wait until the database accepts connections
+2. migrate, but only if the migration graph has unapplied migrations
+3. bulk-load the seed fixture if there are no users yet (see load_seed)
+
+Replaces the separate psycopg2 connect loop, `migrate`, `shell -c` user
+count and `loaddata` calls of entrypoint.sh, each of which booted Django.
+
+Usage:
+    python manage.py bootstrap
+    python manage.py bootstrap --wait 120 --no-seed
+"""
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from core.models import User
+from core.services.seed_loader import SEED_FIXTURE, load_fixtures
+
+# Seconds between connection attempts while waiting for the database
+RETRY_INTERVAL_SECONDS = 2
+
+
+class Command(BaseCommand):
+    help = "Wait for the database, apply pending migrations and seed an empty database"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wait', type=int, default=60, help='Seconds to wait for the database')
+        parser.add_argument('--fixture', default=SEED_FIXTURE, help='Seed fixture for an empty database')
+        parser.add_argument('--no-seed', action='store_true', help='Never load seed data')
+
+    def handle(self, *args, **options):
+        connection = connections[DEFAULT_DB_ALIAS]
+
+        self._wait_for_database(connection, options['wait'])
+
+        plan = self._pending_migrations(connection)
+        if plan:
+            self.stdout.write(f"{len(plan)} ausstehende Migration(en), wende an...")
+            call_command('migrate', interactive=False, verbosity=options['verbosity'])
+        else:
+            self.stdout.write("Datenbank ist auf dem aktuellen Migrationsstand")
+
+        if options['no_seed']:
+            return
+        if User.objects.exists():
+            self.stdout.write("Seed-Daten bereits vorhanden, überspringe")
+            return
+        self.stdout.write(f"Keine Benutzer gefunden, lade {options['fixture']}...")
+        counts = load_fixtures([options['fixture']])
+        self.stdout.write(self.style.SUCCESS(f"{sum(counts.values())} Seed-Objekte geladen"))
+
+    def _wait_for_database(self, connection, wait_seconds: int) -> None:
+        deadline = time.monotonic() + wait_seconds
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                connection.ensure_connection()
+                self.stdout.write("Datenbankverbindung hergestellt")
+                return
+            except OperationalError as e:
+                connection.close()
+                if time.monotonic() >= deadline:
+                    raise CommandError(f"Datenbank nach {wait_seconds} s nicht erreichbar: {e}")
+                self.stdout.write(f"Versuch {attempt}: Datenbank nicht bereit, warte...")
+                time.sleep(RETRY_INTERVAL_SECONDS)
+
+    def _pending_migrations(self, connection) -> list:
+        """Unapplied migrations, read from the graph without running anything."""
+        executor = MigrationExecutor(connection)
+        return executor.migration_plan(executor.loader.graph.leaf_nodes())
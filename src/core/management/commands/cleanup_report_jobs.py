@@ -0,0 +1,20 @@
+"""
+Delete expired report jobs and their PDF files.
+
+Usage (e.g. hourly from cron):
+    python manage.py cleanup_report_jobs
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.services.report_jobs import ReportJobManager
+
+
+class Command(BaseCommand):
+    help = "Delete report jobs older than REPORT_JOB_EXPIRY_HOURS together with their PDF files"
+
+    def handle(self, *args, **options):
+        deleted = ReportJobManager.deleteExpiredJobs()
+        self.stdout.write(self.style.SUCCESS(
+            f"{deleted} abgelaufene Reports gelöscht (älter als {settings.REPORT_JOB_EXPIRY_HOURS} Stunden)"
+        ))
@@ -0,0 +1,19 @@
+"""
+Delete expired Django sessions and ended core.Session rows.
+
+Usage (e.g. daily from cron):
+    python manage.py cleanup_sessions
+"""
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from core.services.session_activity import purge_sessions
+
+
+class Command(BaseCommand):
+    help = "Run clearsessions and delete ended or expired session activity rows"
+
+    def handle(self, *args, **options):
+        call_command('clearsessions')
+        deleted = purge_sessions()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} beendete Sitzungen gelöscht"))
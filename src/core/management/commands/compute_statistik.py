@@ -0,0 +1,24 @@
+"""
+Materialize the Statistikbogen tables of one or more years.
+
+Usage:
+    python manage.py compute_statistik               # current year
+    python manage.py compute_statistik 2024 2025
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.services.statistik_engine import StatistikEngine
+
+
+class Command(BaseCommand):
+    help = "Compute the Statistikbogen tables per Beratungsstelle for the given years"
+
+    def add_arguments(self, parser):
+        parser.add_argument('jahre', nargs='*', type=int, help='Years to compute (default: current year)')
+
+    def handle(self, *args, **options):
+        jahre = options['jahre'] or [timezone.now().year]
+        for jahr in jahre:
+            written = StatistikEngine.computeYear(jahr)
+            self.stdout.write(self.style.SUCCESS(f"Statistik {jahr}: {written} Ergebnisse gespeichert"))
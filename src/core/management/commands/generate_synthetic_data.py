@@ -0,0 +1,94 @@
+"""
+Generate synthetic cases for load and scale tests (10k / 100k / 1M cases).
+
+Every case gets PersonenbezogeneDaten, Beratungen, Gewalttaten with valid
+taeterinnen_details and linked Gewalttat Arten / Folgen der Gewalt. Choice
+fields are sampled uniformly unless a distributions file overrides them
+(see services/synthetic_data.py for the format). Rows are bulk-inserted in
+one transaction through BulkLoader; the same --seed and --bis give the
+same data (without --bis the dates end today and shift from day to day).
+
+Derived data is updated for the inserted cases only. --full-rebuild
+recomputes it for the whole database instead (real cases included),
+which needs less memory for very large loads.
+
+Needs the reference data (Gewalttat Arten, Folgen) of the seed fixture
+to link cases to it.
+
+Usage:
+    python manage.py generate_synthetic_data 10000 --seed 42 --bis 2025-12-31
+    python manage.py generate_synthetic_data 1000000 --seed 1 --distributions verteilung.json --full-rebuild
+"""
+import datetime
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.services.seed_loader import BulkLoader, BULK_BATCH_SIZE
+from core.services.synthetic_data import SyntheticDataGenerator, DEFAULT_JAHRE
+
+
+class Command(BaseCommand):
+    help = "Bulk-insert N synthetic cases with configurable value distributions"
+
+    def add_arguments(self, parser):
+        parser.add_argument('anzahl', type=int, help='Number of cases')
+        parser.add_argument('--seed', type=int, default=None, help='RNG seed for reproducible data')
+        parser.add_argument('--distributions', help='JSON file with value weights per field')
+        parser.add_argument('--jahre', type=int, default=DEFAULT_JAHRE, help='Years the cases are spread over')
+        parser.add_argument(
+            '--bis',
+            type=datetime.date.fromisoformat,
+            default=None,
+            help='Last erstellungsdatum (YYYY-MM-DD, default today); fix it for reproducible data',
+        )
+        parser.add_argument('--alias-prefix', default='SYN', help='Prefix of the generated aliases')
+        parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE, help='Rows per INSERT')
+        parser.add_argument(
+            '--full-rebuild',
+            action='store_true',
+            help='Recompute derived data for the whole database instead of only the new cases',
+        )
+
+    def handle(self, *args, **options):
+        anzahl = options['anzahl']
+        if anzahl < 1:
+            raise CommandError("Anzahl muss mindestens 1 sein")
+
+        distributions = {}
+        if options['distributions']:
+            with open(options['distributions'], encoding='utf-8') as stream:
+                distributions = json.load(stream)
+
+        started = time.perf_counter()
+        try:
+            generator = SyntheticDataGenerator(
+                seed=options['seed'],
+                distributions=distributions,
+                jahre=options['jahre'],
+                alias_prefix=options['alias_prefix'],
+                bis=options['bis'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        if not generator.gewalttat_art_ids or not generator.folgen_ids:
+            self.stdout.write(self.style.WARNING(
+                "Keine Referenzdaten gefunden, Fälle werden ohne Gewalttat Arten/Folgen erzeugt (erst load_seed ausführen)"
+            ))
+
+        with transaction.atomic():
+            loader = BulkLoader(
+                batch_size=options['batch_size'],
+                full_rebuild=options['full_rebuild'],
+            )
+            generator.generate(anzahl, loader)
+            counts = loader.finish()
+
+        for label, inserted in counts.items():
+            self.stdout.write(f"{label:<32} {inserted:>9}")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{anzahl} Fälle ({sum(counts.values())} Objekte) in {elapsed:.1f} s erzeugt"
+        ))
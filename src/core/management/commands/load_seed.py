@@ -0,0 +1,43 @@
+"""
+Bulk-load fixtures with bulk_create instead of loaddata's per-object save().
+
+Rows are inserted per model in dependency order; case aggregates and
+Täter:innen rows are updated once at the end (see services/seed_loader.py). Accepts loaddata JSON fixtures and
+JSON Lines files (.jsonl, one object per line) for large staging datasets.
+
+Usage:
+    python manage.py load_seed                                  # core/fixtures/seed_data.json
+    python manage.py load_seed staging.jsonl --full-rebuild
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.seed_loader import BULK_BATCH_SIZE, SEED_FIXTURE, load_fixtures
+
+
+class Command(BaseCommand):
+    help = "Bulk-insert fixture files and recompute derived data once"
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixtures', nargs='*', default=[SEED_FIXTURE], help='JSON or JSON Lines files')
+        parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE, help='Rows per INSERT')
+        parser.add_argument(
+            '--full-rebuild',
+            action='store_true',
+            help='Recompute derived data for the whole database (faster for very large loads)',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        counts = load_fixtures(
+            options['fixtures'],
+            batch_size=options['batch_size'],
+            full_rebuild=options['full_rebuild'],
+        )
+        for label, anzahl in counts.items():
+            self.stdout.write(f"{label:<32} {anzahl:>9}")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{sum(counts.values())} Objekte in {elapsed:.1f} s geladen"
+        ))
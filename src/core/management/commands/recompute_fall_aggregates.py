@@ -0,0 +1,42 @@
+"""
+Repair drift in Fall.beratungsanzahl / Fall.letzte_beratung.
+
+Usage:
+    python manage.py recompute_fall_aggregates            # fix all cases
+    python manage.py recompute_fall_aggregates --dry-run  # only report drift
+    python manage.py recompute_fall_aggregates --fall-id <uuid> --fall-id <uuid>
+"""
+from django.core.management.base import BaseCommand
+
+from core.services.beratung_manager import BeratungManager
+
+
+class Command(BaseCommand):
+    help = "Fix beratungsanzahl and letzte_beratung of all (or given) drifted cases in one UPDATE"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only list cases whose stored aggregates are wrong',
+        )
+        parser.add_argument(
+            '--fall-id',
+            action='append',
+            dest='fall_ids',
+            help='Restrict to this case (can be given multiple times)',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            drifted = BeratungManager.findDriftedFaelle(options['fall_ids'])
+            for row in drifted:
+                self.stdout.write(
+                    f"{row['fall_id']}: beratungsanzahl {row['beratungsanzahl']} -> {row['actual_anzahl']}, "
+                    f"letzte_beratung {row['letzte_beratung']} -> {row['actual_letzte']}"
+                )
+            self.stdout.write(f"{len(drifted)} Fall/Fälle mit abweichenden Aggregaten")
+            return
+
+        updated = BeratungManager.recalculateAggregates(options['fall_ids'])
+        self.stdout.write(self.style.SUCCESS(f"Aggregate von {updated} abweichenden Fall/Fällen korrigiert"))
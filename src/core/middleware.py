@@ -0,0 +1,24 @@
+"""
+Middleware of the core app.
+"""
+from core.services.session_activity import touch_session
+
+
+class SessionActivityMiddleware:
+    """
+    Keeps core.Session.last_activity up to date for logged-in users,
+    throttled to one write per session and minute (see services/session_activity.py).
+    Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        user = getattr(request, 'user', None)
+        session_key = request.session.session_key if hasattr(request, 'session') else None
+        if user is not None and user.is_authenticated and session_key:
+            touch_session(session_key, user)
+        return response
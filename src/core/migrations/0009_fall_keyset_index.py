@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_assign_erweitert_permissions'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fall',
+            index=models.Index(fields=['erstellungsdatum', 'fall_id'], name='fall_erstell_ac3b5c_idx'),
+        ),
+    ]
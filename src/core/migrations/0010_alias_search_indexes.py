@@ -0,0 +1,46 @@
+# Generated by Django 5.0.1 on 2026-10-18 11:02
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# Both indexes are on UPPER(alias) because Django compiles icontains /
+# istartswith to UPPER(alias::text) LIKE UPPER(...) on PostgreSQL.
+# SQLite (tests) has neither pg_trgm nor opclasses, so it is skipped there.
+CREATE_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS pbd_alias_upper_trgm_idx '
+    'ON personenbezogene_daten USING gin (UPPER(alias) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS pbd_alias_upper_prefix_idx '
+    'ON personenbezogene_daten (UPPER(alias) text_pattern_ops)',
+]
+
+DROP_INDEXES = [
+    'DROP INDEX IF EXISTS pbd_alias_upper_trgm_idx',
+    'DROP INDEX IF EXISTS pbd_alias_upper_prefix_idx',
+]
+
+
+def create_alias_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in CREATE_INDEXES:
+        schema_editor.execute(statement)
+
+
+def drop_alias_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in DROP_INDEXES:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_fall_keyset_index'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_alias_indexes, drop_alias_indexes),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.1 on 2026-10-18 12:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_alias_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fall',
+            index=models.Index(fields=['status', 'zustaendige_beratungsstelle', 'erstellungsdatum'], name='fall_status_e5e7df_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fall',
+            index=models.Index(fields=['status', 'ist_abgeschlossen', 'letzte_beratung'], name='fall_status_830238_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personenbezogenedaten',
+            index=models.Index(fields=['wohnort'], name='personenbez_wohnort_abe871_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_facet_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatistikErgebnis',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('beratungsstelle', models.CharField(choices=[('FBS_1_LE', 'Fachberatungsstelle für queere Betroffene von sexualisierter Gewalt in der Stadt Leipzig'), ('FBS_2_LKNSA', 'Fachberatung gegen sexualisierte Gewalt im Landkreis Nordsachsen'), ('FBS_3_LKLE', 'Fachberatung gegen sexualisierte Gewalt im Landkreis Leipzig')], max_length=20)),
+                ('jahr', models.IntegerField()),
+                ('tabelle', models.CharField(max_length=40)),
+                ('schluessel', models.CharField(blank=True, max_length=100)),
+                ('anzahl', models.IntegerField(default=0)),
+                ('berechnet_am', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Statistik Ergebnis',
+                'verbose_name_plural': 'Statistik Ergebnisse',
+                'db_table': 'statistik_ergebnis',
+                'indexes': [models.Index(fields=['jahr', 'beratungsstelle'], name='statistik_e_jahr_2c92b6_idx')],
+                'unique_together': {('beratungsstelle', 'jahr', 'tabelle', 'schluessel')},
+            },
+        ),
+    ]
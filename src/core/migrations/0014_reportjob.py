@@ -0,0 +1,36 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:30
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_statistikergebnis'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('job_id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('art', models.CharField(choices=[('STATISTIK', 'Statistikbogen'), ('DOSSIER', 'Falldossier')], max_length=20)),
+                ('parameter', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('WARTEND', 'Wartend'), ('LAEUFT', 'Läuft'), ('FERTIG', 'Fertig'), ('FEHLER', 'Fehler')], default='WARTEND', max_length=20)),
+                ('datei', models.FileField(blank=True, upload_to='reports/%Y/%m/')),
+                ('fehler', models.TextField(blank=True)),
+                ('erstellt_am', models.DateTimeField(auto_now_add=True)),
+                ('fertig_am', models.DateTimeField(blank=True, null=True)),
+                ('erstellt_von', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='report_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Report Job',
+                'verbose_name_plural': 'Report Jobs',
+                'db_table': 'report_job',
+                'ordering': ['-erstellt_am'],
+            },
+        ),
+    ]
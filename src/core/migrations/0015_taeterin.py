@@ -0,0 +1,54 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_taeterinnen(apps, schema_editor):
+    """Derive the Taeterin rows of all existing Gewalttaten."""
+    Gewalttat = apps.get_model('core', 'Gewalttat')
+    Taeterin = apps.get_model('core', 'Taeterin')
+
+    rows = []
+    for gewalttat_id, details in Gewalttat.objects.values_list('pk', 'taeterinnen_details').iterator(chunk_size=1000):
+        for position, entry in enumerate(details or []):
+            if isinstance(entry, dict):
+                rows.append(Taeterin(
+                    gewalttat_id=gewalttat_id,
+                    position=position,
+                    geschlecht=(entry.get('geschlecht') or '')[:100],
+                    verhaeltnis=entry.get('verhaeltnis_zur_ratsuchenden_person') or '',
+                ))
+        if len(rows) >= 1000:
+            Taeterin.objects.bulk_create(rows)
+            rows = []
+    Taeterin.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_reportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Taeterin',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField()),
+                ('geschlecht', models.CharField(blank=True, max_length=100)),
+                ('verhaeltnis', models.CharField(choices=[('Unbekannte:r', 'Unbekannte:r'), ('Bekannte:r', 'Bekannte:r'), ('Partner:in', 'Partner:in'), ('Partner:in ehemalig', 'Partner:in ehemalig'), ('Ehepartner:in oder eingetragene:r Lebenspartner:in', 'Ehepartner:in oder eingetragene:r Lebenspartner:in'), ('andere Familienangehörige', 'andere Familienangehörige'), ('sonstige Personen', 'sonstige Personen'), ('keine Angabe', 'keine Angabe')], max_length=60)),
+                ('gewalttat', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='taeterinnen', to='core.gewalttat')),
+            ],
+            options={
+                'verbose_name': 'Täter:in',
+                'verbose_name_plural': 'Täter:innen',
+                'db_table': 'taeterin',
+                'ordering': ['position'],
+                'indexes': [models.Index(fields=['verhaeltnis'], name='taeterin_verhael_efedfe_idx')],
+                'unique_together': {('gewalttat', 'position')},
+            },
+        ),
+        migrations.RunPython(fill_taeterinnen, migrations.RunPython.noop),
+    ]
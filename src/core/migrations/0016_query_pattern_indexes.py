@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_taeterin'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='fall',
+            name='fall_zustaen_aa5650_idx',
+        ),
+        migrations.AddIndex(
+            model_name='fall',
+            index=models.Index(fields=['zustaendige_beratungsstelle', 'erstellungsdatum'], name='fall_stelle_erstellt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fall',
+            index=models.Index(condition=models.Q(('status', 'AKTIV')), fields=['-erstellungsdatum', '-fall_id'], name='fall_aktiv_erstellt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='beratung',
+            index=models.Index(fields=['datum'], name='beratung_datum_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gewalttat',
+            index=models.Index(fields=['tatort'], name='gewalttat_tatort_idx'),
+        ),
+    ]
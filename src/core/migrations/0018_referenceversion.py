@@ -0,0 +1,25 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_query_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReferenceVersion',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('version', models.PositiveBigIntegerField(default=1)),
+            ],
+            options={
+                'verbose_name': 'Referenzdaten-Version',
+                'verbose_name_plural': 'Referenzdaten-Versionen',
+                'db_table': 'reference_version',
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:45
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_referenceversion'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='fall',
+            name='fall_erstell_da8988_idx',
+        ),
+    ]
@@ -3,17 +3,22 @@ Core models package.
 Imports all models for Django to discover.
 """
 from .user_models import User, Role, PermissionSet, Session
-from .fall_models import Fall, PersonenbezogeneDaten, Beratung, Gewalttat
+from .fall_models import Fall, PersonenbezogeneDaten, Beratung, Gewalttat, Taeterin
 from .reference_models import (
     GewalttatArt,
     FolgenDerGewalt,
     Gewalttat_GewalttatArt,
-    Fall_FolgenDerGewalt
+    Fall_FolgenDerGewalt,
+    ReferenceVersion
 )
+from .statistik_models import StatistikErgebnis
+from .report_models import ReportJob
 
 __all__ = [
     'User', 'Role', 'PermissionSet', 'Session',
-    'Fall', 'PersonenbezogeneDaten', 'Beratung', 'Gewalttat',
+    'Fall', 'PersonenbezogeneDaten', 'Beratung', 'Gewalttat', 'Taeterin',
     'GewalttatArt', 'FolgenDerGewalt',
-    'Gewalttat_GewalttatArt', 'Fall_FolgenDerGewalt'
+    'Gewalttat_GewalttatArt', 'Fall_FolgenDerGewalt', 'ReferenceVersion',
+    'StatistikErgebnis',
+    'ReportJob'
 ]
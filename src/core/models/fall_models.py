@@ -4,14 +4,21 @@ Implements Fall (Case) with related demographic data, consultations, and inciden
 Named the landkreis Leipzig Land (-> 3 areas they offer services for, siehe Aufgabenstellung/statistikbogen)
 """
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Max, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
 from django.conf import settings
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.exceptions import ValidationError
-from core.validators.json_validators import validate_taeterinnen_details
+from core.validators.json_validators import (
+    validate_taeterinnen_details, taeterinnen_validation_scope, TAETERIN_VERHAELTNISSE
+)
 from typing import TYPE_CHECKING
 
+from core.models.fields import KeepTimestampDateField, KeepTimestampDateTimeField
+
 
 class Fall(models.Model):
     """
@@ -58,8 +65,9 @@ class Fall(models.Model):
     )
     
     # Timestamps
-    erstellungsdatum = models.DateField(auto_now_add=True)
-    letzte_bearbeitung = models.DateTimeField(auto_now=True)
+    # keep explicit values in bulk loads (see core/models/fields.py)
+    erstellungsdatum = KeepTimestampDateField(auto_now_add=True)
+    letzte_bearbeitung = KeepTimestampDateTimeField(auto_now=True)
     bearbeitet_von = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -113,8 +121,21 @@ class Fall(models.Model):
         db_table = 'fall'
         ordering = ['-erstellungsdatum']
         indexes = [
-            models.Index(fields=['erstellungsdatum']),
-            models.Index(fields=['zustaendige_beratungsstelle']),
+            # Beratungsstelle + date range (statistics, exports); also serves
+            # plain Beratungsstelle lookups, so no single-column index
+            models.Index(fields=['zustaendige_beratungsstelle', 'erstellungsdatum'], name='fall_stelle_erstellt_idx'),
+            # keyset pagination on the case list (see services/pagination.py);
+            # also serves plain erstellungsdatum ranges, so no single-column index
+            models.Index(fields=['erstellungsdatum', 'fall_id']),
+            # default case list: active cases, newest first (partial, only AKTIV rows)
+            models.Index(
+                fields=['-erstellungsdatum', '-fall_id'],
+                name='fall_aktiv_erstellt_idx',
+                condition=models.Q(status='AKTIV'),
+            ),
+            # facet filters on the case list (see core/filters.py)
+            models.Index(fields=['status', 'zustaendige_beratungsstelle', 'erstellungsdatum']),
+            models.Index(fields=['status', 'ist_abgeschlossen', 'letzte_beratung']),
         ]
         verbose_name = 'Fall'
         verbose_name_plural = 'Fälle'
@@ -345,6 +366,10 @@ class PersonenbezogeneDaten(models.Model):
     
     class Meta:
         db_table = 'personenbezogene_daten'
+        indexes = [
+            # wohnort facet on the case list
+            models.Index(fields=['wohnort']),
+        ]
         verbose_name = 'Personenbezogene Daten'
         verbose_name_plural = 'Personenbezogene Daten'
     
@@ -446,6 +471,8 @@ class Beratung(models.Model):
         verbose_name_plural = 'Beratungen'
         indexes = [
             models.Index(fields=['fall', 'datum']),
+            # yearly statistics count Beratungen by datum across all cases
+            models.Index(fields=['datum'], name='beratung_datum_idx'),
         ]
     
     def __str__(self):
@@ -456,28 +483,39 @@ class Beratung(models.Model):
         Override save to update Fall aggregate counters.
         Updates beratungsanzahl and letzte_beratung on parent Fall.
         Also updates letzte_bearbeitung to track case activity.
+        
+        The Fall row is locked first so concurrent edits on the same case
+        are serialized, then the counters are changed with one UPDATE using
+        F() expressions instead of re-counting all Beratungen.
+        Note: self.fall keeps its old counter values in memory.
         """
         # Check if this is a new Beratung (not an update, so we don't double count)
         is_new = self._state.adding
         
-        # Save the Beratung first
-        super().save(*args, **kwargs)
-        
-        # Recalculate count only for new records
-        if is_new:
-            self.fall.beratungsanzahl = self.fall.beratungen.count()  # type: ignore[attr-defined]
-            update_fields = ['beratungsanzahl', 'letzte_beratung', 'letzte_bearbeitung']
-        else:
-            update_fields = ['letzte_beratung', 'letzte_bearbeitung']
-        
-        # Always update letzte_beratung to most recent date
-        latest_beratung = self.fall.beratungen.order_by('-datum').first()  # type: ignore[attr-defined]
-        self.fall.letzte_beratung = latest_beratung.datum if latest_beratung else None
-        
-        # Save Fall with appropriate update_fields
-        # letzte_bearbeitung will auto-update because it's in update_fields
-        self.fall.save(update_fields=update_fields)
-
+        with transaction.atomic():
+            self._lock_fall()
+            
+            # Save the Beratung
+            super().save(*args, **kwargs)
+            
+            fall_rows = Fall.objects.filter(pk=self.fall_id)  # type: ignore[attr-defined]
+            if is_new:
+                # New session: one more, and the latest date can only move forward
+                fall_rows.update(
+                    beratungsanzahl=F('beratungsanzahl') + 1,
+                    letzte_beratung=Greatest(
+                        Coalesce(F('letzte_beratung'), Value(self.datum)),
+                        Value(self.datum),
+                        output_field=models.DateField(),
+                    ),
+                    letzte_bearbeitung=timezone.now(),
+                )
+            else:
+                # datum may have moved backwards, so take the max in the same UPDATE
+                fall_rows.update(
+                    letzte_beratung=self._latest_datum_subquery(),
+                    letzte_bearbeitung=timezone.now(),
+                )
 
     
     def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
@@ -485,23 +523,39 @@ class Beratung(models.Model):
         Override delete to update Fall aggregate counters.
         Returns tuple of (number_deleted, {model_name: count}) per Django convention.
         """
-        fall = self.fall
-        
-        # Delete the Beratung (capture return value)
-        deletion_result = super().delete(*args, **kwargs)
-        
-        # Recalculate aggregates
-        fall.beratungsanzahl = fall.beratungen.count()  # type: ignore[attr-defined]
-        
-        # Update letzte_beratung
-        latest_beratung = fall.beratungen.order_by('-datum').first()  # type: ignore[attr-defined]
-        fall.letzte_beratung = latest_beratung.datum if latest_beratung else None
-        
-        # Save Fall with updated aggregates
-        fall.save(update_fields=['beratungsanzahl', 'letzte_beratung', 'letzte_bearbeitung'])
+        with transaction.atomic():
+            self._lock_fall()
+            
+            # Delete the Beratung (capture return value)
+            deletion_result = super().delete(*args, **kwargs)
+            
+            # One less, latest date recomputed in case we deleted the newest one
+            Fall.objects.filter(pk=self.fall_id).update(  # type: ignore[attr-defined]
+                beratungsanzahl=Greatest(F('beratungsanzahl') - 1, Value(0)),
+                letzte_beratung=self._latest_datum_subquery(),
+                letzte_bearbeitung=timezone.now(),
+            )
         
         # Return Django's expected tuple
         return deletion_result
+    
+    def _lock_fall(self) -> None:
+        """Row lock on the parent Fall until the surrounding transaction ends."""
+        list(
+            Fall.objects.select_for_update().filter(
+                pk=self.fall_id  # type: ignore[attr-defined]
+            ).values_list('pk', flat=True)
+        )
+    
+    def _latest_datum_subquery(self) -> Subquery:
+        """MAX(datum) over the Beratungen of this Beratung's Fall."""
+        return Subquery(
+            Beratung.objects.filter(
+                fall_id=self.fall_id  # type: ignore[attr-defined]
+            ).order_by().values('fall_id').annotate(
+                latest=Max('datum')
+            ).values('latest')
+        )
 
 
 class Gewalttat(models.Model):
@@ -686,6 +740,7 @@ class Gewalttat(models.Model):
         verbose_name_plural = 'Gewalttaten'
         indexes = [
             models.Index(fields=['fall', 'zeitraum_von']),
+            models.Index(fields=['tatort'], name='gewalttat_tatort_idx'),
         ]
     
     def __str__(self):
@@ -693,6 +748,11 @@ class Gewalttat(models.Model):
             return f"Gewalttat {self.zeitraum_von} - {self.fall}"
         return f"Gewalttat {self.gewalttat_id} - {self.fall}"
     
+    def full_clean(self, *args, **kwargs):
+        # field validator and clean() check the same taeterinnen_details list
+        with taeterinnen_validation_scope():
+            super().full_clean(*args, **kwargs)
+    
     def clean(self):
         """Cross-field validation for Gewalttat model."""
         super().clean()
@@ -751,3 +811,37 @@ class Gewalttat(models.Model):
         
         if errors:
             raise ValidationError(errors)
+
+
+class Taeterin(models.Model):
+    """
+    One perpetrator of a Gewalttat, normalized from Gewalttat.taeterinnen_details.
+    The JSON list stays the source of truth (forms edit it); these rows are
+    rewritten from it on every save (see services/taeterinnen.py) so
+    perpetrator statistics are plain indexed GROUP BY queries.
+    """
+    VERHAELTNIS_CHOICES = [(verhaeltnis, verhaeltnis) for verhaeltnis in TAETERIN_VERHAELTNISSE]
+    
+    gewalttat = models.ForeignKey(
+        Gewalttat,
+        on_delete=models.CASCADE,
+        related_name='taeterinnen'
+    )
+    
+    # index of the entry in taeterinnen_details
+    position = models.PositiveSmallIntegerField()
+    geschlecht = models.CharField(max_length=100, blank=True)
+    verhaeltnis = models.CharField(max_length=60, choices=VERHAELTNIS_CHOICES)
+    
+    class Meta:
+        db_table = 'taeterin'
+        ordering = ['position']
+        unique_together = [['gewalttat', 'position']]
+        indexes = [
+            models.Index(fields=['verhaeltnis']),
+        ]
+        verbose_name = 'Täter:in'
+        verbose_name_plural = 'Täter:innen'
+    
+    def __str__(self):
+        return f"{self.verhaeltnis} ({self.geschlecht}) - {self.gewalttat_id}"  # type: ignore[attr-defined]
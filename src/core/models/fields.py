@@ -0,0 +1,34 @@
+"""
+Custom model fields.
+
+Timestamp fields with auto_now / auto_now_add that keep an explicit value
+on instances marked with `_keep_timestamps = True`. Used by the bulk
+loader (services/seed_loader.py) to insert exported rows with their
+original dates. The marker lives on the instance, the field flags are
+never changed, so concurrent save() calls in other threads still get
+their automatic timestamps.
+"""
+from django.db import models
+
+
+class KeepTimestampMixin:
+    """pre_save() that leaves a set value alone on marked instances."""
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if value is not None and getattr(model_instance, '_keep_timestamps', False):
+            return value
+        return super().pre_save(model_instance, add)
+
+    def deconstruct(self):
+        # migrations see the plain Django field
+        name, _path, args, kwargs = super().deconstruct()
+        return name, f'django.db.models.{self.__class__.__bases__[-1].__name__}', args, kwargs
+
+
+class KeepTimestampDateField(KeepTimestampMixin, models.DateField):
+    pass
+
+
+class KeepTimestampDateTimeField(KeepTimestampMixin, models.DateTimeField):
+    pass
@@ -152,3 +152,22 @@ class Gewalttat_GewalttatArt(models.Model):
     
     def __str__(self):
         return f"{self.gewalttat.fall} - {self.art.name}"  # type: ignore[attr-defined]
+
+
+class ReferenceVersion(models.Model):
+    """
+    Change counter of one reference table (see services/reference_data.py).
+    Bumped whenever a GewalttatArt / FolgenDerGewalt row is saved or
+    deleted; cached snapshots are keyed by it, so every process notices
+    the change on its next read.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=1)
+
+    class Meta:
+        db_table = 'reference_version'
+        verbose_name = 'Referenzdaten-Version'
+        verbose_name_plural = 'Referenzdaten-Versionen'
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
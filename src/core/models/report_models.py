@@ -0,0 +1,62 @@
+"""
+Report job models.
+PDF reports are rendered in the background (see services/report_jobs.py);
+a ReportJob tracks one render and points to the stored file.
+"""
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class ReportJob(models.Model):
+    """
+    One background PDF render (Statistikbogen or case dossier).
+    The page polls the job until status is FERTIG, then offers the download.
+    """
+    ART_CHOICES = [
+        ('STATISTIK', 'Statistikbogen'),
+        ('DOSSIER', 'Falldossier'),
+    ]
+
+    STATUS_CHOICES = [
+        ('WARTEND', 'Wartend'),
+        ('LAEUFT', 'Läuft'),
+        ('FERTIG', 'Fertig'),
+        ('FEHLER', 'Fehler'),
+    ]
+
+    # Primary key
+    job_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    art = models.CharField(max_length=20, choices=ART_CHOICES)
+
+    # e.g. {'jahr': 2025, 'beratungsstelle': 'FBS_1_LE'} or {'fall_id': '...'}
+    parameter = models.JSONField(default=dict)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='WARTEND')
+    datei = models.FileField(upload_to='reports/%Y/%m/', blank=True)
+    fehler = models.TextField(blank=True)
+
+    erstellt_von = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='report_jobs'
+    )
+    erstellt_am = models.DateTimeField(auto_now_add=True)
+    fertig_am = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'report_job'
+        ordering = ['-erstellt_am']
+        verbose_name = 'Report Job'
+        verbose_name_plural = 'Report Jobs'
+
+    def __str__(self):
+        return f"{self.get_art_display()} ({self.get_status_display()})"
+
+    @property
+    def ist_abgeschlossen(self):
+        return self.status in ('FERTIG', 'FEHLER')
@@ -0,0 +1,43 @@
+"""
+Statistik models.
+Materialized results of the Statistikbogen report (see services/statistik_engine.py),
+so the yearly report is read from one small table instead of being aggregated
+over all cases on every page view.
+"""
+from django.db import models
+
+from .fall_models import Fall
+
+
+class StatistikErgebnis(models.Model):
+    """
+    One cell of a Statistikbogen table: count for (Beratungsstelle, Jahr, Tabelle, Schlüssel).
+    Rows are replaced as a whole per year by StatistikEngine.computeYear().
+    """
+    beratungsstelle = models.CharField(
+        max_length=20,
+        choices=Fall.BERATUNGSSTELLE_CHOICES
+    )
+    jahr = models.IntegerField()
+
+    # table code, e.g. 'informationsquelle', 'tatort' (see statistik_engine.TABELLEN)
+    tabelle = models.CharField(max_length=40)
+
+    # choice value / name that was counted, '' = not filled in
+    schluessel = models.CharField(max_length=100, blank=True)
+    anzahl = models.IntegerField(default=0)
+
+    berechnet_am = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'statistik_ergebnis'
+        unique_together = [['beratungsstelle', 'jahr', 'tabelle', 'schluessel']]
+        indexes = [
+            models.Index(fields=['jahr', 'beratungsstelle']),
+        ]
+        verbose_name = 'Statistik Ergebnis'
+        verbose_name_plural = 'Statistik Ergebnisse'
+
+    def __str__(self):
+        return f"{self.beratungsstelle} {self.jahr} {self.tabelle}/{self.schluessel}: {self.anzahl}"
+
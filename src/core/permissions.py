@@ -0,0 +1,158 @@
+"""
+Permission resolver for the custom PermissionSet flags.
+
+Role + PermissionSet of a user are loaded with ONE query (or taken from
+request.user when the auth backend joined them already) and kept
+  - on the request, so every decorator, view and template of the request
+    shares the same object, and
+  - in the cache for PERMISSION_CACHE_SECONDS, keyed by role id, so most
+    requests need no permission query at all.
+The cache entry of a role is dropped when its Role or PermissionSet is
+saved or deleted (see core/signals.py). With a per-process cache (LocMem)
+other worker processes pick up changes after the TTL at the latest, so
+destructive actions check with get_current_permissions() instead.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+
+from core.models import User, Role
+
+
+# All boolean flags of PermissionSet
+PERMISSION_FLAGS = (
+    'can_view_cases',
+    'can_edit_cases',
+    'can_delete_cases',
+    'can_hard_delete_cases',
+    'can_manage_reference_data',
+    'can_manage_users',
+    'can_assign_roles',
+)
+
+PERMISSION_CACHE_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class ResolvedPermissions:
+    """
+    Flags of one role. has_role / is_configured tell apart a user without
+    role and a role without PermissionSet (both have every flag False).
+    """
+    role_id: Optional[str] = None
+    role_name: str = ''
+    has_role: bool = False
+    is_configured: bool = False
+    can_view_cases: bool = False
+    can_edit_cases: bool = False
+    can_delete_cases: bool = False
+    can_hard_delete_cases: bool = False
+    can_manage_reference_data: bool = False
+    can_manage_users: bool = False
+    can_assign_roles: bool = False
+
+    def has(self, permission_flag: str) -> bool:
+        return permission_flag in PERMISSION_FLAGS and getattr(self, permission_flag)
+
+
+NO_PERMISSIONS = ResolvedPermissions()
+
+
+def permission_cache_key(role_id) -> str:
+    return f'permissions:role:{role_id}'
+
+
+def _from_role(role) -> ResolvedPermissions:
+    """Build from a Role whose permissions were loaded with select_related."""
+    try:
+        permission_set = role.permissions
+    except ObjectDoesNotExist:
+        permission_set = None
+
+    return ResolvedPermissions(
+        role_id=str(role.pk),
+        role_name=role.name,
+        has_role=True,
+        is_configured=permission_set is not None,
+        **{flag: bool(getattr(permission_set, flag, False)) for flag in PERMISSION_FLAGS},
+    )
+
+
+def _load_role_permissions(role_id) -> ResolvedPermissions:
+    row = Role.objects.filter(pk=role_id).values(
+        'name',
+        'permissions__permission_set_id',
+        *(f'permissions__{flag}' for flag in PERMISSION_FLAGS),
+    ).first()
+    if row is None:
+        return NO_PERMISSIONS
+
+    return ResolvedPermissions(
+        role_id=str(role_id),
+        role_name=row['name'],
+        has_role=True,
+        is_configured=row['permissions__permission_set_id'] is not None,
+        **{flag: bool(row[f'permissions__{flag}']) for flag in PERMISSION_FLAGS},
+    )
+
+
+def get_role_permissions(role_id) -> ResolvedPermissions:
+    """Permissions of a role (cached, one query on a miss)."""
+    if role_id is None:
+        return NO_PERMISSIONS
+    return cache.get_or_set(
+        permission_cache_key(role_id),
+        lambda: _load_role_permissions(role_id),
+        PERMISSION_CACHE_SECONDS,
+    )
+
+
+def get_current_permissions(user) -> ResolvedPermissions:
+    """
+    Permissions of a user read from the database, bypassing every cache
+    (also a cached user.role_id). One query; for destructive actions.
+    """
+    row = User.objects.filter(pk=user.pk).values(
+        'role_id',
+        'role__name',
+        'role__permissions__permission_set_id',
+        *(f'role__permissions__{flag}' for flag in PERMISSION_FLAGS),
+    ).first()
+    if row is None or row['role_id'] is None:
+        return NO_PERMISSIONS
+
+    return ResolvedPermissions(
+        role_id=str(row['role_id']),
+        role_name=row['role__name'],
+        has_role=True,
+        is_configured=row['role__permissions__permission_set_id'] is not None,
+        **{flag: bool(row[f'role__permissions__{flag}']) for flag in PERMISSION_FLAGS},
+    )
+
+
+def invalidate_role_permissions(role_id) -> None:
+    cache.delete(permission_cache_key(role_id))
+
+
+def get_request_permissions(request) -> ResolvedPermissions:
+    """
+    Permissions of request.user, resolved once per request and stored as
+    request.permissions. Uses user.role_id, so the Role row is not fetched.
+    """
+    permissions = getattr(request, 'permissions', None)
+    if permissions is None:
+        user = getattr(request, 'user', None)
+        role_id = getattr(user, 'role_id', None) if user and user.is_authenticated else None
+        if role_id is not None and _has_loaded_permissions(user):
+            # the auth backend already joined role + permissions (core/backends.py)
+            permissions = _from_role(user.role)
+        else:
+            permissions = get_role_permissions(role_id)
+        request.permissions = permissions
+    return permissions
+
+
+def _has_loaded_permissions(user) -> bool:
+    return User.role.is_cached(user) and Role.permissions.is_cached(user.role)
@@ -1,5 +1,8 @@
 """Business logic services for SE_B-EV_2025."""
 
 from .fall_manager import FallManager
+from .beratung_manager import BeratungManager
+from .pagination import KeysetPaginator
+from .statistik_engine import StatistikEngine
 
-__all__ = ['FallManager']
\ No newline at end of file
+__all__ = ['FallManager', 'BeratungManager', 'KeysetPaginator', 'StatistikEngine']
\ No newline at end of file
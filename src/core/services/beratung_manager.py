@@ -0,0 +1,164 @@
+"""
+BeratungManager - bulk Beratung entry and aggregate maintenance.
+Single Beratungen keep Fall.beratungsanzahl / letzte_beratung up to date
+incrementally in Beratung.save() / delete(); this service handles the
+many-rows-at-once cases (quarterly back-fills, drift repair).
+"""
+import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, Max, OuterRef, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.models import Fall, Beratung
+
+
+# Rows per INSERT statement in bulk_create
+BULK_BATCH_SIZE = 500
+
+
+def beratungsanzahl_subquery() -> Subquery:
+    """Correlated COUNT of the Beratungen of the outer Fall (0 if none)."""
+    counts = Beratung.objects.filter(
+        fall=OuterRef('pk')
+    ).order_by().values('fall').annotate(anzahl=Count('pk')).values('anzahl')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def letzte_beratung_subquery() -> Subquery:
+    """Correlated MAX(datum) of the Beratungen of the outer Fall (NULL if none)."""
+    latest = Beratung.objects.filter(
+        fall=OuterRef('pk')
+    ).order_by().values('fall').annotate(latest=Max('datum')).values('latest')
+    return Subquery(latest)
+
+
+class BeratungManager:
+    """
+    Service class for Beratung operations touching many rows at once.
+    Single Beratungen are still created through BeratungForm / the ORM.
+    """
+
+    @staticmethod
+    @transaction.atomic
+    def bulkCreateBeratungen(beratungen_data: list[dict]) -> list[Beratung]:
+        """
+        Insert many Beratungen for one or many cases at once.
+
+        bulk_create() skips Beratung.save(), so the per-row counter updates
+        do not run. Instead the affected cases are locked and recomputed
+        once at the end with a single grouped UPDATE.
+
+        Args:
+            beratungen_data: list of dicts with fall_id (or fall), datum,
+                durchfuehrungsart, durchfuehrungsort and optional weitere_notizen
+
+        Returns:
+            list[Beratung]: the created Beratungen
+
+        Raises:
+            ValidationError: If a row is invalid or references an unknown case.
+                Nothing is inserted in that case.
+        """
+        beratungen = []
+        errors = {}
+        fall_field = Beratung._meta.get_field('fall')
+        for idx, data in enumerate(beratungen_data):
+            beratung = Beratung(**data)
+            try:
+                # fall is checked below for all rows in one query; ids given
+                # as strings have to become UUIDs to compare against the pks
+                beratung.fall_id = fall_field.to_python(beratung.fall_id)  # type: ignore[attr-defined]
+                beratung.full_clean(exclude=['fall'], validate_unique=False)
+            except ValidationError as e:
+                errors[f'row_{idx}'] = e.messages
+            beratungen.append(beratung)
+
+        fall_ids = {
+            beratung.fall_id for beratung in beratungen  # type: ignore[attr-defined]
+            if isinstance(beratung.fall_id, UUID)  # type: ignore[attr-defined]
+        }
+        # Lock the affected cases so concurrent single saves wait for us
+        existing_ids = set(
+            Fall.objects.select_for_update().filter(
+                pk__in=fall_ids
+            ).values_list('pk', flat=True)
+        )
+        for idx, beratung in enumerate(beratungen):
+            if f'row_{idx}' not in errors and beratung.fall_id not in existing_ids:  # type: ignore[attr-defined]
+                errors.setdefault(f'row_{idx}', []).append(
+                    f'Fall {beratung.fall_id} existiert nicht'  # type: ignore[attr-defined]
+                )
+
+        if errors:
+            raise ValidationError(errors)
+
+        created = Beratung.objects.bulk_create(beratungen, batch_size=BULK_BATCH_SIZE)
+        # new Beratungen are an edit of their cases, unlike a drift repair
+        Fall.objects.filter(pk__in=existing_ids).update(**_aggregate_values(), letzte_bearbeitung=timezone.now())
+        return created
+
+    @staticmethod
+    def recalculateAggregates(fall_ids: Optional[Iterable[UUID]] = None) -> int:
+        """
+        Recompute beratungsanzahl and letzte_beratung from the Beratung table.
+
+        Runs ONE grouped UPDATE with correlated subqueries that only touches
+        cases whose stored values are wrong. letzte_bearbeitung is left
+        alone: repairing derived data is not an edit of the case.
+
+        Args:
+            fall_ids: only recompute these cases (None = all cases)
+
+        Returns:
+            int: number of Fall rows that were out of date
+        """
+        return _drifted_faelle(fall_ids).update(**_aggregate_values())
+
+    @staticmethod
+    def findDriftedFaelle(fall_ids: Optional[Iterable[UUID]] = None) -> list:
+        """
+        Cases whose stored aggregates differ from the Beratung table.
+
+        Args:
+            fall_ids: only check these cases (None = all cases)
+
+        Returns:
+            list of dicts with fall_id, stored and actual values
+        """
+        return list(
+            _drifted_faelle(fall_ids).values(
+                'fall_id', 'beratungsanzahl', 'actual_anzahl', 'letzte_beratung', 'actual_letzte'
+            ).order_by().iterator(chunk_size=2000)
+        )
+
+
+def _aggregate_values() -> dict:
+    """UPDATE values that recompute the aggregates of every updated Fall."""
+    return {
+        'beratungsanzahl': beratungsanzahl_subquery(),
+        'letzte_beratung': letzte_beratung_subquery(),
+    }
+
+
+def _drifted_faelle(fall_ids: Optional[Iterable[UUID]] = None) -> QuerySet:
+    """Fall rows whose stored aggregates differ from the Beratung table."""
+    falls = Fall.objects.all()
+    if fall_ids is not None:
+        falls = falls.filter(pk__in=list(fall_ids))
+
+    # NULL never compares equal, so "no Beratung yet" becomes a sentinel date
+    no_date = Value(datetime.date.min)
+    return falls.annotate(
+        actual_anzahl=beratungsanzahl_subquery(),
+        actual_letzte=letzte_beratung_subquery(),
+        stored_letzte_key=Coalesce('letzte_beratung', no_date),
+        actual_letzte_key=Coalesce(letzte_beratung_subquery(), no_date),
+    ).exclude(
+        beratungsanzahl=F('actual_anzahl'),
+        stored_letzte_key=F('actual_letzte_key'),
+    )
@@ -0,0 +1,135 @@
+"""
+Case export - streamed row by row, constant memory.
+
+Rows come from ONE values() query (Fall + PersonenbezogeneDaten JOIN,
+Gewalttat count as correlated subquery) read with .iterator(chunk_size=...),
+so neither the queryset cache nor a DataFrame ever holds the whole table.
+The CSV writer yields one encoded line at a time into a StreamingHttpResponse.
+"""
+import csv
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+from django.db.models import Count, IntegerField, OuterRef, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from core.models import Fall, PersonenbezogeneDaten, Gewalttat
+
+
+# Rows fetched per database round trip while exporting
+EXPORT_CHUNK_SIZE = 2000
+
+# Leading characters that make Excel evaluate a CSV field as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@')
+
+
+@dataclass(frozen=True)
+class ExportSpalte:
+    """One export column: header, values() field and optional choices for labels."""
+    header: str
+    field: str
+    choices: Optional[list] = None
+
+
+CASE_EXPORT_SPALTEN = [
+    ExportSpalte('Fall-ID', 'fall_id'),
+    ExportSpalte('Alias', 'personenbezogene_daten__alias'),
+    ExportSpalte('Beratungsstelle', 'zustaendige_beratungsstelle', Fall.BERATUNGSSTELLE_CHOICES),
+    ExportSpalte('Status', 'status', Fall.STATUS_CHOICES),
+    ExportSpalte('Erstellt am', 'erstellungsdatum'),
+    ExportSpalte('Abgeschlossen', 'ist_abgeschlossen'),
+    ExportSpalte('Informationsquelle', 'informationsquelle', Fall.INFO_QUELLE_CHOICES),
+    ExportSpalte('Rolle', 'personenbezogene_daten__rolle_der_ratsuchenden_person',
+                 PersonenbezogeneDaten.ROLLE_CHOICES),
+    ExportSpalte('Alter', 'personenbezogene_daten__alter'),
+    ExportSpalte('Geschlechtsidentität', 'personenbezogene_daten__geschlechtsidentitaet',
+                 PersonenbezogeneDaten.GESCHLECHT_CHOICES),
+    ExportSpalte('Sexualität', 'personenbezogene_daten__sexualitaet',
+                 PersonenbezogeneDaten.SEXUALITAET_CHOICES),
+    ExportSpalte('Wohnort', 'personenbezogene_daten__wohnort', PersonenbezogeneDaten.WOHNORT_CHOICES),
+    ExportSpalte('Staatsangehörigkeit', 'personenbezogene_daten__staatsangehoerigkeit_deutsch',
+                 PersonenbezogeneDaten.STAATSANGEHOERIGKEIT_CHOICES),
+    ExportSpalte('Berufliche Situation', 'personenbezogene_daten__berufliche_situation',
+                 PersonenbezogeneDaten.BERUF_CHOICES),
+    ExportSpalte('Anzahl Beratungen', 'beratungsanzahl'),
+    ExportSpalte('Letzte Beratung', 'letzte_beratung'),
+    ExportSpalte('Anzahl Gewalttaten', 'anzahl_gewalttaten'),
+    ExportSpalte('Dolmetschung (Std.)', 'anzahl_dolmetschungen_stunden'),
+]
+
+
+def gewalttaten_anzahl_subquery() -> Coalesce:
+    """Correlated COUNT of the Gewalttaten of the outer Fall (0 if none)."""
+    counts = Gewalttat.objects.filter(
+        fall=OuterRef('pk')
+    ).order_by().values('fall').annotate(anzahl=Count('pk')).values('anzahl')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def case_export_queryset(cases: Optional[QuerySet] = None) -> QuerySet:
+    """
+    Flat rows for the export, newest cases first.
+
+    Beratung counts are the stored Fall aggregates; Gewalttaten are counted
+    per row by a subquery instead of a JOIN + GROUP BY over all cases.
+
+    Args:
+        cases: Fall queryset to export (e.g. the filtered case list), default all
+    """
+    if cases is None:
+        cases = Fall.objects.all()
+    return cases.annotate(
+        anzahl_gewalttaten=gewalttaten_anzahl_subquery(),
+    ).values(
+        *(spalte.field for spalte in CASE_EXPORT_SPALTEN)
+    ).order_by('-erstellungsdatum', '-fall_id')
+
+
+def iter_export_rows(
+    rows: Iterable[dict],
+    spalten: list[ExportSpalte] = CASE_EXPORT_SPALTEN,
+) -> Iterator[list]:
+    """
+    Header followed by one list of display values per row (choice labels resolved).
+    """
+    labels = {spalte.field: dict(spalte.choices) for spalte in spalten if spalte.choices}
+    yield [spalte.header for spalte in spalten]
+    for row in rows:
+        values = []
+        for spalte in spalten:
+            value = row[spalte.field]
+            if spalte.field in labels:
+                value = labels[spalte.field].get(value, value)
+            values.append('' if value is None else value)
+        yield values
+
+
+def iter_case_rows(queryset: QuerySet, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[list]:
+    """Stream the rows of case_export_queryset() without caching the queryset."""
+    return iter_export_rows(queryset.iterator(chunk_size=chunk_size))
+
+
+def _csv_value(value):
+    # a leading ' makes Excel show the field as text instead of evaluating it
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+class _EchoBuffer:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows: Iterable[list]) -> Iterator[str]:
+    """
+    Encode rows as CSV lines one at a time (';' separated for German Excel).
+    Starts with a BOM so Excel detects UTF-8. Text that would start a
+    formula is prefixed with ' (CSV injection).
+    """
+    writer = csv.writer(_EchoBuffer(), delimiter=';')
+    yield '\ufeff'
+    for row in rows:
+        yield writer.writerow([_csv_value(value) for value in row])
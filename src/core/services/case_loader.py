@@ -0,0 +1,46 @@
+"""
+Query loader for the case detail page.
+
+Calling .order_by() or .select_related() on a prefetched relation throws the
+prefetch away and runs a new query, so the ordering has to live inside the
+Prefetch objects. Results are stored with to_attr as plain lists.
+
+A full case renders in a constant number of queries, independent of how many
+Beratungen, Gewalttaten or Folgen it has (see CaseDetailQueryBudgetTest).
+"""
+from django.db.models import Prefetch, QuerySet
+
+from core.models import Fall, Beratung, Gewalttat, Fall_FolgenDerGewalt
+
+
+def case_detail_queryset() -> QuerySet:
+    """
+    Fall queryset with everything case_detail.html renders.
+
+    Attributes on the loaded Fall:
+        beratungen_sorted: Beratungen, newest first
+        gewalttaten_sorted: Gewalttaten (model ordering) with gewalttat_arten prefetched
+        folgen_sorted: Fall_FolgenDerGewalt with folge, ordered by kategorie and name
+    """
+    return Fall.objects.select_related(
+        'personenbezogene_daten',
+        'bearbeitet_von',
+    ).prefetch_related(
+        Prefetch(
+            'beratungen',
+            queryset=Beratung.objects.order_by('-datum'),
+            to_attr='beratungen_sorted',
+        ),
+        Prefetch(
+            'gewalttaten',
+            queryset=Gewalttat.objects.prefetch_related('gewalttat_arten'),
+            to_attr='gewalttaten_sorted',
+        ),
+        Prefetch(
+            'folgen_relations',
+            queryset=Fall_FolgenDerGewalt.objects.select_related('folge').order_by(
+                'folge__kategorie', 'folge__name'
+            ),
+            to_attr='folgen_sorted',
+        ),
+    )
@@ -0,0 +1,83 @@
+"""
+Alias search for the case list.
+
+Three strategies, picked per query:
+- Alias codes like "MS_001" or "MS_" use a prefix match, which PostgreSQL
+  answers from the UPPER(alias) text_pattern_ops index (migration 0010).
+- Everything else on PostgreSQL runs a pg_trgm search: substring OR
+  trigram-similar aliases, ranked by similarity. Both conditions use the
+  GIN trigram index, so there is no sequential scan anymore.
+- On SQLite (local test runs) there is no pg_trgm, so we fall back to
+  the old icontains filter and keep the normal date ordering.
+"""
+import re
+from dataclasses import dataclass
+
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.db.models.functions import Upper
+
+
+# Alias codes are letters, an underscore and an optional number, e.g. "MS_001"
+ALIAS_CODE_PATTERN = re.compile(r'^[A-Za-z]+_\d*$')
+
+# Fuzzy matches are capped, nobody scrolls through 500 "similar" aliases.
+# The similarity cut-off itself is pg_trgm.similarity_threshold (default 0.3)
+MAX_RANKED_RESULTS = 50
+
+
+@dataclass
+class CaseSearchResult:
+    """Filtered queryset plus whether it is ordered by relevance."""
+    queryset: QuerySet
+    is_ranked: bool
+
+
+def is_alias_code(search_query: str) -> bool:
+    """True if the query looks like (the start of) an alias code."""
+    return bool(ALIAS_CODE_PATTERN.match(search_query))
+
+
+def search_cases(cases: QuerySet, search_query: str) -> CaseSearchResult:
+    """
+    Filter a Fall queryset by alias.
+
+    Args:
+        cases: Fall queryset (filters like status='AKTIV' already applied)
+        search_query: raw user input from ?search=
+
+    Returns:
+        CaseSearchResult; ranked results are already sliced to MAX_RANKED_RESULTS
+    """
+    search_query = search_query.strip()
+    if not search_query:
+        return CaseSearchResult(queryset=cases, is_ranked=False)
+
+    # Fast path: alias code prefix, keeps date ordering so keyset paging still works
+    if is_alias_code(search_query):
+        return CaseSearchResult(
+            queryset=cases.filter(personenbezogene_daten__alias__istartswith=search_query),
+            is_ranked=False,
+        )
+
+    if connection.vendor != 'postgresql':
+        return CaseSearchResult(
+            queryset=cases.filter(personenbezogene_daten__alias__icontains=search_query),
+            is_ranked=False,
+        )
+
+    # imported here so SQLite setups never touch contrib.postgres
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    # UPPER(alias) matches the expression of the GIN index, icontains
+    # compiles to UPPER(alias) LIKE UPPER(...) on PostgreSQL as well
+    ranked = cases.alias(
+        alias_upper=Upper('personenbezogene_daten__alias'),
+    ).filter(
+        Q(alias_upper__contains=search_query.upper()) |
+        Q(alias_upper__trigram_similar=search_query.upper())
+    ).annotate(
+        rank=TrigramSimilarity(Upper('personenbezogene_daten__alias'), search_query.upper()),
+    ).order_by('-rank', '-erstellungsdatum')
+
+    return CaseSearchResult(queryset=ranked[:MAX_RANKED_RESULTS], is_ranked=True)
@@ -7,7 +7,8 @@ from uuid import UUID
 from django.db import transaction
 from django.core.exceptions import ValidationError, PermissionDenied
 
-from core.models import Fall, PersonenbezogeneDaten, User
+from core.models import Fall, PersonenbezogeneDaten, User, FolgenDerGewalt, Fall_FolgenDerGewalt
+from core.permissions import get_current_permissions
 
 
 class FallManager:
@@ -60,7 +61,9 @@ class FallManager:
         """
         Permanently delete Fall with permission check.
         
-        Checks user permission before allowing deletion.
+        Checks user permission before allowing deletion, read from the
+        database (not the permission cache) so a revoked role cannot
+        delete for the rest of the cache TTL.
         CASCADE handles related data cleanup automatically.
         
         Args:
@@ -72,18 +75,59 @@ class FallManager:
             ValidationError: If user has no role assigned
             Fall.DoesNotExist: If fall_id not found
         """
+        permissions = get_current_permissions(user)
+        
         # Check user has role
-        if not user.role:
+        if not permissions.has_role:
             raise ValidationError(
                 f"User {user.username} has no role assigned"
             )
         
         # Check permission
-        if not user.role.permissions.can_hard_delete_cases:  # type: ignore[attr-defined]
+        if not permissions.can_hard_delete_cases:
             raise PermissionDenied(
-                f"User {user.username} (role: {user.role.name}) lacks hard delete permission. "
+                f"User {user.username} (role: {permissions.role_name}) lacks hard delete permission. "
                 f"Required role: ADMINISTRATOR"
             )
         
         fall = Fall.objects.get(fall_id=fall_id)
         fall.delete()
+    
+    @staticmethod
+    @transaction.atomic
+    def linkFolgen(fall: Fall, folgen: list[FolgenDerGewalt], weitere_informationen: str = '') -> int:
+        """
+        Link many FolgenDerGewalt to a case with one INSERT.
+        
+        The case row is locked, as in FolgenDerGewaltForm.save(), so links
+        of the same case are added one after the other. bulk_create(
+        ignore_conflicts=True) still lets the unique_together constraint
+        drop links added by unlocked writers (e.g. the admin); only the
+        rows that were actually inserted are counted.
+        
+        Args:
+            fall: Case to link the consequences to
+            folgen: Consequences to link (already linked ones are skipped)
+            weitere_informationen: Optional text stored on every new link
+            
+        Returns:
+            int: number of links inserted by this call
+        """
+        list(Fall.objects.select_for_update().filter(pk=fall.pk).values_list('pk', flat=True))
+        
+        linked_ids = set(
+            Fall_FolgenDerGewalt.objects.filter(fall=fall).values_list('folge_id', flat=True)
+        )
+        new_ids = {folge.folge_id for folge in folgen} - linked_ids
+        if not new_ids:
+            return 0
+        
+        Fall_FolgenDerGewalt.objects.bulk_create(
+            [
+                Fall_FolgenDerGewalt(fall=fall, folge_id=folge_id, weitere_informationen=weitere_informationen)
+                for folge_id in new_ids
+            ],
+            ignore_conflicts=True,
+        )
+        # under the lock every link of new_ids present now is one of ours
+        return Fall_FolgenDerGewalt.objects.filter(fall=fall, folge_id__in=new_ids).count()
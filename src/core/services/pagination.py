@@ -0,0 +1,150 @@
+"""
+Keyset (cursor) pagination for large case lists.
+
+OFFSET pagination gets slower the further you page because the database
+still has to walk past every skipped row. Keyset pagination remembers the
+sort key of the last row instead and continues from there with an indexed
+range query, so every page costs the same no matter how many cases exist.
+
+The total count is only an orientation value for the UI, so it is cached
+for a short time instead of running COUNT(*) on every page view.
+"""
+import base64
+import binascii
+import datetime
+import hashlib
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from django.core.cache import cache
+from django.db.models import Q, QuerySet
+
+
+# Page size for the case list, small enough to render quickly
+DEFAULT_PAGE_SIZE = 50
+
+# How long the approximate total count is cached (seconds)
+COUNT_CACHE_SECONDS = 60
+
+
+@dataclass
+class KeysetPage:
+    """One page of results plus the cursors to reach its neighbours."""
+    object_list: list
+    next_cursor: Optional[str]
+    previous_cursor: Optional[str]
+    approximate_count: int
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+
+def encode_cursor(erstellungsdatum: datetime.date, fall_id: uuid.UUID) -> str:
+    """Pack the sort key of a Fall into an opaque, URL-safe cursor string."""
+    raw = f"{erstellungsdatum.isoformat()}|{fall_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Optional[tuple[datetime.date, uuid.UUID]]:
+    """
+    Unpack a cursor created by encode_cursor().
+    Returns None for anything malformed so a broken link just shows page 1.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        datum_str, fall_id_str = base64.urlsafe_b64decode(padded).decode().split('|')
+        return datetime.date.fromisoformat(datum_str), uuid.UUID(fall_id_str)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+class KeysetPaginator:
+    """
+    Paginates a Fall queryset on (erstellungsdatum, fall_id), newest first.
+
+    fall_id is the tie breaker because many cases share the same creation date.
+
+    Usage:
+        paginator = KeysetPaginator(cases, count_cache_key='case_list:...')
+        page = paginator.get_page(after=request.GET.get('after'))
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int = DEFAULT_PAGE_SIZE,
+                 count_cache_key: Optional[str] = None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.count_cache_key = count_cache_key
+
+    def get_page(self, after: Optional[str] = None, before: Optional[str] = None) -> KeysetPage:
+        """
+        Fetch the page following `after` or preceding `before`.
+        Without a (valid) cursor the first page is returned.
+        """
+        after_key = decode_cursor(after) if after else None
+        before_key = decode_cursor(before) if before else None
+
+        if before_key:
+            # Walk backwards (ascending) from the cursor, then flip the rows back
+            datum, fall_id = before_key
+            rows = list(
+                self.queryset.filter(
+                    Q(erstellungsdatum__gt=datum) |
+                    Q(erstellungsdatum=datum, fall_id__gt=fall_id)
+                ).order_by('erstellungsdatum', 'fall_id')[:self.per_page + 1]
+            )
+            has_more_before = len(rows) > self.per_page
+            rows = list(reversed(rows[:self.per_page]))
+            has_more_after = True
+        else:
+            queryset = self.queryset.order_by('-erstellungsdatum', '-fall_id')
+            if after_key:
+                datum, fall_id = after_key
+                queryset = queryset.filter(
+                    Q(erstellungsdatum__lt=datum) |
+                    Q(erstellungsdatum=datum, fall_id__lt=fall_id)
+                )
+            # One extra row tells us whether there is a next page without a COUNT
+            rows = list(queryset[:self.per_page + 1])
+            has_more_after = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_more_before = after_key is not None
+
+        next_cursor = None
+        previous_cursor = None
+        if rows and has_more_after:
+            next_cursor = encode_cursor(rows[-1].erstellungsdatum, rows[-1].fall_id)
+        if rows and has_more_before:
+            previous_cursor = encode_cursor(rows[0].erstellungsdatum, rows[0].fall_id)
+
+        return KeysetPage(
+            object_list=rows,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor,
+            approximate_count=self.get_approximate_count(),
+        )
+
+    def get_approximate_count(self) -> int:
+        """
+        Total number of rows, served from cache for COUNT_CACHE_SECONDS.
+        May lag behind by a few cases, which is fine for a "ca. N Fälle" hint.
+        """
+        if not self.count_cache_key:
+            return self.queryset.count()
+
+        count = cache.get(self.count_cache_key)
+        if count is None:
+            count = self.queryset.count()
+            cache.set(self.count_cache_key, count, COUNT_CACHE_SECONDS)
+        return count
+
+
+def build_count_cache_key(prefix: str, *parts: str) -> str:
+    """Stable cache key for a list view and its filter parameters."""
+    digest = hashlib.md5('|'.join(parts).encode()).hexdigest()
+    return f"{prefix}:{digest}"
@@ -0,0 +1,149 @@
+"""
+PDF rendering with reportlab (platypus).
+
+Rendering a full Statistikbogen or a large case dossier can take a while,
+so these functions are only called from the background jobs in
+services/report_jobs.py, never directly from a view.
+"""
+import io
+from xml.sax.saxutils import escape
+
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from core.models import Fall
+from core.services.case_loader import case_detail_queryset
+from core.services.statistik_engine import StatistikEngine
+
+
+TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f0f0f0')),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+])
+
+
+def _table(rows: list, col_widths: list = None) -> Table:
+    table = Table(rows, colWidths=col_widths, repeatRows=1)
+    table.setStyle(TABLE_STYLE)
+    return table
+
+
+def _build(story: list, title: str) -> bytes:
+    buffer = io.BytesIO()
+    document = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        title=title,
+        leftMargin=2 * cm,
+        rightMargin=2 * cm,
+        topMargin=2 * cm,
+        bottomMargin=2 * cm,
+    )
+    document.build(story)
+    return buffer.getvalue()
+
+
+def _display(value) -> str:
+    return '-' if value in (None, '') else str(value)
+
+
+def render_statistik_pdf(beratungsstelle: str, jahr: int) -> bytes:
+    """Statistikbogen of one Beratungsstelle and year (reads the materialized tables)."""
+    if not StatistikEngine.hasYear(jahr):
+        StatistikEngine.computeYear(jahr)
+
+    styles = getSampleStyleSheet()
+    stelle = dict(Fall.BERATUNGSSTELLE_CHOICES).get(beratungsstelle, beratungsstelle)
+    story = [
+        Paragraph(f'Statistikbogen {jahr}', styles['Title']),
+        Paragraph(stelle, styles['Normal']),
+        Paragraph(f'Erstellt am {timezone.localtime():%d.%m.%Y %H:%M}', styles['Normal']),
+        Spacer(1, 0.5 * cm),
+    ]
+    for tabelle in StatistikEngine.getReport(beratungsstelle, jahr):
+        rows = [[tabelle['titel'], 'Anzahl']]
+        rows += [[label, anzahl] for label, anzahl in tabelle['zeilen']]
+        rows.append(['Summe', tabelle['summe']])
+        story += [_table(rows, [13 * cm, 4 * cm]), Spacer(1, 0.4 * cm)]
+
+    return _build(story, f'Statistikbogen {jahr}')
+
+
+def render_dossier_pdf(fall_id) -> bytes:
+    """
+    Dossier of one case with all Beratungen, Gewalttaten and Folgen.
+
+    Raises:
+        Fall.DoesNotExist: If the case was deleted in the meantime
+    """
+    fall = case_detail_queryset().get(fall_id=fall_id)
+    personen = fall.personenbezogene_daten
+    styles = getSampleStyleSheet()
+
+    story = [
+        Paragraph(f'Falldossier: {escape(personen.alias)}', styles['Title']),
+        Paragraph(f'Erstellt am {timezone.localtime():%d.%m.%Y %H:%M}', styles['Normal']),
+        Spacer(1, 0.5 * cm),
+        Paragraph('Fallinformationen', styles['Heading2']),
+        _table([
+            ['Feld', 'Wert'],
+            ['Beratungsstelle', fall.get_zustaendige_beratungsstelle_display()],
+            ['Status', fall.get_status_display()],
+            ['Erstellt am', f'{fall.erstellungsdatum:%d.%m.%Y}'],
+            ['Informationsquelle', _display(fall.get_informationsquelle_display())],
+            ['Anzahl Beratungen', fall.beratungsanzahl],
+        ], [6 * cm, 11 * cm]),
+        Paragraph('Personenbezogene Daten', styles['Heading2']),
+        _table([
+            ['Feld', 'Wert'],
+            ['Rolle', personen.get_rolle_der_ratsuchenden_person_display()],
+            ['Alter', _display(personen.alter)],
+            ['Geschlechtsidentität', _display(personen.get_geschlechtsidentitaet_display())],
+            ['Sexualität', _display(personen.get_sexualitaet_display())],
+            ['Wohnort', _display(personen.get_wohnort_display())],
+            ['Berufliche Situation', _display(personen.get_berufliche_situation_display())],
+        ], [6 * cm, 11 * cm]),
+    ]
+
+    if fall.beratungen_sorted:
+        story += [
+            Paragraph('Beratungen', styles['Heading2']),
+            _table([['Datum', 'Art', 'Ort']] + [
+                [f'{beratung.datum:%d.%m.%Y}', beratung.get_durchfuehrungsart_display(),
+                 beratung.get_durchfuehrungsort_display()]
+                for beratung in fall.beratungen_sorted
+            ], [3 * cm, 6 * cm, 8 * cm]),
+        ]
+
+    if fall.gewalttaten_sorted:
+        story += [
+            Paragraph('Gewalttaten', styles['Heading2']),
+            _table([['Zeitraum', 'Arten', 'Tatort', 'Anzeige']] + [
+                [
+                    _display(gewalttat.zeitraum_von and f'{gewalttat.zeitraum_von:%d.%m.%Y}'),
+                    Paragraph(escape(', '.join(art.name for art in gewalttat.gewalttat_arten.all())) or '-',
+                              styles['BodyText']),
+                    _display(gewalttat.get_tatort_display()),
+                    _display(gewalttat.get_anzeige_display()),
+                ]
+                for gewalttat in fall.gewalttaten_sorted
+            ], [3 * cm, 7 * cm, 4 * cm, 3 * cm]),
+        ]
+
+    if fall.folgen_sorted:
+        story += [
+            Paragraph('Folgen der Gewalt', styles['Heading2']),
+            _table([['Kategorie', 'Folge']] + [
+                [relation.folge.get_kategorie_display(), relation.folge.name]
+                for relation in fall.folgen_sorted
+            ], [5 * cm, 12 * cm]),
+        ]
+
+    return _build(story, f'Falldossier {personen.alias}')
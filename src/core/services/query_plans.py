@@ -0,0 +1,178 @@
+"""
+QueryPlanChecker - EXPLAIN the hot queries and flag sequential scans.
+
+The indexes on Fall, Beratung and Gewalttat are there for a handful of
+query shapes (default case list, Beratungsstelle + year, yearly Beratung
+statistics, Tatort filter). A planner only shows whether it uses them on
+realistic volumes, so run() seeds synthetic rows inside a transaction,
+refreshes the planner statistics, EXPLAINs every KEY_QUERIES entry and
+rolls everything back. Used by `manage.py check_query_plans` and the tests.
+"""
+import datetime
+import re
+from dataclasses import dataclass
+from typing import Callable
+
+from django.db import connection, transaction
+from django.db.models import Count, QuerySet
+
+from core.models import Fall, Beratung, Gewalttat
+from core.services.pagination import DEFAULT_PAGE_SIZE
+
+
+# Year the key queries ask for; seeded rows are spread over SEED_JAHRE years ending here
+PLAN_JAHR = 2024
+SEED_JAHRE = 12
+
+# Rows per seeded date (one bulk INSERT per model)
+SEED_CHUNK_SIZE = 1000
+
+# Every n-th seeded Gewalttat happened abroad, the rest in Leipzig
+SELTENER_TATORT_EVERY = 50
+
+
+@dataclass(frozen=True)
+class KeyQuery:
+    """A query shape that must be answered from an index."""
+    name: str
+    table: str
+    build: Callable[[], QuerySet]
+
+
+KEY_QUERIES = [
+    KeyQuery(
+        'case_list_aktiv', Fall._meta.db_table,
+        lambda: Fall.objects.filter(status='AKTIV').order_by('-erstellungsdatum', '-fall_id')[:DEFAULT_PAGE_SIZE],
+    ),
+    KeyQuery(
+        'faelle_stelle_jahr', Fall._meta.db_table,
+        lambda: Fall.objects.filter(
+            zustaendige_beratungsstelle='FBS_2_LKNSA', erstellungsdatum__year=PLAN_JAHR
+        ).order_by(),
+    ),
+    KeyQuery(
+        'beratungen_jahr', Beratung._meta.db_table,
+        lambda: Beratung.objects.filter(datum__year=PLAN_JAHR).values(
+            'durchfuehrungsart'
+        ).annotate(anzahl=Count('pk')).order_by(),
+    ),
+    KeyQuery(
+        'gewalttaten_tatort', Gewalttat._meta.db_table,
+        lambda: Gewalttat.objects.filter(tatort='AUSLAND').order_by(),
+    ),
+]
+
+
+@dataclass
+class PlanResult:
+    name: str
+    table: str
+    plan: str
+    seq_scan: bool
+
+
+def seq_scanned_tables(plan: str) -> set[str]:
+    """Tables the plan reads with a full sequential scan."""
+    if connection.vendor == 'postgresql':
+        return set(re.findall(r'Seq Scan on "?(\w+)"?', plan))
+    if connection.vendor == 'sqlite':
+        # "SCAN fall" is a full scan, "SCAN fall USING INDEX ..." walks an index
+        tables = set()
+        for line in plan.splitlines():
+            match = re.search(r'\bSCAN (\w+)(.*)$', line)
+            if match and 'USING' not in match.group(2):
+                tables.add(match.group(1))
+        return tables
+    return set()
+
+
+class QueryPlanChecker:
+    """
+    Seeds a throwaway dataset and checks the plans of KEY_QUERIES.
+    """
+
+    @staticmethod
+    def seed(rows: int) -> None:
+        """
+        Insert `rows` cases with one Beratung and one Gewalttat each.
+        Uses bulk_create, so no signals (Täter:innen) run.
+        """
+        stellen = [code for code, _label in Fall.BERATUNGSSTELLE_CHOICES]
+        erster_tag = datetime.date(PLAN_JAHR - SEED_JAHRE + 1, 1, 1)
+        tage = (datetime.date(PLAN_JAHR, 12, 31) - erster_tag).days
+        chunks = max(1, -(-rows // SEED_CHUNK_SIZE))
+
+        for chunk in range(chunks):
+            anzahl = min(SEED_CHUNK_SIZE, rows - chunk * SEED_CHUNK_SIZE)
+            datum = erster_tag + datetime.timedelta(days=tage * chunk // chunks)
+            faelle = Fall.objects.bulk_create([
+                Fall(
+                    zustaendige_beratungsstelle=stellen[i % len(stellen)],
+                    status='AKTIV' if i % 3 == 0 else 'ARCHIVIERT',
+                )
+                for i in range(anzahl)
+            ])
+            fall_ids = [fall.pk for fall in faelle]
+            # erstellungsdatum is auto_now_add, bulk_create always writes today
+            Fall.objects.filter(pk__in=fall_ids).update(erstellungsdatum=datum)
+
+            Beratung.objects.bulk_create([
+                Beratung(
+                    fall_id=fall_id,
+                    datum=datum,
+                    durchfuehrungsart='PERSOENLICH',
+                    durchfuehrungsort='LEIPZIG_STADT',
+                )
+                for fall_id in fall_ids
+            ])
+            Gewalttat.objects.bulk_create([
+                Gewalttat(
+                    fall_id=fall_id,
+                    tatort='AUSLAND' if i % SELTENER_TATORT_EVERY == 0 else 'LEIPZIG',
+                )
+                for i, fall_id in enumerate(fall_ids)
+            ])
+
+    @staticmethod
+    def analyze() -> None:
+        """Refresh planner statistics so the seeded volume is taken into account."""
+        tables = [Fall._meta.db_table, Beratung._meta.db_table, Gewalttat._meta.db_table]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(f"ANALYZE {', '.join(tables)}")
+            elif connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+
+    @staticmethod
+    def explain(key_query: KeyQuery) -> PlanResult:
+        plan = key_query.build().explain()
+        return PlanResult(
+            name=key_query.name,
+            table=key_query.table,
+            plan=plan,
+            seq_scan=key_query.table in seq_scanned_tables(plan),
+        )
+
+    @staticmethod
+    def run(rows: int = 0, force_index: bool = False) -> list[PlanResult]:
+        """
+        Seed `rows` cases, EXPLAIN all key queries and roll the seed back.
+
+        Args:
+            rows: synthetic cases to add before explaining (0 = current data only)
+            force_index: discourage sequential scans (PostgreSQL enable_seqscan),
+                for small datasets where a scan would legitimately be cheaper
+
+        Returns:
+            list[PlanResult]: one result per KEY_QUERIES entry
+        """
+        with transaction.atomic():
+            if force_index and connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            if rows:
+                QueryPlanChecker.seed(rows)
+            QueryPlanChecker.analyze()
+            results = [QueryPlanChecker.explain(key_query) for key_query in KEY_QUERIES]
+            transaction.set_rollback(True)
+        return results
@@ -0,0 +1,145 @@
+"""
+Versioned caches for reference data (GewalttatArt, FolgenDerGewalt).
+
+Reference tables change a few times a year (via the admin) but are read on
+every add/edit form. Each snapshot is built once, stored in the cache under
+a version number and additionally memoized in the process. The version is
+a row in the reference_version table; saving or deleting a row bumps it
+(see core/signals.py). It lives in the database rather than the cache, so
+workers with their own LocMem cache see a change made by another worker
+on their next read as well. A read costs one primary key lookup.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Generic, Optional, TypeVar
+
+from django.core.cache import cache
+from django.db.models import F
+
+from core.models import GewalttatArt, FolgenDerGewalt, ReferenceVersion
+
+
+REFERENCE_CACHE_SECONDS = 60 * 60 * 24
+
+T = TypeVar('T')
+
+
+class ReferenceSnapshotCache(Generic[T]):
+    """
+    Cache of one immutable snapshot built by `builder`.
+
+    Usage:
+        arten = ReferenceSnapshotCache('gewalttat_art', build_gewalttat_art_hierarchy)
+        arten.get()         # cached snapshot
+        arten.invalidate()  # after a change
+    """
+
+    def __init__(self, name: str, builder: Callable[[], T]):
+        self.name = name
+        self.builder = builder
+        # (version, snapshot), one attribute so threads never see a mixed pair
+        self._memo: Optional[tuple[int, T]] = None
+
+    def _data_key(self, version: int) -> str:
+        return f'reference:{self.name}:v{version}'
+
+    def current_version(self) -> int:
+        version = ReferenceVersion.objects.filter(name=self.name).values_list('version', flat=True).first()
+        return 1 if version is None else version
+
+    def get(self) -> T:
+        version = self.current_version()
+        memo = self._memo
+        if memo is not None and memo[0] == version:
+            return memo[1]
+
+        snapshot = cache.get(self._data_key(version))
+        if snapshot is None:
+            snapshot = self.builder()
+            cache.set(self._data_key(version), snapshot, REFERENCE_CACHE_SECONDS)
+
+        self._memo = (version, snapshot)
+        return snapshot
+
+    def invalidate(self) -> None:
+        # part of the surrounding transaction, a rolled back change keeps the version
+        if not ReferenceVersion.objects.filter(name=self.name).update(version=F('version') + 1):
+            ReferenceVersion.objects.get_or_create(name=self.name, defaults={'version': 2})
+        self._memo = None
+
+
+@dataclass(frozen=True)
+class GewalttatArtHierarchy:
+    """
+    All GewalttatArt rows ordered by name, grouped for the hierarchical checkboxes.
+
+    subcategories_map: str(hauptkategorie art_id) -> [subcategories]
+    by_id: str(art_id) -> GewalttatArt (used to clean submitted ids without a query)
+    """
+    main_categories: list
+    subcategories_map: dict
+    by_id: dict = field(default_factory=dict)
+    sexuelle_belaestigung_id: Optional[str] = None
+
+
+def build_gewalttat_art_hierarchy() -> GewalttatArtHierarchy:
+    main_categories = []
+    subcategories_map = {}  # hauptkategorie_id -> [subcats]
+    all_arten = list(GewalttatArt.objects.all().order_by('name'))
+
+    for art in all_arten:
+        if not art.ist_unterkategorie:
+            main_categories.append(art)
+            subcategories_map[str(art.art_id)] = []
+    for art in all_arten:
+        parent_id = str(art.hauptkategorie_id) if art.hauptkategorie_id else None
+        if art.ist_unterkategorie and parent_id in subcategories_map:
+            subcategories_map[parent_id].append(art)
+
+    # the Sexuelle Belästigung category needs a subcategory (GewalttatForm.clean)
+    sexuelle_belaestigung_id = next(
+        (str(art.art_id) for art in main_categories if 'Sexuelle Belästigung' in art.name),
+        None,
+    )
+
+    return GewalttatArtHierarchy(
+        main_categories=main_categories,
+        subcategories_map=subcategories_map,
+        by_id={str(art.art_id): art for art in all_arten},
+        sexuelle_belaestigung_id=sexuelle_belaestigung_id,
+    )
+
+
+gewalttat_art_cache = ReferenceSnapshotCache('gewalttat_art', build_gewalttat_art_hierarchy)
+
+
+@dataclass(frozen=True)
+class FolgenSnapshot:
+    """
+    All FolgenDerGewalt ordered by kategorie and name.
+
+    by_id: str(folge_id) -> FolgenDerGewalt
+    """
+    folgen: tuple
+    by_id: dict
+
+    def available(self, linked_ids=(), keep_id=None) -> list:
+        """
+        Folgen that can still be linked to a case, computed in memory.
+
+        Args:
+            linked_ids: folge ids already linked to the case
+            keep_id: a linked id that stays selectable (the relation being edited)
+        """
+        excluded = {str(folge_id) for folge_id in linked_ids} - {str(keep_id)}
+        return [folge for folge in self.folgen if str(folge.folge_id) not in excluded]
+
+
+def build_folgen_snapshot() -> FolgenSnapshot:
+    folgen = tuple(FolgenDerGewalt.objects.all().order_by('kategorie', 'name'))
+    return FolgenSnapshot(
+        folgen=folgen,
+        by_id={str(folge.folge_id): folge for folge in folgen},
+    )
+
+
+folgen_cache = ReferenceSnapshotCache('folgen_der_gewalt', build_folgen_snapshot)
@@ -0,0 +1,182 @@
+"""
+ReportJobManager - PDF reports rendered outside the request/response cycle.
+
+A view only creates a ReportJob and returns; the render runs on one of
+the backends selected by settings.REPORT_JOB_BACKEND:
+
+    'thread'  in-process worker pool (default, no broker needed)
+    'celery'  core.tasks.run_report_job on the configured broker (Redis)
+    'sync'    right away in the calling thread (tests, management commands)
+
+The finished PDF is stored in ReportJob.datei (MEDIA_ROOT) and served
+through a permission-checked download view.
+
+Jobs of the 'thread' backend die with their process (restart, deploy), so
+a job still WARTEND/LAEUFT after STALE_JOB_MINUTES is marked as failed
+when it is read (see failStaleJob()).
+
+Jobs and their PDFs are kept for settings.REPORT_JOB_EXPIRY_HOURS; after
+that the download is refused and `python manage.py cleanup_report_jobs`
+(cron) deletes the files and rows (see deleteExpiredJobs()).
+"""
+import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import ReportJob
+from core.services.pdf_reports import render_dossier_pdf, render_statistik_pdf
+
+
+logger = logging.getLogger(__name__)
+
+# Parallel renders per process for the 'thread' backend
+THREAD_WORKERS = 2
+
+# A job not finished after this long is considered lost (no render takes that long)
+STALE_JOB_MINUTES = 30
+
+# Default for settings.REPORT_JOB_EXPIRY_HOURS
+REPORT_JOB_EXPIRY_HOURS = 24
+
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=THREAD_WORKERS, thread_name_prefix='report-job')
+    return _executor
+
+
+def _run_in_thread(job_id) -> None:
+    # worker threads get their own DB connection, close it when done
+    close_old_connections()
+    try:
+        ReportJobManager.runJob(job_id)
+    finally:
+        close_old_connections()
+
+
+def _expiry_cutoff() -> datetime.datetime:
+    hours = getattr(settings, 'REPORT_JOB_EXPIRY_HOURS', REPORT_JOB_EXPIRY_HOURS)
+    return timezone.now() - datetime.timedelta(hours=hours)
+
+
+def _render(job: ReportJob) -> tuple[str, bytes]:
+    """Returns (filename, pdf bytes) for a job."""
+    if job.art == 'STATISTIK':
+        jahr = int(job.parameter['jahr'])
+        beratungsstelle = job.parameter['beratungsstelle']
+        return f'statistik_{beratungsstelle}_{jahr}.pdf', render_statistik_pdf(beratungsstelle, jahr)
+    if job.art == 'DOSSIER':
+        return f"dossier_{job.parameter['fall_id']}.pdf", render_dossier_pdf(job.parameter['fall_id'])
+    raise ValueError(f'Unbekannte Report-Art: {job.art}')
+
+
+class ReportJobManager:
+    """
+    Service class for creating and running background report jobs.
+    """
+
+    @staticmethod
+    def submitJob(art: str, parameter: dict, user=None) -> ReportJob:
+        """
+        Create a job and hand it to the configured backend once the
+        surrounding transaction has committed.
+        """
+        job = ReportJob.objects.create(art=art, parameter=parameter, erstellt_von=user)
+        transaction.on_commit(lambda: ReportJobManager.dispatch(job.job_id))
+        return job
+
+    @staticmethod
+    def dispatch(job_id) -> None:
+        backend = getattr(settings, 'REPORT_JOB_BACKEND', 'thread')
+        if backend == 'celery':
+            from core.tasks import run_report_job
+            run_report_job.delay(str(job_id))
+        elif backend == 'sync':
+            ReportJobManager.runJob(job_id)
+        else:
+            _get_executor().submit(_run_in_thread, job_id)
+
+    @staticmethod
+    def failStaleJob(job: ReportJob) -> ReportJob:
+        """
+        Mark a job as failed if it is still open after STALE_JOB_MINUTES,
+        e.g. because the process running it was restarted.
+        """
+        if job.ist_abgeschlossen:
+            return job
+        grenze = timezone.now() - datetime.timedelta(minutes=STALE_JOB_MINUTES)
+        if job.erstellt_am >= grenze:
+            return job
+        # conditional update, a worker finishing right now wins
+        updated = ReportJob.objects.filter(
+            job_id=job.job_id, status__in=['WARTEND', 'LAEUFT']
+        ).update(
+            status='FEHLER',
+            fehler='Abgebrochen (Server wurde neu gestartet), bitte erneut erstellen',
+            fertig_am=timezone.now(),
+        )
+        if updated:
+            logger.warning('Report job %s marked as failed after %s minutes', job.job_id, STALE_JOB_MINUTES)
+        job.refresh_from_db()
+        return job
+
+    @staticmethod
+    def isExpired(job: ReportJob) -> bool:
+        """True once a finished job is older than REPORT_JOB_EXPIRY_HOURS."""
+        return job.fertig_am is not None and job.fertig_am < _expiry_cutoff()
+
+    @staticmethod
+    def deleteExpiredJobs() -> int:
+        """
+        Delete jobs finished more than REPORT_JOB_EXPIRY_HOURS ago (and open
+        jobs created before that, which no worker will finish) together
+        with their PDF files.
+
+        Returns:
+            int: number of deleted jobs
+        """
+        cutoff = _expiry_cutoff()
+        expired = ReportJob.objects.filter(
+            Q(fertig_am__lt=cutoff) | Q(fertig_am__isnull=True, erstellt_am__lt=cutoff)
+        )
+        deleted = 0
+        for job in expired.iterator():
+            if job.datei:
+                job.datei.delete(save=False)
+            job.delete()
+            deleted += 1
+        return deleted
+
+    @staticmethod
+    def runJob(job_id) -> ReportJob:
+        """
+        Render the PDF of a job and store it. Errors are recorded on the job.
+        """
+        job = ReportJob.objects.get(job_id=job_id)
+        job.status = 'LAEUFT'
+        job.save(update_fields=['status'])
+
+        try:
+            filename, pdf = _render(job)
+        except Exception as e:
+            logger.exception('Report job %s failed', job_id)
+            job.status = 'FEHLER'
+            job.fehler = str(e)
+            job.fertig_am = timezone.now()
+            job.save(update_fields=['status', 'fehler', 'fertig_am'])
+            return job
+
+        job.datei.save(filename, ContentFile(pdf), save=False)
+        job.status = 'FERTIG'
+        job.fertig_am = timezone.now()
+        job.save(update_fields=['datei', 'status', 'fertig_am'])
+        return job
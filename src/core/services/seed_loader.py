@@ -0,0 +1,282 @@
+"""
+BulkLoader - fast seed/import path that bypasses per-object save().
+
+loaddata saves every object on its own, so each Beratung recomputes its
+case aggregates and every Gewalttat rewrites its Taeterin rows one by
+one. BulkLoader collects rows per model, inserts them with bulk_create
+in foreign-key dependency order and brings the derived data up to date
+once at the end:
+
+- Fall.beratungsanzahl / letzte_beratung (one grouped UPDATE)
+- normalized Taeterin rows
+- cached reference data, role permissions and users
+- primary key sequences (rows come with explicit ids)
+
+Rows are flushed whenever FLUSH_THRESHOLD objects are buffered, so large
+JSON Lines files (and the synthetic data generator) stream with bounded
+memory. Foreign keys are created DEFERRABLE INITIALLY DEFERRED by Django,
+so rows flushed before their targets are fine inside the load transaction.
+"""
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from django.core import serializers
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Model
+
+from core.backends import invalidate_cached_users
+from core.models import (
+    Fall, Beratung, Gewalttat, Taeterin, User, Role, PermissionSet,
+    GewalttatArt, FolgenDerGewalt
+)
+from core.permissions import invalidate_role_permissions
+from core.services.beratung_manager import BeratungManager
+from core.services.reference_data import folgen_cache, gewalttat_art_cache
+from core.services.taeterinnen import TaeterinnenManager
+from core.validators.json_validators import validate_taeterinnen_details_bulk
+
+
+# Seed fixture of a fresh installation (relative to src/)
+SEED_FIXTURE = 'core/fixtures/seed_data.json'
+
+# Rows per INSERT statement
+BULK_BATCH_SIZE = 1000
+
+# Buffered objects (all models) that trigger a flush
+FLUSH_THRESHOLD = 20000
+
+# Rows per derived-data update after the load (pk__in lists)
+DERIVED_CHUNK_SIZE = 5000
+
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def dependency_order(models: Iterable[type]) -> list[type]:
+    """Models sorted so that FK targets come before the models pointing at them."""
+    models = list(models)
+    present = set(models)
+    ordered, seen = [], set()
+
+    def visit(model):
+        if model in seen:
+            return
+        seen.add(model)
+        for field in model._meta.concrete_fields:
+            related = field.related_model if field.is_relation else None
+            if related in present and related is not model:
+                visit(related)
+        ordered.append(model)
+
+    for model in models:
+        visit(model)
+    return ordered
+
+
+@contextmanager
+def _explicit_timestamps(objects: list):
+    """
+    bulk_create runs pre_save(add=True), which overwrites auto_now/auto_now_add
+    fields with now. Mark the rows so the KeepTimestamp fields keep the values
+    that came with them (missing ones still get now); only these instances
+    are affected, not other saves running at the same time.
+    """
+    for obj in objects:
+        obj._keep_timestamps = True
+    try:
+        yield
+    finally:
+        for obj in objects:
+            obj._keep_timestamps = False
+
+
+class BulkLoader:
+    """
+    Buffers model instances and inserts them with bulk_create.
+
+    Use as:
+        with transaction.atomic():
+            loader = BulkLoader()
+            for obj in objects:
+                loader.add(obj)
+            counts = loader.finish()
+    """
+
+    def __init__(self, batch_size: int = BULK_BATCH_SIZE, flush_threshold: int = FLUSH_THRESHOLD,
+                 full_rebuild: bool = False):
+        """
+        Args:
+            batch_size: rows per INSERT statement
+            flush_threshold: buffered objects that trigger a flush
+            full_rebuild: recompute the derived data of the whole database at
+                the end instead of only for the inserted rows; cheaper for
+                very large loads because no primary keys are kept in memory
+        """
+        self.batch_size = batch_size
+        self.flush_threshold = flush_threshold
+        self.full_rebuild = full_rebuild
+        self.buffers: dict[type, list] = {}
+        self.m2m_rows: dict[type, list] = {}
+        self.m2m_models: set[type] = set()
+        self.buffered = 0
+        self.counts: dict[type, int] = {}
+        # pks of everything inserted, per model (only without full_rebuild)
+        self.loaded: dict[type, list] = {}
+
+    def add(self, obj: Model, m2m_data: Optional[dict] = None) -> None:
+        """Queue one unsaved instance (and its auto-created M2M links)."""
+        model = type(obj)
+        self.buffers.setdefault(model, []).append(obj)
+        self.buffered += 1
+        for field_name, related_pks in (m2m_data or {}).items():
+            field = model._meta.get_field(field_name)
+            through = field.remote_field.through
+            if not through._meta.auto_created:
+                # explicit junction tables come as rows of their own
+                continue
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            self.m2m_rows.setdefault(through, []).extend(
+                through(**{f'{source}_id': obj.pk, f'{target}_id': related_pk})
+                for related_pk in related_pks
+            )
+        if self.buffered >= self.flush_threshold:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert everything buffered so far, in dependency order."""
+        for model in dependency_order(self.buffers):
+            objects = self.buffers.pop(model)
+            if model is Gewalttat:
+                self._validate_gewalttaten(objects)
+            with _explicit_timestamps(objects):
+                created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+            self.counts[model] = self.counts.get(model, 0) + len(created)
+            if not self.full_rebuild:
+                self.loaded.setdefault(model, []).extend(obj.pk for obj in created)
+        for through, rows in self.m2m_rows.items():
+            through.objects.bulk_create(rows, batch_size=self.batch_size, ignore_conflicts=True)
+            self.m2m_models.add(through)
+        self.m2m_rows = {}
+        self.buffered = 0
+
+    @staticmethod
+    def _validate_gewalttaten(gewalttaten: list) -> None:
+        errors = validate_taeterinnen_details_bulk(g.taeterinnen_details for g in gewalttaten)
+        if errors:
+            raise ValidationError({
+                f'gewalttat {gewalttaten[idx].pk}': error.messages for idx, error in errors.items()
+            })
+
+    def finish(self) -> dict[str, int]:
+        """
+        Flush the rest and update everything save()/signals would have maintained.
+
+        Returns:
+            dict: model label -> number of inserted rows
+        """
+        self.flush()
+        # before the derived updates, which create Taeterin rows themselves
+        self._resetSequences()
+        if self.full_rebuild:
+            self._rebuildAll()
+        else:
+            self._updateLoaded()
+
+        if GewalttatArt in self.counts:
+            gewalttat_art_cache.invalidate()
+        if FolgenDerGewalt in self.counts:
+            folgen_cache.invalidate()
+        return {model._meta.label: anzahl for model, anzahl in self.counts.items()}
+
+    def _resetSequences(self) -> None:
+        """
+        bulk_create inserts the fixture ids as given and leaves the AutoField
+        sequences behind them; move them past the highest loaded id so the
+        next regular save() does not collide (no-op on SQLite).
+        """
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), list(self.counts) + list(self.m2m_models)
+        )
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def _rebuildAll(self) -> None:
+        BeratungManager.recalculateAggregates()
+        if Gewalttat in self.counts and Taeterin not in self.counts:
+            TaeterinnenManager.rebuild()
+        if self.counts.keys() & {Role, PermissionSet, User}:
+            for role_id in Role.objects.values_list('pk', flat=True):
+                invalidate_role_permissions(role_id)
+            invalidate_cached_users(User.objects.values_list('pk', flat=True))
+
+    def _updateLoaded(self) -> None:
+        loaded = self.loaded
+
+        fall_ids = set(loaded.get(Fall, []))
+        for beratung_chunk in _chunks(loaded.get(Beratung, []), DERIVED_CHUNK_SIZE):
+            fall_ids.update(
+                Beratung.objects.filter(pk__in=beratung_chunk).values_list('fall_id', flat=True).distinct()
+            )
+        for fall_chunk in _chunks(sorted(fall_ids), DERIVED_CHUNK_SIZE):
+            BeratungManager.recalculateAggregates(fall_chunk)
+
+        if Gewalttat in loaded and Taeterin not in loaded:
+            for chunk in _chunks(loaded[Gewalttat], DERIVED_CHUNK_SIZE):
+                TaeterinnenManager.rebuild(chunk)
+
+        role_ids = set(loaded.get(Role, []))
+        role_ids.update(
+            PermissionSet.objects.filter(pk__in=loaded.get(PermissionSet, [])).values_list('role_id', flat=True)
+        )
+        for role_id in role_ids:
+            invalidate_role_permissions(role_id)
+        if User in loaded:
+            invalidate_cached_users(loaded[User])
+
+
+def _fixture_objects(path: Path) -> Iterator:
+    """
+    Deserialized objects of a fixture. .jsonl files hold one object (or a
+    list of objects) per line and are streamed; anything else is read as a
+    regular loaddata JSON fixture.
+    """
+    if path.suffix != '.jsonl':
+        with path.open(encoding='utf-8') as stream:
+            yield from serializers.deserialize('json', stream, ignorenonexistent=True)
+        return
+    with path.open(encoding='utf-8') as stream:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            yield from serializers.deserialize(
+                'python', data if isinstance(data, list) else [data], ignorenonexistent=True
+            )
+
+
+@transaction.atomic
+def load_fixtures(paths: Iterable, batch_size: int = BULK_BATCH_SIZE, full_rebuild: bool = False) -> dict[str, int]:
+    """
+    Bulk-load fixture files in one transaction.
+
+    Meant for empty databases and new data: existing primary keys are not
+    updated like loaddata does, the load fails with an IntegrityError instead.
+
+    Returns:
+        dict: model label -> number of inserted rows
+    """
+    loader = BulkLoader(batch_size=batch_size, full_rebuild=full_rebuild)
+    for path in paths:
+        for deserialized in _fixture_objects(Path(path)):
+            loader.add(deserialized.object, deserialized.m2m_data)
+    return loader.finish()
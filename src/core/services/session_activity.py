@@ -0,0 +1,79 @@
+"""
+Session activity tracking in core.Session.
+
+Writing last_activity on every click would mean one UPDATE per request.
+Instead a request only writes when no write happened for this session in
+the last ACTIVITY_FLUSH_SECONDS: cache.add() is atomic, so with a shared
+cache (Redis) at most one worker wins per session and interval.
+last_activity is therefore accurate to about a minute.
+
+Ended sessions and sessions idle for longer than SESSION_COOKIE_AGE are
+removed by purge_sessions() (`python manage.py cleanup_sessions`, cron).
+"""
+import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import Session
+
+
+ACTIVITY_FLUSH_SECONDS = 60
+
+
+def _flush_marker_key(session_key: str) -> str:
+    return f'session_activity:{session_key}'
+
+
+def start_session(session_key: str, user) -> None:
+    """Record a new login (called from the user_logged_in signal)."""
+    now = timezone.now()
+    Session.objects.update_or_create(
+        session_id=session_key,
+        defaults={'user': user, 'last_activity': now, 'is_active': True},
+    )
+    cache.set(_flush_marker_key(session_key), True, ACTIVITY_FLUSH_SECONDS)
+
+
+def touch_session(session_key: str, user) -> bool:
+    """
+    Update last_activity unless that was done within the flush interval.
+
+    Returns:
+        bool: True if the database was written
+    """
+    if not cache.add(_flush_marker_key(session_key), True, ACTIVITY_FLUSH_SECONDS):
+        return False
+
+    updated = Session.objects.filter(session_id=session_key).update(
+        last_activity=timezone.now(),
+        is_active=True,
+    )
+    if not updated:
+        # session started before tracking was enabled
+        start_session(session_key, user)
+    return True
+
+
+def end_session(session_key: str) -> None:
+    """Mark a session as ended (called from the user_logged_out signal)."""
+    Session.objects.filter(session_id=session_key).update(
+        is_active=False,
+        last_activity=timezone.now(),
+    )
+    cache.delete(_flush_marker_key(session_key))
+
+
+def purge_sessions() -> int:
+    """
+    Delete ended sessions and sessions whose Django session has expired
+    (no activity for SESSION_COOKIE_AGE).
+
+    Returns:
+        int: number of deleted rows
+    """
+    grenze = timezone.now() - datetime.timedelta(seconds=settings.SESSION_COOKIE_AGE)
+    deleted, _ = Session.objects.filter(Q(is_active=False) | Q(last_activity__lt=grenze)).delete()
+    return deleted
@@ -0,0 +1,251 @@
+"""
+StatistikEngine - Statistikbogen tables per Beratungsstelle and year.
+
+Every table is ONE grouped SQL query over all Beratungsstellen
+(GROUP BY beratungsstelle, value). Results are written to StatistikErgebnis,
+the report page only reads that table.
+
+Which cases belong to a year: created in that year OR had at least one
+Beratung in that year. Beratung tables count the sessions held in the year.
+"""
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from django.db import transaction
+from django.db.models import CharField, Count, F, Q, QuerySet, Value
+
+from core.models import (
+    Fall, PersonenbezogeneDaten, Beratung, Gewalttat,
+    FolgenDerGewalt, Gewalttat_GewalttatArt, Fall_FolgenDerGewalt, StatistikErgebnis, Taeterin
+)
+
+
+@dataclass(frozen=True)
+class StatistikTabelle:
+    """
+    Definition of one Statistikbogen table.
+
+    source(jahr) returns the rows to count, already reduced to
+    values(stelle=..., schluessel=...); count_field is what gets counted.
+    """
+    code: str
+    titel: str
+    source: Callable[[int], QuerySet]
+    choices: Optional[list] = None
+    count_field: str = 'pk'
+    distinct: bool = False
+
+
+def faelle_im_jahr(jahr: int) -> QuerySet:
+    """Ids of cases that count for `jahr` (created or counselled in that year)."""
+    return Fall.objects.filter(
+        Q(erstellungsdatum__year=jahr) | Q(beratungen__datum__year=jahr)
+    ).values('pk')
+
+
+def _fall_values(field: str) -> Callable[[int], QuerySet]:
+    def source(jahr):
+        return Fall.objects.filter(pk__in=faelle_im_jahr(jahr)).values(
+            stelle=F('zustaendige_beratungsstelle'),
+            schluessel=F(field),
+        )
+    return source
+
+
+def _beratung_values(field: str) -> Callable[[int], QuerySet]:
+    def source(jahr):
+        return Beratung.objects.filter(datum__year=jahr).values(
+            stelle=F('fall__zustaendige_beratungsstelle'),
+            schluessel=F(field),
+        )
+    return source
+
+
+def _gewalttat_values(field: str) -> Callable[[int], QuerySet]:
+    def source(jahr):
+        return Gewalttat.objects.filter(fall__in=faelle_im_jahr(jahr)).values(
+            stelle=F('fall__zustaendige_beratungsstelle'),
+            schluessel=F(field),
+        )
+    return source
+
+
+def _gewalttat_art_values(jahr: int) -> QuerySet:
+    return Gewalttat_GewalttatArt.objects.filter(
+        gewalttat__fall__in=faelle_im_jahr(jahr)
+    ).values(
+        stelle=F('gewalttat__fall__zustaendige_beratungsstelle'),
+        schluessel=F('art__name'),
+    )
+
+
+def _taeterin_verhaeltnis_values(jahr: int) -> QuerySet:
+    return Taeterin.objects.filter(
+        gewalttat__fall__in=faelle_im_jahr(jahr)
+    ).values(
+        stelle=F('gewalttat__fall__zustaendige_beratungsstelle'),
+        schluessel=F('verhaeltnis'),
+    )
+
+
+def _folgen_kategorie_values(jahr: int) -> QuerySet:
+    return Fall_FolgenDerGewalt.objects.filter(
+        fall__in=faelle_im_jahr(jahr)
+    ).values(
+        stelle=F('fall__zustaendige_beratungsstelle'),
+        schluessel=F('folge__kategorie'),
+    )
+
+
+def _gesamt_faelle(jahr: int) -> QuerySet:
+    return Fall.objects.filter(pk__in=faelle_im_jahr(jahr)).values(
+        stelle=F('zustaendige_beratungsstelle'),
+        schluessel=Value('', output_field=CharField()),
+    )
+
+
+TABELLEN = [
+    StatistikTabelle('faelle', 'Fälle im Berichtsjahr', _gesamt_faelle, [('', 'Anzahl Fälle')]),
+    StatistikTabelle('informationsquelle', 'Wie von der Beratungsstelle erfahren',
+                     _fall_values('informationsquelle'), Fall.INFO_QUELLE_CHOICES),
+    StatistikTabelle('rolle', 'Rolle der ratsuchenden Person',
+                     _fall_values('personenbezogene_daten__rolle_der_ratsuchenden_person'),
+                     PersonenbezogeneDaten.ROLLE_CHOICES),
+    StatistikTabelle('geschlechtsidentitaet', 'Geschlechtsidentität',
+                     _fall_values('personenbezogene_daten__geschlechtsidentitaet'),
+                     PersonenbezogeneDaten.GESCHLECHT_CHOICES),
+    StatistikTabelle('sexualitaet', 'Sexualität',
+                     _fall_values('personenbezogene_daten__sexualitaet'),
+                     PersonenbezogeneDaten.SEXUALITAET_CHOICES),
+    StatistikTabelle('wohnort', 'Wohnort',
+                     _fall_values('personenbezogene_daten__wohnort'),
+                     PersonenbezogeneDaten.WOHNORT_CHOICES),
+    StatistikTabelle('staatsangehoerigkeit', 'Staatsangehörigkeit',
+                     _fall_values('personenbezogene_daten__staatsangehoerigkeit_deutsch'),
+                     PersonenbezogeneDaten.STAATSANGEHOERIGKEIT_CHOICES),
+    StatistikTabelle('berufliche_situation', 'Berufliche Situation',
+                     _fall_values('personenbezogene_daten__berufliche_situation'),
+                     PersonenbezogeneDaten.BERUF_CHOICES),
+    StatistikTabelle('durchfuehrungsart', 'Beratungen nach Durchführungsart',
+                     _beratung_values('durchfuehrungsart'), Beratung.DURCHFUEHRUNGSART_CHOICES),
+    StatistikTabelle('durchfuehrungsort', 'Beratungen nach Ort',
+                     _beratung_values('durchfuehrungsort'), Beratung.ORT_CHOICES),
+    StatistikTabelle('gewalttat_art', 'Art der Gewalt', _gewalttat_art_values),
+    StatistikTabelle('tatort', 'Tatort',
+                     _gewalttat_values('tatort'), Gewalttat.TATORT_CHOICES),
+    StatistikTabelle('anzeige', 'Anzeige',
+                     _gewalttat_values('anzeige'), Gewalttat.ANZEIGE_CHOICES),
+    StatistikTabelle('medizinische_versorgung', 'Medizinische Versorgung',
+                     _gewalttat_values('medizinische_versorgung'),
+                     Gewalttat.JA_NEIN_KEINE_ANGABE_CHOICES),
+    StatistikTabelle('vertrauliche_spurensicherung', 'Vertrauliche Spurensicherung',
+                     _gewalttat_values('vertrauliche_spurensicherung'),
+                     Gewalttat.JA_NEIN_KEINE_ANGABE_CHOICES),
+    # one row per perpetrator (normalized from Gewalttat.taeterinnen_details)
+    StatistikTabelle('taeter_verhaeltnis', 'Täter:innen nach Verhältnis zur ratsuchenden Person',
+                     _taeterin_verhaeltnis_values, Taeterin.VERHAELTNIS_CHOICES),
+    # cases per Folgen-Kategorie, a case with 3 psychische Folgen counts once
+    StatistikTabelle('folgen_kategorie', 'Folgen der Gewalt (Fälle je Kategorie)',
+                     _folgen_kategorie_values, FolgenDerGewalt.FOLGEN_KATEGORIE_CHOICES,
+                     count_field='fall', distinct=True),
+]
+
+TABELLEN_BY_CODE = {tabelle.code: tabelle for tabelle in TABELLEN}
+
+# Label for rows where the field was left empty
+NICHT_ERFASST = 'nicht erfasst'
+
+
+class StatistikEngine:
+    """
+    Computes and reads the materialized Statistikbogen tables.
+    """
+
+    @staticmethod
+    def computeTable(tabelle: StatistikTabelle, jahr: int) -> list[dict]:
+        """
+        Run the grouped query of one table for all Beratungsstellen.
+
+        Returns:
+            list of {'stelle', 'schluessel', 'anzahl'} rows
+        """
+        return list(
+            tabelle.source(jahr).order_by().values('stelle', 'schluessel').annotate(
+                anzahl=Count(tabelle.count_field, distinct=tabelle.distinct)
+            )
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def computeYear(jahr: int) -> int:
+        """
+        Recompute all tables for `jahr` and replace the stored results.
+
+        Returns:
+            int: number of StatistikErgebnis rows written
+        """
+        ergebnisse = []
+        for tabelle in TABELLEN:
+            rows = StatistikEngine.computeTable(tabelle, jahr)
+            if tabelle.code == 'faelle':
+                # a 0 total for every Beratungsstelle without cases, so a year
+                # without data still counts as computed (see hasYear)
+                gezaehlt = {row['stelle'] for row in rows}
+                rows += [
+                    {'stelle': stelle, 'schluessel': '', 'anzahl': 0}
+                    for stelle, _label in Fall.BERATUNGSSTELLE_CHOICES if stelle not in gezaehlt
+                ]
+            for row in rows:
+                ergebnisse.append(StatistikErgebnis(
+                    beratungsstelle=row['stelle'],
+                    jahr=jahr,
+                    tabelle=tabelle.code,
+                    schluessel=str(row.get('schluessel') or ''),
+                    anzahl=row['anzahl'],
+                ))
+
+        StatistikErgebnis.objects.filter(jahr=jahr).delete()
+        StatistikErgebnis.objects.bulk_create(ergebnisse)
+        return len(ergebnisse)
+
+    @staticmethod
+    def hasYear(jahr: int) -> bool:
+        """True if `jahr` has been computed (also when it had no data at all)."""
+        return StatistikErgebnis.objects.filter(jahr=jahr).exists()
+
+    @staticmethod
+    def getReport(beratungsstelle: str, jahr: int) -> list[dict]:
+        """
+        Read the stored tables of one Beratungsstelle and year for rendering.
+
+        Every choice is listed (with 0 if nothing was counted) so the
+        report always has the same rows as the paper Statistikbogen.
+
+        Returns:
+            list of {'code', 'titel', 'zeilen': [(label, anzahl), ...], 'summe'}
+        """
+        counts = {}
+        for ergebnis in StatistikErgebnis.objects.filter(
+            beratungsstelle=beratungsstelle, jahr=jahr
+        ).values('tabelle', 'schluessel', 'anzahl'):
+            counts.setdefault(ergebnis['tabelle'], {})[ergebnis['schluessel']] = ergebnis['anzahl']
+
+        report = []
+        for tabelle in TABELLEN:
+            tabellen_counts = counts.get(tabelle.code, {})
+            if tabelle.choices:
+                zeilen = [(label, tabellen_counts.get(value, 0)) for value, label in tabelle.choices]
+                if tabellen_counts.get('') and '' not in dict(tabelle.choices):
+                    zeilen.append((NICHT_ERFASST, tabellen_counts['']))
+            else:
+                zeilen = [
+                    (schluessel or NICHT_ERFASST, anzahl)
+                    for schluessel, anzahl in sorted(tabellen_counts.items())
+                ]
+            report.append({
+                'code': tabelle.code,
+                'titel': tabelle.titel,
+                'zeilen': zeilen,
+                'summe': sum(anzahl for _label, anzahl in zeilen),
+            })
+        return report
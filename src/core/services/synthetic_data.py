@@ -0,0 +1,221 @@
+"""
+SyntheticDataGenerator - realistic volumes of cases for load and scale tests.
+
+Every generated case gets PersonenbezogeneDaten, a number of Beratungen,
+Gewalttaten (with valid taeterinnen_details and GewalttatArt links) and
+Folgen der Gewalt. All rows go through BulkLoader (services/seed_loader.py),
+so they are bulk-inserted and the derived data (case aggregates,
+Täter:innen) is computed once at the end.
+
+Choice fields are sampled from their model choices, uniformly unless the
+distributions override them:
+
+    {
+        "Fall.status": {"AKTIV": 7, "ARCHIVIERT": 3},
+        "Gewalttat.tatort": {"LEIPZIG": 5, "AUSLAND": 1, "null": 1},
+        "Taeterin.verhaeltnis": {"Partner:in": 3, "Bekannte:r": 2},
+        "anzahl.beratungen": {"1": 2, "3": 5, "8": 1}
+    }
+
+Weights are relative; "null" stands for an empty (NULL) value. The same
+seed and end date (`bis`, default today) produce the same dataset,
+including primary keys, aliases and dates.
+"""
+import datetime
+import itertools
+import random
+import uuid
+from typing import Optional
+
+from django.utils import timezone
+
+from core.models import (
+    Fall, PersonenbezogeneDaten, Beratung, Gewalttat, Taeterin,
+    GewalttatArt, Gewalttat_GewalttatArt, FolgenDerGewalt, Fall_FolgenDerGewalt
+)
+from core.services.seed_loader import BulkLoader
+
+
+# Years back from the end date the erstellungsdatum is spread over
+DEFAULT_JAHRE = 5
+
+# Default counts per case / per Gewalttat (value -> weight)
+DEFAULT_ANZAHL_VERTEILUNGEN = {
+    'beratungen': {0: 1, 1: 3, 2: 3, 3: 2, 5: 1, 10: 1},
+    'gewalttaten': {0: 1, 1: 6, 2: 2, 3: 1},
+    'taeterinnen': {1: 7, 2: 2, 3: 1},
+    'gewalttat_arten': {1: 6, 2: 3, 3: 1},
+    'folgen': {0: 2, 1: 3, 2: 3, 4: 2, 8: 1},
+}
+
+# Choice fields that are derived from other values instead of sampled
+ABGELEITETE_FELDER = {
+    'PersonenbezogeneDaten.form_der_behinderung',
+    'Gewalttat.anzahl_taeterinnen',
+}
+
+NULL_KEY = 'null'
+
+
+class Verteilung:
+    """Weighted choice over a fixed list of values."""
+
+    def __init__(self, weights: dict):
+        self.values = list(weights)
+        self.cum_weights = list(itertools.accumulate(weights.values()))
+        if not self.values or self.cum_weights[-1] <= 0:
+            raise ValueError("Verteilung braucht mindestens ein positives Gewicht")
+
+    def sample(self, rng: random.Random):
+        return rng.choices(self.values, cum_weights=self.cum_weights)[0]
+
+    def sample_many(self, rng: random.Random, population: list) -> list:
+        """Sample a count from this distribution, then that many distinct items."""
+        return rng.sample(population, min(self.sample(rng), len(population)))
+
+
+class SyntheticDataGenerator:
+    """
+    Generates cases into a BulkLoader.
+
+    Usage:
+        with transaction.atomic():
+            loader = BulkLoader(full_rebuild=True)
+            SyntheticDataGenerator(seed=42).generate(100000, loader)
+            loader.finish()
+    """
+
+    def __init__(self, seed: Optional[int] = None, distributions: Optional[dict] = None,
+                 jahre: int = DEFAULT_JAHRE, alias_prefix: str = 'SYN',
+                 bis: Optional[datetime.date] = None):
+        self.rng = random.Random(seed)
+        self.alias_prefix = alias_prefix
+        # fixed end date for reproducible dates, otherwise today
+        self.bis = bis or timezone.localdate()
+        self.von = self.bis - datetime.timedelta(days=365 * jahre)
+        self.verteilungen = self._buildVerteilungen(distributions or {})
+
+        # reference data is linked, not generated
+        self.gewalttat_art_ids = list(GewalttatArt.objects.order_by('pk').values_list('pk', flat=True))
+        self.folgen_ids = list(FolgenDerGewalt.objects.order_by('pk').values_list('pk', flat=True))
+
+    def _buildVerteilungen(self, overrides: dict) -> dict:
+        verteilungen = {}
+        nullable = set()
+        for model in (Fall, PersonenbezogeneDaten, Beratung, Gewalttat, Taeterin):
+            for field in model._meta.concrete_fields:
+                key = f'{model.__name__}.{field.name}'
+                if field.choices and key not in ABGELEITETE_FELDER:
+                    verteilungen[key] = {value: 1 for value, _label in field.choices}
+                    if field.null:
+                        nullable.add(key)
+        verteilungen['Taeterin.geschlecht'] = {
+            value: 1 for value, _label in PersonenbezogeneDaten.GESCHLECHT_CHOICES
+        }
+        for name, weights in DEFAULT_ANZAHL_VERTEILUNGEN.items():
+            verteilungen[f'anzahl.{name}'] = dict(weights)
+
+        for key, weights in overrides.items():
+            if key not in verteilungen:
+                raise ValueError(f"Unbekannte Verteilung '{key}', möglich: {', '.join(sorted(verteilungen))}")
+            allowed = verteilungen[key]
+            parsed = {}
+            for raw_value, weight in weights.items():
+                value = self._parseValue(key, raw_value)
+                if value is None and key not in nullable:
+                    raise ValueError(f"{key} darf nicht leer sein")
+                if value is not None and value not in allowed and not key.startswith('anzahl.'):
+                    raise ValueError(f"'{raw_value}' ist kein gültiger Wert für {key}")
+                if key.startswith('anzahl.') and value < 0:
+                    raise ValueError(f"Negative Anzahl für {key}")
+                parsed[value] = weight
+            verteilungen[key] = parsed
+
+        return {key: Verteilung(weights) for key, weights in verteilungen.items()}
+
+    @staticmethod
+    def _parseValue(key: str, raw_value):
+        if raw_value == NULL_KEY:
+            return None
+        if key.startswith('anzahl.'):
+            return int(raw_value)
+        return raw_value
+
+    def _sample(self, key: str):
+        return self.verteilungen[key].sample(self.rng)
+
+    def _sampleFields(self, model: type) -> dict:
+        prefix = f'{model.__name__}.'
+        return {
+            key[len(prefix):]: self._sample(key)
+            for key in self.verteilungen if key.startswith(prefix) and key != 'Taeterin.geschlecht'
+        }
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _datum(self, von: datetime.date, bis: datetime.date) -> datetime.date:
+        return von + datetime.timedelta(days=self.rng.randint(0, max(0, (bis - von).days)))
+
+    def generate(self, anzahl: int, loader: BulkLoader) -> None:
+        """Queue `anzahl` complete cases in `loader` (call loader.finish() afterwards)."""
+        for _ in range(anzahl):
+            self._addFall(loader)
+
+    def _addFall(self, loader: BulkLoader) -> None:
+        erstellt = self._datum(self.von, self.bis)
+        fall = Fall(fall_id=self._uuid(), erstellungsdatum=erstellt, **self._sampleFields(Fall))
+        loader.add(fall)
+
+        person = self._sampleFields(PersonenbezogeneDaten)
+        if person.get('schwerbehinderung') == 'JA':
+            person['form_der_behinderung'] = self.rng.choice(['KOGNITIV', 'KOERPERLICH'])
+        loader.add(PersonenbezogeneDaten(
+            personenbezogene_daten_id=self._uuid(),
+            fall_id=fall.fall_id,
+            alias=f'{self.alias_prefix}-{fall.fall_id.hex[:16]}',
+            alter=self.rng.randint(14, 80),
+            **person,
+        ))
+
+        for _ in range(self._sample('anzahl.beratungen')):
+            loader.add(Beratung(
+                beratung_id=self._uuid(),
+                fall_id=fall.fall_id,
+                datum=self._datum(erstellt, min(self.bis, erstellt + datetime.timedelta(days=365))),
+                **self._sampleFields(Beratung),
+            ))
+
+        for _ in range(self._sample('anzahl.gewalttaten')):
+            self._addGewalttat(fall, loader)
+
+        for folge_id in self.verteilungen['anzahl.folgen'].sample_many(self.rng, self.folgen_ids):
+            loader.add(Fall_FolgenDerGewalt(fall_id=fall.fall_id, folge_id=folge_id))
+
+    def _addGewalttat(self, fall: Fall, loader: BulkLoader) -> None:
+        taeterinnen = [
+            {
+                'geschlecht': self._sample('Taeterin.geschlecht'),
+                'verhaeltnis_zur_ratsuchenden_person': self._sample('Taeterin.verhaeltnis'),
+            }
+            for _ in range(self._sample('anzahl.taeterinnen'))
+        ]
+        felder = self._sampleFields(Gewalttat)
+        if felder.get('zahl_der_vorfaelle') == 'GENAUE_ZAHL':
+            felder['zahl_der_vorfaelle_genau'] = self.rng.randint(2, 20)
+
+        von = self._datum(fall.erstellungsdatum - datetime.timedelta(days=3 * 365), fall.erstellungsdatum)
+        gewalttat = Gewalttat(
+            gewalttat_id=self._uuid(),
+            fall_id=fall.fall_id,
+            zeitraum_von=von,
+            zeitraum_bis=self._datum(von, fall.erstellungsdatum),
+            anzahl_taeterinnen='1' if len(taeterinnen) == 1 else 'GENAUE_ZAHL',
+            anzahl_taeterinnen_genau=len(taeterinnen),
+            taeterinnen_details=taeterinnen,
+            **felder,
+        )
+        loader.add(gewalttat)
+
+        for art_id in self.verteilungen['anzahl.gewalttat_arten'].sample_many(self.rng, self.gewalttat_art_ids):
+            loader.add(Gewalttat_GewalttatArt(gewalttat_id=gewalttat.gewalttat_id, art_id=art_id))
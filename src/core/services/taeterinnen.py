@@ -0,0 +1,91 @@
+"""
+TaeterinnenManager - keeps the Taeterin table in sync with
+Gewalttat.taeterinnen_details.
+
+The JSON list is what the forms edit; the normalized rows exist so
+statistics like "Partner:in als Täter:in pro Jahr" are a GROUP BY over an
+indexed column instead of loading and parsing every Gewalttat in Python.
+A save rewrites the rows of that one Gewalttat (signal in core/signals.py),
+rebuild() re-derives them in bulk for back-fills and bulk imports.
+"""
+from typing import Iterable, Optional
+from uuid import UUID
+
+from django.db import transaction
+
+from core.models import Gewalttat, Taeterin
+
+
+# Gewalttaten read per batch in rebuild()
+REBUILD_CHUNK_SIZE = 1000
+
+# Rows per INSERT statement in bulk_create
+BULK_BATCH_SIZE = 1000
+
+GESCHLECHT_MAX_LENGTH = Taeterin._meta.get_field('geschlecht').max_length
+
+
+def taeterinnen_from_details(gewalttat_id, details) -> list[Taeterin]:
+    """Unsaved Taeterin rows for one (already validated) taeterinnen_details list."""
+    return [
+        Taeterin(
+            gewalttat_id=gewalttat_id,
+            position=position,
+            geschlecht=(entry.get('geschlecht') or '')[:GESCHLECHT_MAX_LENGTH],
+            verhaeltnis=entry.get('verhaeltnis_zur_ratsuchenden_person') or '',
+        )
+        for position, entry in enumerate(details or [])
+        if isinstance(entry, dict)
+    ]
+
+
+class TaeterinnenManager:
+    """
+    Derives Taeterin rows from the JSON details of Gewalttaten.
+    """
+
+    @staticmethod
+    @transaction.atomic
+    def syncGewalttat(gewalttat: Gewalttat) -> None:
+        """Replace the Taeterin rows of one Gewalttat (one DELETE, one INSERT)."""
+        Taeterin.objects.filter(gewalttat_id=gewalttat.pk).delete()
+        rows = taeterinnen_from_details(gewalttat.pk, gewalttat.taeterinnen_details)
+        if rows:
+            Taeterin.objects.bulk_create(rows)
+
+    @staticmethod
+    def rebuild(gewalttat_ids: Optional[Iterable[UUID]] = None) -> int:
+        """
+        Re-derive the Taeterin rows from taeterinnen_details.
+
+        Args:
+            gewalttat_ids: only these Gewalttaten (None = all)
+
+        Returns:
+            int: number of Taeterin rows written
+        """
+        gewalttaten = Gewalttat.objects.order_by()
+        if gewalttat_ids is not None:
+            gewalttaten = gewalttaten.filter(pk__in=list(gewalttat_ids))
+
+        written = 0
+        batch = []
+        rows = gewalttaten.values_list('pk', 'taeterinnen_details')
+        for gewalttat_id, details in rows.iterator(chunk_size=REBUILD_CHUNK_SIZE):
+            batch.append((gewalttat_id, details))
+            if len(batch) >= REBUILD_CHUNK_SIZE:
+                written += TaeterinnenManager._replaceBatch(batch)
+                batch = []
+        if batch:
+            written += TaeterinnenManager._replaceBatch(batch)
+        return written
+
+    @staticmethod
+    @transaction.atomic
+    def _replaceBatch(batch: list) -> int:
+        Taeterin.objects.filter(gewalttat_id__in=[gewalttat_id for gewalttat_id, _ in batch]).delete()
+        rows = []
+        for gewalttat_id, details in batch:
+            rows.extend(taeterinnen_from_details(gewalttat_id, details))
+        Taeterin.objects.bulk_create(rows, batch_size=BULK_BATCH_SIZE)
+        return len(rows)
@@ -0,0 +1,89 @@
+"""
+Excel exports with openpyxl in write-only mode.
+
+A write-only workbook serializes every appended row to a temporary file
+right away, so memory stays constant no matter how many rows are written.
+Rows come from the same chunked iterators as the CSV export
+(services/case_export.py); the finished file is spooled to disk and
+handed to a FileResponse.
+"""
+import tempfile
+from typing import IO, Iterable, Optional
+from uuid import UUID
+
+from django.db.models import QuerySet
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+
+from core.models import Fall
+from core.services.case_export import case_export_queryset, iter_case_rows
+from core.services.statistik_engine import StatistikEngine
+
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def _cell_value(worksheet, value):
+    # openpyxl only writes primitive types
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, str) and value.startswith('='):
+        # openpyxl stores '=...' strings as formulas; entered text stays text
+        cell = WriteOnlyCell(worksheet, value=value)
+        cell.data_type = 's'
+        return cell
+    return value
+
+
+def append_rows(worksheet, rows: Iterable[list]) -> int:
+    """Append rows to a write-only worksheet, returns the number of rows written."""
+    written = 0
+    for row in rows:
+        worksheet.append([_cell_value(worksheet, value) for value in row])
+        written += 1
+    return written
+
+
+def write_case_sheet(workbook: Workbook, cases: Optional[QuerySet] = None) -> int:
+    """Raw case data, one row per Fall (same columns as the CSV export)."""
+    worksheet = workbook.create_sheet('Fälle')
+    return append_rows(worksheet, iter_case_rows(case_export_queryset(cases)))
+
+
+def write_statistik_sheet(workbook: Workbook, beratungsstelle: str, jahr: int) -> int:
+    """All Statistikbogen tables of one Beratungsstelle and year on one sheet."""
+    worksheet = workbook.create_sheet(f'Statistik {jahr}')
+    stellen = dict(Fall.BERATUNGSSTELLE_CHOICES)
+
+    def rows():
+        yield [f'Statistikbogen {jahr}', stellen.get(beratungsstelle, beratungsstelle)]
+        for tabelle in StatistikEngine.getReport(beratungsstelle, jahr):
+            yield []
+            yield [tabelle['titel'], 'Anzahl']
+            yield from ([label, anzahl] for label, anzahl in tabelle['zeilen'])
+            yield ['Summe', tabelle['summe']]
+
+    return append_rows(worksheet, rows())
+
+
+def save_workbook(workbook: Workbook) -> IO[bytes]:
+    """
+    Save a workbook to a temporary file and rewind it.
+    The file is deleted when closed (FileResponse closes it after sending).
+    """
+    output = tempfile.TemporaryFile(suffix='.xlsx')
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+def build_case_workbook(cases: Optional[QuerySet] = None) -> IO[bytes]:
+    workbook = Workbook(write_only=True)
+    write_case_sheet(workbook, cases)
+    return save_workbook(workbook)
+
+
+def build_statistik_workbook(beratungsstelle: str, jahr: int) -> IO[bytes]:
+    workbook = Workbook(write_only=True)
+    write_statistik_sheet(workbook, beratungsstelle, jahr)
+    return save_workbook(workbook)
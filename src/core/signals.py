@@ -0,0 +1,77 @@
+"""
+Signal handlers of the core app (connected in CoreConfig.ready()).
+
+Permission / user cache: a saved/deleted Role or PermissionSet drops the
+cached flags of that role (see core/permissions.py) and the cached users
+of the role (see core/backends.py); a saved/deleted User drops itself.
+
+Reference data: saving/deleting GewalttatArt or FolgenDerGewalt
+invalidates the cached snapshot (see services/reference_data.py).
+
+Täter:innen: saving a Gewalttat rewrites its normalized Taeterin rows
+(see services/taeterinnen.py); deletes cascade.
+
+Session tracking: login/logout open and close the core.Session row
+(see services/session_activity.py).
+"""
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.backends import invalidate_cached_users
+from core.models import Gewalttat, User, Role, PermissionSet, GewalttatArt, FolgenDerGewalt
+from core.permissions import invalidate_role_permissions
+from core.services.reference_data import folgen_cache, gewalttat_art_cache
+from core.services.session_activity import end_session, start_session
+from core.services.taeterinnen import TaeterinnenManager
+
+
+@receiver(post_save, sender=Gewalttat, dispatch_uid='taeterinnen_gewalttat_post_save')
+def _gewalttat_post_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and 'taeterinnen_details' not in update_fields:
+        return
+    TaeterinnenManager.syncGewalttat(instance)
+
+
+def _invalidate_role(role_id):
+    invalidate_role_permissions(role_id)
+    invalidate_cached_users(User.objects.filter(role_id=role_id).values_list('pk', flat=True))
+
+
+@receiver([post_save, post_delete], sender=PermissionSet, dispatch_uid='permissions_permissionset_changed')
+def _permission_set_changed(sender, instance, **kwargs):
+    _invalidate_role(instance.role_id)
+
+
+@receiver([post_save, post_delete], sender=Role, dispatch_uid='permissions_role_changed')
+def _role_changed(sender, instance, **kwargs):
+    _invalidate_role(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=User, dispatch_uid='auth_user_changed')
+def _user_changed(sender, instance, **kwargs):
+    invalidate_cached_users([instance.pk])
+
+
+@receiver(user_logged_in, dispatch_uid='session_activity_login')
+def _user_logged_in(sender, request, user, **kwargs):
+    if request is not None and hasattr(request, 'session') and request.session.session_key:
+        start_session(request.session.session_key, user)
+
+
+@receiver(user_logged_out, dispatch_uid='session_activity_logout')
+def _user_logged_out(sender, request, user, **kwargs):
+    if request is not None and hasattr(request, 'session') and request.session.session_key:
+        end_session(request.session.session_key)
+
+
+@receiver([post_save, post_delete], sender=GewalttatArt, dispatch_uid='reference_gewalttat_art_changed')
+def _gewalttat_art_changed(sender, instance, **kwargs):
+    gewalttat_art_cache.invalidate()
+
+
+@receiver([post_save, post_delete], sender=FolgenDerGewalt, dispatch_uid='reference_folgen_changed')
+def _folgen_changed(sender, instance, **kwargs):
+    folgen_cache.invalidate()
@@ -0,0 +1,12 @@
+"""
+Celery tasks of the core app.
+Only used with REPORT_JOB_BACKEND='celery' (see services/report_jobs.py).
+"""
+from celery import shared_task
+
+from core.services.report_jobs import ReportJobManager
+
+
+@shared_task(ignore_result=True)
+def run_report_job(job_id):
+    ReportJobManager.runJob(job_id)
@@ -1,3 +1,1098 @@
-from django.test import TestCase
+"""
+Automated tests for core.
 
-# Create your tests here.
+Run: python manage.py test core
+(The interactive walkthroughs live in test_views_*.py.)
+"""
+import datetime
+import io
+import json
+import os
+import runpy
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from core.models import (
+    User, Role, PermissionSet, Fall, PersonenbezogeneDaten, Beratung, Gewalttat,
+    GewalttatArt, FolgenDerGewalt, Fall_FolgenDerGewalt, ReportJob, Session, StatistikErgebnis, Taeterin
+)
+from core.filters import FACETS, FallFilter, compute_facet_counts
+from core.forms import FolgenDerGewaltForm, GewalttatForm
+from core.permissions import get_role_permissions
+from core.services import BeratungManager, FallManager, StatistikEngine
+from core.services.case_search import MAX_RANKED_RESULTS, CaseSearchResult, is_alias_code, search_cases
+from core.services.pagination import KeysetPaginator, decode_cursor, encode_cursor
+from core.services.pdf_reports import render_dossier_pdf
+from core.services.query_plans import QueryPlanChecker
+from core.services import reference_data
+from core.services.reference_data import ReferenceSnapshotCache, build_gewalttat_art_hierarchy
+from core.services.report_jobs import STALE_JOB_MINUTES, ReportJobManager
+from core.services.seed_loader import BulkLoader, load_fixtures
+from core.services.synthetic_data import SyntheticDataGenerator
+from core.services.taeterinnen import TaeterinnenManager
+from core.validators import json_validators, validate_taeterinnen_details_bulk
+
+
+def create_test_user(username='user_admin'):
+    """User with an ADMIN role that may do everything."""
+    role = Role.objects.create(name='ADMIN')
+    PermissionSet.objects.create(
+        role=role,
+        can_view_cases=True,
+        can_edit_cases=True,
+        can_delete_cases=True,
+        can_hard_delete_cases=True,
+    )
+    return User.objects.create_user(username=username, password='test123', role=role)
+
+
+def create_test_fall(alias='TEST_001'):
+    fall = Fall.objects.create(zustaendige_beratungsstelle='FBS_1_LE')
+    PersonenbezogeneDaten.objects.create(
+        fall=fall,
+        alias=alias,
+        rolle_der_ratsuchenden_person='BETROFFENE',
+    )
+    return fall
+
+
+class KeysetPaginationTest(TestCase):
+    """The case list pages on (erstellungsdatum, fall_id) with opaque cursors."""
+
+    def setUp(self):
+        # several cases per day, so fall_id has to break the ties
+        for i in range(7):
+            fall = create_test_fall(f'TEST_{i:03}')
+            Fall.objects.filter(pk=fall.pk).update(erstellungsdatum=datetime.date(2024, 1, 1 + i // 3))
+        self.ordered = list(Fall.objects.order_by('-erstellungsdatum', '-fall_id').values_list('pk', flat=True))
+
+    def test_cursor_round_trip(self):
+        fall = Fall.objects.first()
+        cursor = encode_cursor(fall.erstellungsdatum, fall.fall_id)
+        self.assertEqual(decode_cursor(cursor), (fall.erstellungsdatum, fall.fall_id))
+
+    def test_pages_forward_and_back(self):
+        paginator = KeysetPaginator(Fall.objects.all(), per_page=3)
+        pages, cursor = [], None
+        while True:
+            page = paginator.get_page(after=cursor)
+            pages.append([fall.pk for fall in page.object_list])
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual([pk for rows in pages for pk in rows], self.ordered)
+        self.assertEqual([len(rows) for rows in pages], [3, 3, 1])
+        self.assertEqual(page.approximate_count, 7)
+
+        previous = paginator.get_page(before=page.previous_cursor)
+        self.assertEqual([fall.pk for fall in previous.object_list], pages[1])
+        self.assertTrue(previous.has_previous)
+        first = paginator.get_page(before=previous.previous_cursor)
+        self.assertEqual([fall.pk for fall in first.object_list], pages[0])
+        self.assertFalse(first.has_previous)
+
+    def test_tampered_cursor_shows_first_page(self):
+        paginator = KeysetPaginator(Fall.objects.all(), per_page=3)
+        valid = paginator.get_page().next_cursor
+        for tampered in (valid[:-3], valid + '!', 'bm90LWEtY3Vyc29y', '%%%'):
+            self.assertIsNone(decode_cursor(tampered))
+            page = paginator.get_page(after=tampered)
+            self.assertEqual([fall.pk for fall in page.object_list], self.ordered[:3])
+            self.assertFalse(page.has_previous)
+
+
+class CaseSearchTest(TestCase):
+    """Alias search: code prefix, substring fallback and the pg_trgm path."""
+
+    def setUp(self):
+        for alias in ('MS_001', 'MS_012', 'XMS_001', 'Anna Schmidt'):
+            create_test_fall(alias)
+
+    def aliases(self, search_query):
+        result = search_cases(Fall.objects.all(), search_query)
+        return sorted(result.queryset.values_list('personenbezogene_daten__alias', flat=True)), result.is_ranked
+
+    def test_alias_code_uses_prefix_match(self):
+        self.assertTrue(is_alias_code('MS_'))
+        self.assertTrue(is_alias_code('ms_001'))
+        self.assertFalse(is_alias_code('Schmidt'))
+        self.assertEqual(self.aliases('ms_0'), (['MS_001', 'MS_012'], False))
+        self.assertEqual(self.aliases('  MS_001 '), (['MS_001'], False))
+
+    def test_fallback_without_pg_trgm(self):
+        self.assertEqual(self.aliases('schmi'), (['Anna Schmidt'], False))
+        self.assertEqual(self.aliases('_001'), (['MS_001', 'XMS_001'], False))
+        self.assertEqual(self.aliases('   ')[0], ['Anna Schmidt', 'MS_001', 'MS_012', 'XMS_001'])
+
+    def test_postgresql_search_is_ranked_and_capped(self):
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            result = search_cases(Fall.objects.all(), 'Schmitt')
+        self.assertTrue(result.is_ranked)
+        self.assertEqual(result.queryset.query.high_mark, MAX_RANKED_RESULTS)
+        self.assertEqual(result.queryset.query.order_by, ('-rank', '-erstellungsdatum'))
+
+    def test_case_list_search(self):
+        self.client.force_login(create_test_user())
+        response = self.client.get(reverse('core:case_list'), {'search': 'MS_01'})
+        self.assertEqual(
+            [fall.personenbezogene_daten.alias for fall in response.context['page'].object_list], ['MS_012']
+        )
+
+
+class FacetCountTest(TestCase):
+    """Facet counts must match the filtered case list."""
+
+    def setUp(self):
+        stellen = ['FBS_1_LE', 'FBS_2_LKNSA', 'FBS_3_LKLE']
+        wohnorte = ['LEIPZIG_STADT', 'NORDSACHSEN', None]
+        for i in range(12):
+            fall = Fall.objects.create(
+                zustaendige_beratungsstelle=stellen[i % 3],
+                status='AKTIV' if i % 4 else 'ARCHIVIERT',
+                ist_abgeschlossen=i % 5 == 0,
+            )
+            PersonenbezogeneDaten.objects.create(
+                fall=fall, alias=f'FACET_{i:02}', rolle_der_ratsuchenden_person='BETROFFENE',
+                wohnort=wohnorte[i % 3 if i < 9 else 0],
+            )
+
+    def assertCountsMatch(self, params):
+        queryset = FallFilter(params, queryset=Fall.objects.all()).qs
+        with self.assertNumQueries(1):
+            counts = compute_facet_counts(queryset)
+        for facet_name, (lookup, _choices) in FACETS.items():
+            for value, _label, count in counts[facet_name]:
+                self.assertEqual(count, queryset.filter(**{lookup: value}).count(), (facet_name, value))
+        return counts
+
+    def test_counts_match_filtered_queryset(self):
+        counts = self.assertCountsMatch({})
+        self.assertEqual(sum(count for _v, _l, count in counts['status']), 12)
+
+        counts = self.assertCountsMatch({'status': 'AKTIV', 'wohnort': ['LEIPZIG_STADT', 'NORDSACHSEN']})
+        self.assertEqual(dict((v, c) for v, _l, c in counts['status'])['ARCHIVIERT'], 0)
+
+        self.assertCountsMatch({'zustaendige_beratungsstelle': ['FBS_2_LKNSA'], 'ist_abgeschlossen': 'false'})
+
+    def test_case_list_marks_selected_facets(self):
+        self.client.force_login(create_test_user())
+        response = self.client.get(reverse('core:case_list'), {'zustaendige_beratungsstelle': 'FBS_1_LE'})
+        options = {option['value']: option for option in response.context['facets']['zustaendige_beratungsstelle']}
+        self.assertTrue(options['FBS_1_LE']['selected'])
+        self.assertFalse(options['FBS_2_LKNSA']['selected'])
+        # counts follow the selected filters, default status is AKTIV
+        self.assertEqual(
+            options['FBS_1_LE']['count'],
+            Fall.objects.filter(status='AKTIV', zustaendige_beratungsstelle='FBS_1_LE').count(),
+        )
+        self.assertEqual(options['FBS_2_LKNSA']['count'], 0)
+
+
+class CaseDetailQueryBudgetTest(TestCase):
+    """case_detail must render a case in a constant number of queries."""
+
+    def setUp(self):
+        self.user = create_test_user()
+        self.client.force_login(self.user)
+        self.arten = [GewalttatArt.objects.create(name=f'Art {i}') for i in range(3)]
+        self.folgen = [
+            FolgenDerGewalt.objects.create(name=f'Folge {i}', kategorie='PSYCHISCH')
+            for i in range(5)
+        ]
+
+    def fill_case(self, fall, beratungen, gewalttaten):
+        start = datetime.date(2025, 1, 1)
+        Beratung.objects.bulk_create([
+            Beratung(
+                fall=fall,
+                datum=start + datetime.timedelta(days=i),
+                durchfuehrungsart='PERSOENLICH',
+                durchfuehrungsort='LEIPZIG_STADT',
+            )
+            for i in range(beratungen)
+        ])
+        for i in range(gewalttaten):
+            gewalttat = Gewalttat.objects.create(
+                fall=fall,
+                zeitraum_von=start + datetime.timedelta(days=i),
+                taeterinnen_details=[{
+                    'geschlecht': 'CIS_M',
+                    'verhaeltnis_zur_ratsuchenden_person': 'Bekannte:r',
+                }],
+            )
+            gewalttat.gewalttat_arten.set(self.arten)
+        Fall_FolgenDerGewalt.objects.bulk_create([
+            Fall_FolgenDerGewalt(fall=fall, folge=folge) for folge in self.folgen
+        ])
+
+    def count_detail_queries(self, fall):
+        url = reverse('core:case_detail', kwargs={'fall_id': fall.fall_id})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_full_case_query_count(self):
+        fall = create_test_fall()
+        self.fill_case(fall, beratungen=50, gewalttaten=20)
+
+        # session (from the cache with cached_db), user + role + permissions
+        # (cached afterwards, see core/backends.py), fall, beratungen,
+        # gewalttaten, gewalttat_arten, folgen
+        session_queries = 0 if settings.SESSION_ENGINE.endswith('cached_db') else 1
+        with self.assertNumQueries(6 + session_queries):
+            response = self.client.get(
+                reverse('core:case_detail', kwargs={'fall_id': fall.fall_id})
+            )
+        self.assertEqual(len(response.context['beratungen']), 50)
+        self.assertEqual(len(response.context['gewalttaten']), 20)
+        self.assertContains(response, 'Art 2', count=20)
+
+    def test_query_count_independent_of_case_size(self):
+        small = create_test_fall('TEST_SMALL')
+        self.fill_case(small, beratungen=1, gewalttaten=1)
+        large = create_test_fall('TEST_LARGE')
+        self.fill_case(large, beratungen=50, gewalttaten=20)
+
+        # first request fills the permission cache
+        self.count_detail_queries(small)
+        self.assertEqual(self.count_detail_queries(small), self.count_detail_queries(large))
+
+    def test_beratungen_newest_first(self):
+        fall = create_test_fall()
+        self.fill_case(fall, beratungen=5, gewalttaten=0)
+
+        response = self.client.get(reverse('core:case_detail', kwargs={'fall_id': fall.fall_id}))
+        dates = [beratung.datum for beratung in response.context['beratungen']]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+
+class BeratungAggregateTest(TestCase):
+    """Beratung.save()/delete() keep the Fall counters right without re-counting."""
+
+    def setUp(self):
+        self.fall = create_test_fall()
+
+    def add(self, datum):
+        return Beratung.objects.create(
+            fall=self.fall, datum=datum, durchfuehrungsart='VIDEO', durchfuehrungsort='LEIPZIG_STADT'
+        )
+
+    def assertAggregates(self, anzahl, letzte):
+        self.fall.refresh_from_db()
+        self.assertEqual((self.fall.beratungsanzahl, self.fall.letzte_beratung), (anzahl, letzte))
+
+    def test_save_and_delete_paths(self):
+        maerz = self.add(datetime.date(2024, 3, 1))
+        self.assertAggregates(1, datetime.date(2024, 3, 1))
+        # an older session must not move letzte_beratung backwards (Greatest)
+        januar = self.add(datetime.date(2024, 1, 1))
+        self.assertAggregates(2, datetime.date(2024, 3, 1))
+        mai = self.add(datetime.date(2024, 5, 1))
+        self.assertAggregates(3, datetime.date(2024, 5, 1))
+
+        # moving the newest session backwards recomputes the maximum
+        mai.datum = datetime.date(2024, 2, 1)
+        mai.save()
+        self.assertAggregates(3, datetime.date(2024, 3, 1))
+
+        # deleting the latest session falls back to the next one
+        maerz.delete()
+        self.assertAggregates(2, datetime.date(2024, 2, 1))
+        mai.delete()
+        januar.delete()
+        self.assertAggregates(0, None)
+
+    def test_repair_fixes_only_drifted_cases(self):
+        self.add(datetime.date(2024, 3, 1))
+        korrekt = create_test_fall('TEST_OK')
+        gestern = timezone.now() - datetime.timedelta(days=1)
+        Fall.objects.filter(pk=self.fall.pk).update(beratungsanzahl=7, letzte_beratung=None, letzte_bearbeitung=gestern)
+
+        out = io.StringIO()
+        call_command('recompute_fall_aggregates', dry_run=True, fall_ids=[str(korrekt.pk)], stdout=out)
+        self.assertIn('0 Fall/Fälle', out.getvalue())
+        self.assertEqual(len(BeratungManager.findDriftedFaelle()), 1)
+
+        self.assertEqual(BeratungManager.recalculateAggregates(), 1)
+        self.assertAggregates(1, datetime.date(2024, 3, 1))
+        # a repair is not an edit of the case
+        self.assertEqual(self.fall.letzte_bearbeitung, gestern)
+        self.assertEqual(BeratungManager.recalculateAggregates(), 0)
+
+
+class BulkBeratungTest(TestCase):
+    """bulkCreateBeratungen accepts import rows and updates the cases once."""
+
+    def setUp(self):
+        self.fall = create_test_fall()
+        self.other = create_test_fall('TEST_002')
+
+    def row(self, fall_ref, datum=datetime.date(2024, 4, 1), **extra):
+        return {
+            **fall_ref, 'datum': datum,
+            'durchfuehrungsart': 'TELEFON', 'durchfuehrungsort': 'NORDSACHSEN', **extra,
+        }
+
+    def test_fall_given_as_str_uuid_or_instance(self):
+        created = BeratungManager.bulkCreateBeratungen([
+            self.row({'fall_id': str(self.fall.pk)}, datetime.date(2024, 2, 1)),
+            self.row({'fall_id': self.fall.pk}, datetime.date(2024, 6, 1)),
+            self.row({'fall': self.other}),
+        ])
+        self.assertEqual(len(created), 3)
+
+        self.fall.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.fall.beratungsanzahl, self.fall.letzte_beratung), (2, datetime.date(2024, 6, 1)))
+        self.assertEqual((self.other.beratungsanzahl, self.other.letzte_beratung), (1, datetime.date(2024, 4, 1)))
+
+    def test_invalid_rows_insert_nothing(self):
+        unknown = '7f7d0d5e-0000-4c1d-9a51-6c2a4c7e0099'
+        with self.assertRaises(ValidationError) as raised:
+            BeratungManager.bulkCreateBeratungen([
+                self.row({'fall_id': str(self.fall.pk)}),
+                self.row({'fall_id': unknown}),
+                self.row({'fall_id': 'kein-uuid'}),
+                self.row({'fall_id': str(self.fall.pk)}, durchfuehrungsart='BRIEFTAUBE'),
+            ])
+        errors = raised.exception.message_dict
+        self.assertEqual(sorted(errors), ['row_1', 'row_2', 'row_3'])
+        self.assertEqual(errors['row_1'], [f'Fall {unknown} existiert nicht'])
+        self.assertFalse(Beratung.objects.exists())
+        self.fall.refresh_from_db()
+        self.assertEqual(self.fall.beratungsanzahl, 0)
+
+
+class StatistikEngineTest(TestCase):
+    """A case counts in a year if it was created then or had a Beratung then."""
+
+    def setUp(self):
+        self.erstellt_2023 = self.fall('TEST_A', datetime.date(2023, 11, 2), [datetime.date(2024, 2, 1)])
+        self.erstellt_2024 = self.fall('TEST_B', datetime.date(2024, 5, 1), [])
+        self.beraten_2023 = self.fall('TEST_C', datetime.date(2022, 6, 1), [datetime.date(2023, 1, 5)])
+        self.fall('TEST_D', datetime.date(2024, 7, 1), [datetime.date(2024, 7, 2)], stelle='FBS_2_LKNSA')
+
+    def fall(self, alias, erstellt, beratungen, stelle='FBS_1_LE'):
+        fall = create_test_fall(alias)
+        Fall.objects.filter(pk=fall.pk).update(erstellungsdatum=erstellt, zustaendige_beratungsstelle=stelle)
+        for datum in beratungen:
+            Beratung.objects.create(
+                fall=fall, datum=datum, durchfuehrungsart='TELEFON', durchfuehrungsort='LEIPZIG_STADT'
+            )
+        return fall
+
+    def report(self, stelle, jahr):
+        return {t['code']: dict(t['zeilen']) for t in StatistikEngine.getReport(stelle, jahr)}
+
+    def test_year_definition(self):
+        StatistikEngine.computeYear(2024)
+        StatistikEngine.computeYear(2023)
+
+        self.assertEqual(self.report('FBS_1_LE', 2024)['faelle']['Anzahl Fälle'], 2)
+        self.assertEqual(self.report('FBS_2_LKNSA', 2024)['faelle']['Anzahl Fälle'], 1)
+        self.assertEqual(self.report('FBS_1_LE', 2023)['faelle']['Anzahl Fälle'], 2)
+        # Beratung tables count the sessions held in the year, not the cases
+        self.assertEqual(self.report('FBS_1_LE', 2024)['durchfuehrungsart']['telefon'], 1)
+        self.assertEqual(self.report('FBS_1_LE', 2023)['durchfuehrungsart']['telefon'], 1)
+        self.assertEqual(self.report('FBS_3_LKLE', 2024)['faelle']['Anzahl Fälle'], 0)
+
+    def test_empty_year_is_stored_as_computed(self):
+        self.assertFalse(StatistikEngine.hasYear(2010))
+        StatistikEngine.computeYear(2010)
+        self.assertTrue(StatistikEngine.hasYear(2010))
+        self.assertEqual(self.report('FBS_1_LE', 2010)['faelle']['Anzahl Fälle'], 0)
+
+    def test_report_page_never_computes_on_get(self):
+        self.client.force_login(create_test_user())
+        url = reverse('core:statistik_report')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'jahr': 2024})
+        self.assertFalse(response.context['berechnet'])
+        self.assertFalse(StatistikErgebnis.objects.exists())
+        self.assertFalse(any(q['sql'].startswith(('INSERT', 'DELETE')) for q in queries.captured_queries))
+        self.assertRedirects(
+            self.client.get(reverse('core:statistik_export_xlsx'), {'jahr': 2024}),
+            f'{url}?jahr=2024&beratungsstelle=FBS_1_LE',
+        )
+
+        self.client.post(reverse('core:statistik_recompute'), {'jahr': 2024, 'beratungsstelle': 'FBS_1_LE'})
+        response = self.client.get(url, {'jahr': 2024})
+        self.assertTrue(response.context['berechnet'])
+        self.assertContains(response, 'Anzahl Fälle')
+
+
+class TaeterinSyncTest(TestCase):
+    """Taeterin rows mirror Gewalttat.taeterinnen_details."""
+
+    def test_rows_follow_json_and_feed_statistik(self):
+        fall = create_test_fall()
+        gewalttat = Gewalttat.objects.create(fall=fall, taeterinnen_details=[
+            {'geschlecht': 'CIS_M', 'verhaeltnis_zur_ratsuchenden_person': 'Partner:in'},
+            {'geschlecht': 'CIS_W', 'verhaeltnis_zur_ratsuchenden_person': 'Bekannte:r'},
+        ])
+        self.assertEqual(
+            list(gewalttat.taeterinnen.values_list('position', 'verhaeltnis')),
+            [(0, 'Partner:in'), (1, 'Bekannte:r')],
+        )
+
+        gewalttat.taeterinnen_details = [
+            {'geschlecht': 'CIS_M', 'verhaeltnis_zur_ratsuchenden_person': 'Partner:in ehemalig'},
+        ]
+        gewalttat.save()
+        self.assertEqual(list(gewalttat.taeterinnen.values_list('verhaeltnis', flat=True)), ['Partner:in ehemalig'])
+
+        # unrelated update_fields saves leave the rows alone
+        Taeterin.objects.all().delete()
+        gewalttat.save(update_fields=['gewalt_notizen'])
+        self.assertEqual(Taeterin.objects.count(), 0)
+        self.assertEqual(TaeterinnenManager.rebuild(), 1)
+
+        jahr = fall.erstellungsdatum.year
+        StatistikEngine.computeYear(jahr)
+        report = {t['code']: dict(t['zeilen']) for t in StatistikEngine.getReport('FBS_1_LE', jahr)}
+        self.assertEqual(report['taeter_verhaeltnis']['Partner:in ehemalig'], 1)
+        self.assertEqual(report['taeter_verhaeltnis']['Partner:in'], 0)
+
+
+class QueryPlanTest(TestCase):
+    """The key queries are answered from indexes (manage.py check_query_plans seeds 100k)."""
+
+    def test_key_queries_use_indexes(self):
+        results = QueryPlanChecker.run(rows=500, force_index=True)
+        self.assertEqual([r.name for r in results if r.seq_scan], [], [r.plan for r in results])
+        # the seed is rolled back
+        self.assertFalse(Fall.objects.exists())
+
+
+class CaseExportTest(TestCase):
+    """The CSV export is streamed and honours the case list filters."""
+
+    def setUp(self):
+        self.client.force_login(create_test_user())
+
+    def test_csv_export_streams_filtered_cases(self):
+        fall = create_test_fall('TEST_EXPORT')
+        Gewalttat.objects.create(fall=fall, taeterinnen_details=[{
+            'geschlecht': 'CIS_M',
+            'verhaeltnis_zur_ratsuchenden_person': 'Bekannte:r',
+        }])
+        archiviert = create_test_fall('TEST_ARCHIV')
+        archiviert.status = 'ARCHIVIERT'
+        archiviert.save()
+
+        response = self.client.get(reverse('core:case_export_csv'))
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('Fall-ID;Alias;'))
+        self.assertIn('TEST_EXPORT', lines[1])
+        self.assertTrue(lines[1].endswith(';1;0.0'))
+
+    def test_csv_export_escapes_formulas(self):
+        for alias in ('=HYPERLINK("https://example.org")', '+49 341', '-1+1', '@SUM(A1)'):
+            create_test_fall(alias)
+
+        response = self.client.get(reverse('core:case_export_csv'))
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        aliases = sorted(line.split(';')[1] for line in lines[1:])
+        self.assertEqual(aliases, ['"\'=HYPERLINK(""https://example.org"")"', "'+49 341", "'-1+1", "'@SUM(A1)"])
+
+    def test_export_applies_alias_search(self):
+        create_test_fall('TEST_SONNE')
+        create_test_fall('TEST_MOND')
+
+        response = self.client.get(reverse('core:case_export_csv'), {'search': 'sonne'})
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('TEST_SONNE', lines[1])
+
+        with mock.patch('core.views.export_views.search_cases') as search:
+            search.return_value = CaseSearchResult(
+                queryset=Fall.objects.filter(personenbezogene_daten__alias='TEST_MOND')[:50],
+                is_ranked=True,
+            )
+            response = self.client.get(reverse('core:case_export_xlsx'), {'search': 'mond'})
+        rows = list(load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)['Fälle'].values)
+        self.assertEqual([row[1] for row in rows[1:]], ['TEST_MOND'])
+
+    def test_xlsx_exports(self):
+        create_test_fall('TEST_EXCEL')
+
+        response = self.client.get(reverse('core:case_export_xlsx'))
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = list(workbook['Fälle'].values)
+        self.assertEqual(rows[0][:2], ('Fall-ID', 'Alias'))
+        self.assertEqual(rows[1][1], 'TEST_EXCEL')
+
+        StatistikEngine.computeYear(datetime.date.today().year)
+        response = self.client.get(reverse('core:statistik_export_xlsx'), {
+            'jahr': datetime.date.today().year,
+            'beratungsstelle': 'FBS_1_LE',
+        })
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        self.assertIn(('Anzahl Fälle', 1), list(workbook.worksheets[0].values))
+
+    def test_xlsx_export_writes_formulas_as_text(self):
+        alias = '=HYPERLINK("https://example.org","Details")'
+        create_test_fall(alias)
+
+        response = self.client.get(reverse('core:case_export_xlsx'))
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        cell = next(workbook['Fälle'].iter_rows(min_row=2))[1]
+        self.assertEqual((cell.value, cell.data_type), (alias, 's'))
+
+    def test_benchmark_export_requires_pandas(self):
+        create_test_fall('TEST_BENCH')
+        with mock.patch.dict('sys.modules', {'pandas': None}):
+            with self.assertRaises(CommandError):
+                call_command('benchmark_export', stdout=io.StringIO())
+            out = io.StringIO()
+            call_command('benchmark_export', '--ohne-pandas', stdout=out)
+        self.assertIn('openpyxl write-only', out.getvalue())
+
+
+@override_settings(REPORT_JOB_BACKEND='sync', MEDIA_ROOT=tempfile.mkdtemp())
+class ReportJobTest(TestCase):
+    """PDF reports are rendered by a job, the request only enqueues it."""
+
+    def setUp(self):
+        self.user = create_test_user()
+        self.client.force_login(self.user)
+
+    def test_dossier_pdf(self):
+        fall = create_test_fall('TEST_DOSSIER')
+        Beratung.objects.create(
+            fall=fall,
+            datum=datetime.date(2025, 3, 5),
+            durchfuehrungsart='PERSOENLICH',
+            durchfuehrungsort='LEIPZIG_STADT',
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('core:report_dossier_create', args=[fall.fall_id]))
+        job = ReportJob.objects.get()
+        self.assertRedirects(response, reverse('core:report_job_status', args=[job.job_id]))
+        self.assertEqual(job.status, 'FERTIG')
+
+        response = self.client.get(reverse('core:report_job_download', args=[job.job_id]))
+        self.assertEqual(b''.join(response.streaming_content)[:5], b'%PDF-')
+
+    def test_statistik_pdf_and_foreign_jobs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('core:statistik_pdf'), {'jahr': 2025, 'beratungsstelle': 'FBS_1_LE'})
+        job = ReportJob.objects.get()
+        self.assertEqual(job.status, 'FERTIG')
+
+        self.client.force_login(User.objects.create_user(
+            username='other', password='test123', role=self.user.role
+        ))
+        response = self.client.get(reverse('core:report_job_status', args=[job.job_id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_dossier_escapes_markup(self):
+        fall = create_test_fall('A<B & C')
+        gewalttat = Gewalttat.objects.create(fall=fall)
+        gewalttat.gewalttat_arten.add(GewalttatArt.objects.create(name='<Stalking>'))
+        self.assertEqual(render_dossier_pdf(fall.fall_id)[:5], b'%PDF-')
+
+    def test_stale_job_is_marked_failed(self):
+        job = ReportJob.objects.create(art='DOSSIER', parameter={}, erstellt_von=self.user, status='LAEUFT')
+        response = self.client.get(reverse('core:report_job_status', args=[job.job_id]))
+        self.assertEqual(response.context['job'].status, 'LAEUFT')
+
+        ReportJob.objects.filter(pk=job.pk).update(
+            erstellt_am=timezone.now() - datetime.timedelta(minutes=STALE_JOB_MINUTES + 1)
+        )
+        response = self.client.get(reverse('core:report_job_status', args=[job.job_id]))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FEHLER')
+        self.assertContains(response, 'neu gestartet')
+
+    def test_expired_jobs_are_deleted(self):
+        fall = create_test_fall('TEST_ABGELAUFEN')
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            alt, neu = (
+                ReportJobManager.runJob(ReportJob.objects.create(
+                    art='DOSSIER', parameter={'fall_id': str(fall.fall_id)}, erstellt_von=self.user
+                ).job_id)
+                for _ in range(2)
+            )
+            ReportJob.objects.filter(pk=alt.pk).update(
+                fertig_am=timezone.now() - datetime.timedelta(hours=settings.REPORT_JOB_EXPIRY_HOURS + 1)
+            )
+            response = self.client.get(reverse('core:report_job_download', args=[alt.job_id]))
+            self.assertEqual(response.status_code, 404)
+
+            out = io.StringIO()
+            call_command('cleanup_report_jobs', stdout=out)
+            self.assertIn('1 abgelaufene Reports', out.getvalue())
+            self.assertEqual(list(ReportJob.objects.values_list('pk', flat=True)), [neu.pk])
+            self.assertFalse(os.path.exists(alt.datei.path))
+            self.assertTrue(os.path.exists(neu.datei.path))
+
+
+class PermissionResolverTest(TestCase):
+    """User, role and PermissionSet are resolved once and then served from the cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_test_user()
+        self.client.force_login(self.user)
+
+    def test_permissions_cached_across_requests(self):
+        self.client.get(reverse('core:case_list'))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('core:case_list'))
+        self.assertFalse(any('permission_set' in query['sql'] for query in queries))
+
+    def test_user_served_from_cache(self):
+        self.client.get(reverse('core:case_list'))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('core:case_list'))
+        user_queries = [query['sql'] for query in queries if 'FROM "user"' in query['sql']]
+        # only the password / is_active check, role and permissions are cached
+        self.assertEqual(len(user_queries), 1)
+        self.assertNotIn('JOIN', user_queries[0])
+
+    def test_deactivated_user_logged_out_despite_cache(self):
+        self.assertEqual(self.client.get(reverse('core:case_list')).status_code, 200)
+        # no signal, like a change made through another worker
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.get(reverse('core:case_list'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_revoked_admin_rights_apply_despite_cache(self):
+        User.objects.filter(pk=self.user.pk).update(is_staff=True, is_superuser=True)
+        self.assertEqual(self.client.get('/admin/').status_code, 200)
+        User.objects.filter(pk=self.user.pk).update(is_staff=False, is_superuser=False)
+        response = self.client.get('/admin/')
+        self.assertEqual(response.status_code, 302)
+
+    def test_password_change_logs_out_despite_cache(self):
+        self.client.logout()
+        self.client.post(reverse('core:login'), {'username': 'user_admin', 'password': 'test123'})
+        self.assertEqual(self.client.get(reverse('core:case_list')).status_code, 200)
+        User.objects.filter(pk=self.user.pk).update(password=make_password('neu456'))
+        response = self.client.get(reverse('core:case_list'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_cache_invalidated_on_permission_set_save(self):
+        self.assertTrue(get_role_permissions(self.user.role_id).can_edit_cases)
+
+        permission_set = self.user.role.permissions
+        permission_set.can_edit_cases = False
+        permission_set.save()
+
+        self.assertFalse(get_role_permissions(self.user.role_id).can_edit_cases)
+        response = self.client.get(reverse('core:case_create'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_hard_delete_checks_revoked_permission(self):
+        fall = create_test_fall()
+        self.client.get(reverse('core:case_list'))
+        self.assertTrue(get_role_permissions(self.user.role_id).can_hard_delete_cases)
+
+        # revoked without signals, like another process whose cache we cannot reach
+        PermissionSet.objects.filter(role=self.user.role).update(can_hard_delete_cases=False)
+        self.assertTrue(get_role_permissions(self.user.role_id).can_hard_delete_cases)
+
+        response = self.client.post(reverse('core:case_delete', args=[fall.fall_id]), {'delete_type': 'hard'})
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(Fall.objects.filter(pk=fall.pk).exists())
+
+
+class SessionActivityTest(TestCase):
+    """Session activity is written on login and then at most once per minute."""
+
+    def setUp(self):
+        cache.clear()
+        create_test_user()
+
+    def test_activity_writes_are_throttled(self):
+        self.client.post(reverse('core:login'), {'username': 'user_admin', 'password': 'test123'})
+        session = Session.objects.get()
+        self.assertTrue(session.is_active)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('core:case_list'))
+            self.client.get(reverse('core:case_list'))
+        self.assertFalse(any('UPDATE "session"' in query['sql'] for query in queries))
+
+        # flush interval over
+        cache.clear()
+        self.client.get(reverse('core:case_list'))
+        self.assertGreater(Session.objects.get().last_activity, session.last_activity)
+
+        self.client.post(reverse('core:logout'))
+        self.assertFalse(Session.objects.get().is_active)
+
+    def test_cleanup_removes_ended_and_expired_sessions(self):
+        user = User.objects.get()
+        for session_id in ('beendet', 'abgelaufen', 'aktiv'):
+            Session.objects.create(session_id=session_id, user=user)
+        Session.objects.filter(pk='beendet').update(is_active=False)
+        Session.objects.filter(pk='abgelaufen').update(
+            last_activity=timezone.now() - datetime.timedelta(seconds=settings.SESSION_COOKIE_AGE + 1)
+        )
+
+        out = io.StringIO()
+        call_command('cleanup_sessions', stdout=out)
+        self.assertIn('2 beendete Sitzungen', out.getvalue())
+        self.assertEqual(list(Session.objects.values_list('pk', flat=True)), ['aktiv'])
+
+
+class GewalttatArtCacheTest(TestCase):
+    """The GewalttatArt hierarchy is cached until an Art is changed."""
+
+    def setUp(self):
+        cache.clear()
+        self.haupt = GewalttatArt.objects.create(name='Sexuelle Belästigung')
+        self.unter = GewalttatArt.objects.create(
+            name='am Arbeitsplatz', ist_unterkategorie=True, hauptkategorie=self.haupt
+        )
+
+    def test_form_uses_cached_hierarchy(self):
+        GewalttatForm()
+        with CaptureQueriesContext(connection) as queries:
+            form = GewalttatForm(data={
+                'gewalttat_arten': [str(self.haupt.art_id), str(self.unter.art_id)],
+                'mitbetroffene_kinder': 0,
+                'davon_direkt_betroffen': 0,
+            })
+            form.is_valid()
+        # only the version lookups, the table itself is not read again
+        self.assertTrue(all('"reference_version"' in query['sql'] for query in queries))
+        self.assertEqual(form.sexuelle_belaestigung_id, str(self.haupt.art_id))
+        self.assertNotIn('gewalttat_arten', form.errors)
+        self.assertEqual(len(form.cleaned_data['gewalttat_arten']), 2)
+
+    def test_invalidated_on_save(self):
+        GewalttatForm()
+        GewalttatArt.objects.create(name='Cybergewalt')
+        names = [art.name for art in GewalttatForm().gewalttat_hierarchy['main_categories']]
+        self.assertIn('Cybergewalt', names)
+
+    def test_change_seen_without_shared_cache(self):
+        # a second worker process: own memo and own LocMem cache, same database
+        other_worker = ReferenceSnapshotCache('gewalttat_art', build_gewalttat_art_hierarchy)
+        other_cache = LocMemCache('other-worker', {})
+        with mock.patch.object(reference_data, 'cache', other_cache):
+            self.assertEqual(len(other_worker.get().by_id), 2)
+
+        # changed in this process, the other cache is not touched
+        GewalttatArt.objects.create(name='Cybergewalt')
+
+        with mock.patch.object(reference_data, 'cache', other_cache):
+            names = {art.name for art in other_worker.get().by_id.values()}
+        self.assertIn('Cybergewalt', names)
+
+
+class ReferenceConsumerWorkerTest(TestCase):
+    """Forms see reference changes made by another worker process with its own cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.fall = create_test_fall()
+        self.folge = FolgenDerGewalt.objects.create(name='Angst', kategorie='PSYCHISCH')
+
+    def in_other_worker(self):
+        return mock.patch.object(reference_data, 'cache', LocMemCache('other-worker', {}))
+
+    def test_gewalttat_form_accepts_art_added_elsewhere(self):
+        GewalttatForm()
+        with self.in_other_worker():
+            art = GewalttatArt.objects.create(name='Cybergewalt')
+
+        form = GewalttatForm(data={
+            'gewalttat_arten': [str(art.art_id)],
+            'mitbetroffene_kinder': 0,
+            'davon_direkt_betroffen': 0,
+        })
+        form.is_valid()
+        self.assertNotIn('gewalttat_arten', form.errors)
+        self.assertEqual(list(form.cleaned_data['gewalttat_arten']), [art])
+
+    def test_folgen_form_rejects_folge_deleted_elsewhere(self):
+        self.assertIn(self.folge, FolgenDerGewaltForm(fall=self.fall).available_folgen)
+        with self.in_other_worker():
+            folge_id = self.folge.folge_id
+            self.folge.delete()
+
+        form = FolgenDerGewaltForm(data={'folge': str(folge_id)}, fall=self.fall)
+        self.assertFalse(form.is_valid())
+        self.assertIn('folge', form.errors)
+
+
+class TaeterinnenValidatorTest(TestCase):
+    """taeterinnen_details is checked once per form save; imports validate in bulk."""
+
+    def test_form_checks_payload_once(self):
+        details = '[{"geschlecht": "CIS_M", "verhaeltnis_zur_ratsuchenden_person": "Partner:in"}]'
+        form = GewalttatForm(data={
+            'taeterinnen_details': details,
+            'tatort': 'LEIPZIG',
+            'mitbetroffene_kinder': 0,
+            'davon_direkt_betroffen': 0,
+        }, instance=Gewalttat(fall=create_test_fall()))
+        with mock.patch.object(
+            json_validators, '_check_taeterinnen_details',
+            wraps=json_validators._check_taeterinnen_details,
+        ) as check:
+            self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(check.call_count, 1)
+
+    def test_bulk_validation(self):
+        errors = validate_taeterinnen_details_bulk([
+            [{'geschlecht': 'CIS_W', 'verhaeltnis_zur_ratsuchenden_person': 'Bekannte:r'}],
+            [{'geschlecht': 'CIS_W', 'verhaeltnis_zur_ratsuchenden_person': 'Nachbar:in'}],
+            {'geschlecht': 'CIS_W'},
+            [{'geschlecht': 'CIS_W', 'verhaeltnis_zur_ratsuchenden_person': 'Bekannte:r', 'alter': 40}],
+        ])
+        self.assertEqual(
+            {idx: error.code for idx, error in errors.items()},
+            {1: 'invalid_enum_value', 2: 'invalid_type', 3: 'extra_fields'},
+        )
+
+
+class FolgenSnapshotTest(TestCase):
+    """folgen_add computes the selectable Folgen from the cached snapshot."""
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(create_test_user())
+        self.fall = create_test_fall()
+        self.folgen = [
+            FolgenDerGewalt.objects.create(name=f'Folge {i}', kategorie='PSYCHISCH')
+            for i in range(3)
+        ]
+        Fall_FolgenDerGewalt.objects.create(fall=self.fall, folge=self.folgen[0])
+
+    def test_available_choices_exclude_linked(self):
+        url = reverse('core:folgen_add', args=[self.fall.fall_id])
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertFalse(any('FROM "folgen_der_gewalt"' in query['sql'] for query in queries))
+
+        choices = [label for _value, label in response.context['form'].fields['folge'].choices]
+        self.assertEqual(choices[1:], ['Folge 1', 'Folge 2'])
+
+    def test_linked_folge_rejected(self):
+        response = self.client.post(reverse('core:folgen_add', args=[self.fall.fall_id]), {
+            'folge': str(self.folgen[0].folge_id),
+        })
+        self.assertIn('folge', response.context['form'].errors)
+
+        response = self.client.post(reverse('core:folgen_add', args=[self.fall.fall_id]), {
+            'folge': str(self.folgen[1].folge_id),
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.fall.folgen_relations.count(), 2)
+
+    def test_bulk_add_links_many_folgen_in_one_post(self):
+        url = reverse('core:folgen_bulk_add', args=[self.fall.fall_id])
+        response = self.client.get(url)
+        self.assertEqual(len(response.context['form'].available_folgen), 2)
+
+        response = self.client.post(url, {
+            'folgen': [str(folge.folge_id) for folge in self.folgen[1:]],
+            'weitere_informationen': 'seit 2024',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.fall.folgen_relations.count(), 3)
+        self.assertEqual(self.fall.folgen_relations.filter(weitere_informationen='seit 2024').count(), 2)
+
+    def test_link_folgen_counts_inserted_rows_only(self):
+        # folgen[0] is linked already
+        self.assertEqual(FallManager.linkFolgen(self.fall, self.folgen, 'neu'), 2)
+        self.assertEqual(FallManager.linkFolgen(self.fall, self.folgen), 0)
+        self.assertEqual(self.fall.folgen_relations.filter(weitere_informationen='neu').count(), 2)
+
+
+class DatabaseConnectionSettingsTest(TestCase):
+    """Connection reuse and worker defaults per server mode, and the latency benchmark."""
+
+    def load_settings(self, **env):
+        environ = {key: value for key, value in os.environ.items() if not key.startswith(('DB_', 'SERVER_MODE'))}
+        environ.update(env)
+        with mock.patch.dict(os.environ, environ, clear=True), mock.patch('dotenv.load_dotenv'):
+            return runpy.run_path(os.path.join(settings.BASE_DIR, 'B_EV', 'settings.py'))
+
+    def test_conn_max_age_defaults(self):
+        self.assertEqual(self.load_settings(SERVER_MODE='gunicorn')['DATABASES']['default']['CONN_MAX_AGE'], 60)
+        self.assertEqual(self.load_settings(SERVER_MODE='uvicorn')['DATABASES']['default']['CONN_MAX_AGE'], 0)
+        loaded = self.load_settings(SERVER_MODE='uvicorn', DB_CONN_MAX_AGE='30')
+        self.assertEqual(loaded['DATABASES']['default']['CONN_MAX_AGE'], 30)
+
+    def test_gunicorn_workers_follow_usable_cores(self):
+        path = os.path.join(settings.BASE_DIR, 'gunicorn.conf.py')
+        environ = {key: value for key, value in os.environ.items() if key != 'WEB_CONCURRENCY'}
+        with mock.patch.dict(os.environ, environ, clear=True):
+            with mock.patch('os.sched_getaffinity', return_value={0, 1}, create=True):
+                self.assertEqual(runpy.run_path(path)['workers'], 5)
+            # a large host is capped
+            with mock.patch('os.sched_getaffinity', return_value=set(range(64)), create=True):
+                self.assertEqual(runpy.run_path(path)['workers'], 8)
+            with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '12'}):
+                self.assertEqual(runpy.run_path(path)['workers'], 12)
+
+    def test_benchmark_runs(self):
+        out = io.StringIO()
+        call_command('benchmark_db_connections', '--requests', '5', stdout=out)
+        self.assertIn('neue Verbindung je Request', out.getvalue())
+
+
+class BootstrapCommandTest(TestCase):
+    """manage.py bootstrap seeds an empty, migrated database exactly once."""
+
+    def test_seeds_only_empty_database(self):
+        out = io.StringIO()
+        call_command('bootstrap', stdout=out, verbosity=0)
+        self.assertIn('aktuellen Migrationsstand', out.getvalue())
+        self.assertEqual(User.objects.count(), 3)
+
+        out = io.StringIO()
+        call_command('bootstrap', stdout=out, verbosity=0)
+        self.assertIn('bereits vorhanden', out.getvalue())
+        self.assertEqual(User.objects.count(), 3)
+
+
+class SeedLoaderTest(TestCase):
+    """load_seed bulk-inserts fixtures and updates the derived data once."""
+
+    def test_jsonl_load_updates_derived_data(self):
+        fall_id = '7f7d0d5e-1111-4c1d-9a51-6c2a4c7e0001'
+        rows = [
+            {'model': 'core.beratung', 'fields': {
+                'fall': fall_id, 'datum': f'2023-0{monat}-10',
+                'durchfuehrungsart': 'VIDEO', 'durchfuehrungsort': 'LEIPZIG_STADT',
+            }}
+            for monat in (3, 5)
+        ] + [
+            {'model': 'core.fall', 'pk': fall_id, 'fields': {
+                'zustaendige_beratungsstelle': 'FBS_1_LE', 'erstellungsdatum': '2023-02-01',
+            }},
+            {'model': 'core.gewalttat', 'fields': {'fall': fall_id, 'taeterinnen_details': [
+                {'geschlecht': 'CIS_M', 'verhaeltnis_zur_ratsuchenden_person': 'Partner:in'},
+            ]}},
+        ]
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as stream:
+            stream.write('\n'.join(json.dumps(row) for row in rows))
+        self.addCleanup(os.unlink, stream.name)
+
+        counts = load_fixtures([stream.name])
+        self.assertEqual(counts['core.Beratung'], 2)
+
+        fall = Fall.objects.get(pk=fall_id)
+        self.assertEqual(fall.erstellungsdatum, datetime.date(2023, 2, 1))
+        self.assertEqual(fall.beratungsanzahl, 2)
+        self.assertEqual(fall.letzte_beratung, datetime.date(2023, 5, 10))
+        self.assertEqual(list(Taeterin.objects.values_list('verhaeltnis', flat=True)), ['Partner:in'])
+
+    def test_explicit_timestamps_only_affect_loaded_rows(self):
+        gestern = timezone.now() - datetime.timedelta(days=1)
+        loader = BulkLoader()
+        loader.add(Fall(zustaendige_beratungsstelle='FBS_1_LE',
+                        erstellungsdatum=datetime.date(2020, 1, 1), letzte_bearbeitung=gestern))
+        bulk_create = Fall.objects.bulk_create
+        parallel = []
+
+        def with_parallel_save(objs, **kwargs):
+            # a request thread saving a case while the load runs
+            parallel.append(Fall.objects.create(zustaendige_beratungsstelle='FBS_1_LE',
+                                                erstellungsdatum=datetime.date(2020, 1, 1)))
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(Fall.objects, 'bulk_create', side_effect=with_parallel_save):
+            loader.flush()
+
+        loaded = Fall.objects.exclude(pk=parallel[0].pk).get()
+        self.assertEqual((loaded.erstellungsdatum, loaded.letzte_bearbeitung), (datetime.date(2020, 1, 1), gestern))
+        parallel[0].refresh_from_db()
+        self.assertEqual(parallel[0].erstellungsdatum, datetime.date.today())
+
+    def test_sequences_reset_after_explicit_ids(self):
+        fall = Fall.objects.create(zustaendige_beratungsstelle='FBS_1_LE')
+        folgen = [FolgenDerGewalt.objects.create(name=f'Folge {i}', kategorie='PSYCHISCH') for i in range(2)]
+        loader = BulkLoader()
+        loader.add(Fall_FolgenDerGewalt(pk=50, fall=fall, folge=folgen[0]))
+
+        reset_sql = connection.ops.sequence_reset_sql
+        with mock.patch.object(connection.ops, 'sequence_reset_sql', wraps=reset_sql) as reset:
+            loader.finish()
+        self.assertIn(Fall_FolgenDerGewalt, reset.call_args.args[1])
+
+        neu = Fall_FolgenDerGewalt.objects.create(fall=fall, folge=folgen[1])
+        self.assertGreater(neu.pk, 50)
+
+    def test_seed_fixture(self):
+        counts = load_fixtures(['core/fixtures/seed_data.json'])
+        self.assertEqual(counts['core.User'], 3)
+        self.assertTrue(User.objects.get(username='user_admin').check_password('test123'))
+
+
+class SyntheticDataTest(TestCase):
+    """generate_synthetic_data produces reproducible, consistent cases."""
+
+    def setUp(self):
+        for i in range(3):
+            GewalttatArt.objects.create(name=f'Art {i}')
+            FolgenDerGewalt.objects.create(name=f'Folge {i}', kategorie='PSYCHISCH')
+
+    def test_seed_is_reproducible(self):
+        bis = datetime.date(2025, 6, 30)
+        runs = []
+        for heute in (datetime.date(2026, 1, 1), datetime.date(2026, 3, 1)):
+            loader = mock.Mock()
+            with mock.patch('core.services.synthetic_data.timezone.localdate', return_value=heute):
+                SyntheticDataGenerator(seed=7, bis=bis).generate(20, loader)
+            runs.append([
+                (type(call.args[0]), call.args[0].pk, getattr(call.args[0], 'erstellungsdatum', None))
+                for call in loader.add.call_args_list
+            ])
+        self.assertEqual(runs[0], runs[1])
+        self.assertTrue(all(erstellt is None or erstellt <= bis for _model, _pk, erstellt in runs[0]))
+
+        with self.assertRaises(ValueError):
+            SyntheticDataGenerator(distributions={'Fall.status': {'null': 1}})
+        with self.assertRaises(ValueError):
+            SyntheticDataGenerator(distributions={'Fall.farbe': {'ROT': 1}})
+
+    def test_command_keeps_derived_data_consistent(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as stream:
+            json.dump({'Fall.status': {'ARCHIVIERT': 1}, 'anzahl.gewalttaten': {'2': 1}}, stream)
+        self.addCleanup(os.unlink, stream.name)
+
+        echter_fall = create_test_fall('TEST_ECHT')
+        Fall.objects.filter(pk=echter_fall.pk).update(letzte_bearbeitung=timezone.now() - datetime.timedelta(days=3))
+        echter_fall.refresh_from_db()
+
+        call_command('generate_synthetic_data', 30, seed=3, distributions=stream.name, stdout=io.StringIO())
+        self.assertEqual(Fall.objects.get(pk=echter_fall.pk).letzte_bearbeitung, echter_fall.letzte_bearbeitung)
+        Fall.objects.filter(pk=echter_fall.pk).delete()
+
+        self.assertEqual(Fall.objects.count(), 30)
+        self.assertEqual(PersonenbezogeneDaten.objects.count(), 30)
+        self.assertFalse(Fall.objects.exclude(status='ARCHIVIERT').exists())
+        self.assertEqual(Gewalttat.objects.count(), 60)
+        for fall in Fall.objects.all():
+            self.assertEqual(fall.beratungsanzahl, fall.beratungen.count())
+        self.assertEqual(
+            Taeterin.objects.count(),
+            sum(len(details) for details in Gewalttat.objects.values_list('taeterinnen_details', flat=True)),
+        )
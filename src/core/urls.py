@@ -7,7 +7,7 @@ Uses Django's built-in auth views for login/logout.
 
 from django.urls import path
 from django.contrib.auth import views as auth_views
-from core.views import fall_views, beratung_views, gewalttat_views, folgen_views
+from core.views import fall_views, beratung_views, gewalttat_views, folgen_views, statistik_views, export_views, report_views
 
 app_name = 'core'
 
@@ -45,6 +45,22 @@ urlpatterns = [
     
     # ===== FOLGEN DER GEWALT (CONSEQUENCES) =====
     path('cases/<uuid:fall_id>/folgen/add/', folgen_views.folgen_add, name='folgen_add'),
+    path('cases/<uuid:fall_id>/folgen/add-multiple/', folgen_views.folgen_bulk_add, name='folgen_bulk_add'),
     path('folgen/<int:folgen_id>/edit/', folgen_views.folgen_edit, name='folgen_edit'),
     path('folgen/<int:folgen_id>/delete/', folgen_views.folgen_delete, name='folgen_delete'),
+    
+    # ===== STATISTIK (ANNUAL REPORT) =====
+    path('statistik/', statistik_views.statistik_report, name='statistik_report'),
+    path('statistik/neu-berechnen/', statistik_views.statistik_recompute, name='statistik_recompute'),
+    path('statistik/export.xlsx', statistik_views.statistik_export_xlsx, name='statistik_export_xlsx'),
+    path('statistik/pdf/', statistik_views.statistik_pdf, name='statistik_pdf'),
+    
+    # ===== EXPORT =====
+    path('export/faelle.csv', export_views.case_export_csv, name='case_export_csv'),
+    path('export/faelle.xlsx', export_views.case_export_xlsx, name='case_export_xlsx'),
+    
+    # ===== PDF REPORTS (BACKGROUND JOBS) =====
+    path('cases/<uuid:fall_id>/dossier/', report_views.report_dossier_create, name='report_dossier_create'),
+    path('reports/<uuid:job_id>/', report_views.report_job_status, name='report_job_status'),
+    path('reports/<uuid:job_id>/download/', report_views.report_job_download, name='report_job_download'),
 ]
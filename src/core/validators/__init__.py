@@ -1,4 +1,12 @@
 """Custom field validators for SE_B-EV_2025."""
-from .json_validators import validate_taeterinnen_details
+from .json_validators import (
+    validate_taeterinnen_details,
+    validate_taeterinnen_details_bulk,
+    taeterinnen_validation_scope,
+)
 
-__all__ = ['validate_taeterinnen_details']
+__all__ = [
+    'validate_taeterinnen_details',
+    'validate_taeterinnen_details_bulk',
+    'taeterinnen_validation_scope',
+]
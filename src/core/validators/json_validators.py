@@ -1,15 +1,103 @@
 """
 Custom validators for JSONField structures.
 Enforces schema for Gewalttat.taeterinnen_details.
+
+The schema is compiled once at import (frozenset lookups, prebuilt messages)
+and checked in a single pass over the entries. One Gewalttat save runs the
+validator up to three times on the same list (form clean, field validator,
+Gewalttat.clean()); inside taeterinnen_validation_scope() the result is
+memoized per payload object so only the first call does the work.
 """
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterable, Optional
+
 from django.core.exceptions import ValidationError
-from typing import Any, List, Dict
+
+
+# Allowed values of verhaeltnis_zur_ratsuchenden_person
+# (also the choices of the normalized Taeterin table)
+TAETERIN_VERHAELTNISSE = (
+    "Unbekannte:r",
+    "Bekannte:r",
+    "Partner:in",
+    "Partner:in ehemalig",
+    "Ehepartner:in oder eingetragene:r Lebenspartner:in",
+    "andere Familienangehörige",
+    "sonstige Personen",
+    "keine Angabe",
+)
+
+# Compiled schema
+GESCHLECHT_KEY = 'geschlecht'
+VERHAELTNIS_KEY = 'verhaeltnis_zur_ratsuchenden_person'
+ALLOWED_KEYS = frozenset({GESCHLECHT_KEY, VERHAELTNIS_KEY})
+ALLOWED_VERHAELTNIS = frozenset(TAETERIN_VERHAELTNISSE)
+VERHAELTNIS_CHOICES_TEXT = str(list(TAETERIN_VERHAELTNISSE))
+
+# (message, code) of the first problem found, None if valid
+SchemaError = Optional[tuple[str, str]]
+
+# id(payload) -> (payload, SchemaError) while a validation scope is active
+_memo: ContextVar[Optional[dict]] = ContextVar('taeterinnen_validation_memo', default=None)
+
+
+def _check_taeterinnen_details(value: Any) -> SchemaError:
+    """Single pass over the entries, returns the first schema error."""
+    if not isinstance(value, list):
+        return "taeterinnen_details must be an array/list", 'invalid_type'
+
+    for idx, entry in enumerate(value):
+        if not isinstance(entry, dict):
+            return f"Entry {idx} in taeterinnen_details must be an object", 'invalid_entry_type'
+
+        if GESCHLECHT_KEY not in entry:
+            return f"Entry {idx} missing required field '{GESCHLECHT_KEY}'", 'missing_field'
+        if VERHAELTNIS_KEY not in entry:
+            return f"Entry {idx} missing required field '{VERHAELTNIS_KEY}'", 'missing_field'
+
+        geschlecht = entry[GESCHLECHT_KEY]
+        verhaeltnis = entry[VERHAELTNIS_KEY]
+
+        if not isinstance(geschlecht, str):
+            return f"Entry {idx} '{GESCHLECHT_KEY}' must be a string", 'invalid_field_type'
+
+        if not isinstance(verhaeltnis, str) or verhaeltnis not in ALLOWED_VERHAELTNIS:
+            return (
+                f"Entry {idx} '{VERHAELTNIS_KEY}' must be one of {VERHAELTNIS_CHOICES_TEXT}",
+                'invalid_enum_value',
+            )
+
+        # No extra keys allowed (strict schema); both required keys are present here
+        if len(entry) != 2:
+            extra_keys = set(entry.keys()) - ALLOWED_KEYS
+            return f"Entry {idx} contains unexpected fields: {extra_keys}", 'extra_fields'
+
+    return None
+
+
+@contextmanager
+def taeterinnen_validation_scope():
+    """
+    Memoize validate_taeterinnen_details() per payload object until the block ends.
+
+    Meant to wrap one form/model clean, during which the payload is not mutated.
+    Nested scopes share the outer memo.
+    """
+    if _memo.get() is not None:
+        yield
+        return
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
 
 
 def validate_taeterinnen_details(value: Any) -> None:
     """
     Validate structure of Gewalttat.taeterinnen_details JSONField.
-    
+
     Expected structure:
     [
         {
@@ -18,72 +106,44 @@ def validate_taeterinnen_details(value: Any) -> None:
         },
         ...
     ]
-    
+
     Args:
         value: JSON data to validate
-        
+
     Raises:
         ValidationError: If structure is invalid
     """
-    # Must be a list
-    if not isinstance(value, list):
-        raise ValidationError(
-            "taeterinnen_details must be an array/list",
-            code='invalid_type'
-        )
-    
-    # Validate each perpetrator entry
-    allowed_verhaeltnis = [
-        "Unbekannte:r",
-        "Bekannte:r",
-        "Partner:in",
-        "Partner:in ehemalig",
-        "Ehepartner:in oder eingetragene:r Lebenspartner:in",
-        "andere Familienangehörige",
-        "sonstige Personen",
-        "keine Angabe"
-    ]
-    
-    for idx, entry in enumerate(value):
-        # Must be a dict/object
-        if not isinstance(entry, dict):
-            raise ValidationError(
-                f"Entry {idx} in taeterinnen_details must be an object",
-                code='invalid_entry_type'
-            )
-        
-        # Check required keys
-        if 'geschlecht' not in entry:
-            raise ValidationError(
-                f"Entry {idx} missing required field 'geschlecht'",
-                code='missing_field'
-            )
-        
-        if 'verhaeltnis_zur_ratsuchenden_person' not in entry:
-            raise ValidationError(
-                f"Entry {idx} missing required field 'verhaeltnis_zur_ratsuchenden_person'",
-                code='missing_field'
-            )
-        
-        # Validate geschlecht is string
-        if not isinstance(entry['geschlecht'], str):
-            raise ValidationError(
-                f"Entry {idx} 'geschlecht' must be a string",
-                code='invalid_field_type'
-            )
-        
-        # Validate verhaeltnis is in allowed list
-        verhaeltnis = entry['verhaeltnis_zur_ratsuchenden_person']
-        if verhaeltnis not in allowed_verhaeltnis:
-            raise ValidationError(
-                f"Entry {idx} 'verhaeltnis_zur_ratsuchenden_person' must be one of {allowed_verhaeltnis}",
-                code='invalid_enum_value'
-            )
-        
-        # No extra keys allowed (strict schema)
-        extra_keys = set(entry.keys()) - {'geschlecht', 'verhaeltnis_zur_ratsuchenden_person'}
-        if extra_keys:
-            raise ValidationError(
-                f"Entry {idx} contains unexpected fields: {extra_keys}",
-                code='extra_fields'
-            )
+    memo = _memo.get()
+    if memo is None:
+        error = _check_taeterinnen_details(value)
+    else:
+        cached = memo.get(id(value))
+        if cached is not None and cached[0] is value:
+            error = cached[1]
+        else:
+            error = _check_taeterinnen_details(value)
+            # keep a reference so the id cannot be reused inside the scope
+            memo[id(value)] = (value, error)
+
+    if error is not None:
+        message, code = error
+        raise ValidationError(message, code=code)
+
+
+def validate_taeterinnen_details_bulk(values: Iterable[Any]) -> dict[int, ValidationError]:
+    """
+    Validate many taeterinnen_details payloads (imports) without raising.
+
+    Args:
+        values: payloads in import order
+
+    Returns:
+        dict: position of each invalid payload -> its ValidationError
+    """
+    errors = {}
+    for idx, value in enumerate(values):
+        error = _check_taeterinnen_details(value)
+        if error is not None:
+            message, code = error
+            errors[idx] = ValidationError(message, code=code)
+    return errors
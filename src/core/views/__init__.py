@@ -8,11 +8,17 @@ from . import fall_views
 from . import beratung_views
 from . import gewalttat_views
 from . import folgen_views
+from . import statistik_views
+from . import export_views
+from . import report_views
 
 __all__ = [
     'fall_views',
     'beratung_views',
     'gewalttat_views',
     'folgen_views',
+    'statistik_views',
+    'export_views',
+    'report_views',
 ]
 
@@ -0,0 +1,67 @@
+"""
+Views for data exports.
+
+Exports are streamed straight from a database iterator (CSV) or built in
+openpyxl write-only mode (XLSX), so memory use of the worker does not grow
+with the number of cases.
+"""
+
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from core.models import Fall
+from core.filters import FallFilter
+from core.services.case_search import search_cases
+from core.services.case_export import case_export_queryset, iter_case_rows, iter_csv
+from core.services.xlsx_export import XLSX_CONTENT_TYPE, build_case_workbook
+from core.decorators import permission_required_custom
+
+
+def _filtered_cases(request):
+    """
+    Cases matching the case list filters and alias search in request.GET
+    (active cases by default), i.e. the cases the list view shows.
+    """
+    filter_data = request.GET.copy()
+    filter_data.setdefault('status', 'AKTIV')
+    cases = FallFilter(filter_data, queryset=Fall.objects.all()).qs
+    search_result = search_cases(cases, request.GET.get('search', ''))
+    if search_result.is_ranked:
+        # ranked results are sliced, the export orders by date itself
+        ranked_ids = list(search_result.queryset.values_list('pk', flat=True))
+        return Fall.objects.filter(pk__in=ranked_ids)
+    return search_result.queryset
+
+
+@login_required
+@permission_required_custom('can_view_cases')
+def case_export_csv(request):
+    """
+    Export the (filtered) case list as CSV.
+    
+    Permission: Users with can_view_cases permission
+    Accepts the same filter parameters as the case list.
+    """
+    rows = iter_case_rows(case_export_queryset(_filtered_cases(request)))
+    response = StreamingHttpResponse(iter_csv(rows), content_type='text/csv; charset=utf-8')
+    filename = f"faelle_{timezone.now():%Y-%m-%d}.csv"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@login_required
+@permission_required_custom('can_view_cases')
+def case_export_xlsx(request):
+    """
+    Export the (filtered) case list as Excel file.
+    
+    Permission: Users with can_view_cases permission
+    Accepts the same filter parameters as the case list.
+    """
+    return FileResponse(
+        build_case_workbook(_filtered_cases(request)),
+        as_attachment=True,
+        filename=f"faelle_{timezone.now():%Y-%m-%d}.xlsx",
+        content_type=XLSX_CONTENT_TYPE,
+    )
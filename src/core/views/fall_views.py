@@ -8,39 +8,88 @@ Uses FallManager for atomic operations, direct ORM for simple queries.
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.db.models import Q
 
 from core.models import Fall, PersonenbezogeneDaten
 from core.forms import FallCreateForm
+from core.filters import FallFilter, build_facet_options, compute_facet_counts
 from core.services.fall_manager import FallManager
+from core.services.pagination import (
+    KeysetPaginator, KeysetPage, build_count_cache_key, COUNT_CACHE_SECONDS
+)
+from core.services.case_search import search_cases
+from core.services.case_loader import case_detail_queryset
 from core.decorators import permission_required_custom
+from core.permissions import get_request_permissions
 
 
 @login_required
 def case_list(request):
     """
-    Display list of all active cases.
+    Display paginated, filterable list of cases (active cases by default).
     
     Permission: All authenticated users (BASIS, ERWEITERT, ADMIN)
+    Uses keyset pagination (?after= / ?before= cursors) so page load time
+    stays the same regardless of how many cases exist.
+    Fuzzy alias searches are ranked by relevance and shown on a single page.
+    Facet filters and their counts come from core.filters.
     """
-    # Query all active cases, ordered by creation date (newest first)
-    cases = Fall.objects.filter(
-        status='AKTIV'
-    ).select_related(
-        'personenbezogene_daten'
-    ).order_by('-erstellungsdatum')
-    
-    # Optional: Search by alias
-    search_query = request.GET.get('search', '')
-    if search_query:
-        cases = cases.filter(
-            personenbezogene_daten__alias__icontains=search_query
+    # Default to active cases like before, "Alle" sends an empty status
+    filter_data = request.GET.copy()
+    filter_data.setdefault('status', 'AKTIV')
+    
+    fall_filter = FallFilter(
+        filter_data,
+        queryset=Fall.objects.select_related('personenbezogene_daten'),
+    )
+    cases = fall_filter.qs
+    
+    # Optional: Search by alias (prefix / trigram / icontains, see case_search)
+    search_query = request.GET.get('search', '').strip()
+    search_result = search_cases(cases, search_query)
+    
+    # Query string without cursors, reused by the paging links
+    filter_params = filter_data.copy()
+    for cursor_param in ('after', 'before'):
+        filter_params.pop(cursor_param, None)
+    filter_querystring = filter_params.urlencode()
+    count_cache_key = build_count_cache_key('case_list_count', filter_querystring)
+    
+    if search_result.is_ranked:
+        ranked_cases = list(search_result.queryset)
+        page = KeysetPage(
+            object_list=ranked_cases,
+            next_cursor=None,
+            previous_cursor=None,
+            approximate_count=len(ranked_cases),
+        )
+    else:
+        paginator = KeysetPaginator(
+            search_result.queryset,
+            count_cache_key=count_cache_key,
+        )
+        page = paginator.get_page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
         )
     
+    # Facet counts reflect the selected filters (not the alias search),
+    # cached like the total count since they are only a guide
+    facet_counts = cache.get_or_set(
+        build_count_cache_key('case_list_facets', filter_querystring),
+        lambda: compute_facet_counts(cases),
+        COUNT_CACHE_SECONDS,
+    )
+    
     context = {
-        'cases': cases,
+        'cases': page.object_list,
+        'page': page,
         'search_query': search_query,
+        'filter': fall_filter,
+        'facets': build_facet_options(facet_counts, filter_data),
+        'filter_querystring': filter_querystring,
     }
     return render(request, 'core/case_list.html', context)
 
@@ -96,24 +145,15 @@ def case_detail(request, fall_id):
     
     Permission: All authenticated users (view access)
     """
-    fall = get_object_or_404(
-        Fall.objects.select_related(
-            'personenbezogene_daten',
-            'bearbeitet_von'
-        ).prefetch_related(
-            'beratungen',
-            'gewalttaten__gewalttat_arten',
-            'folgen_relations__folge'
-        ),
-        fall_id=fall_id
-    )
+    # Prefetches are ordered inside the loader, constant number of queries
+    fall = get_object_or_404(case_detail_queryset(), fall_id=fall_id)
     
     context = {
         'fall': fall,
         'personenbezogene_daten': fall.personenbezogene_daten, # type: ignore
-        'beratungen': fall.beratungen.all().order_by('-datum'), # type: ignore
-        'gewalttaten': fall.gewalttaten.all(), # type: ignore
-        'folgen_relations': fall.folgen_relations.all().select_related('folge').order_by('folge__kategorie', 'folge__name'), # type: ignore
+        'beratungen': fall.beratungen_sorted, # type: ignore
+        'gewalttaten': fall.gewalttaten_sorted, # type: ignore
+        'folgen_relations': fall.folgen_sorted, # type: ignore
     }
     return render(request, 'core/case_detail.html', context)
 
@@ -189,15 +229,16 @@ def case_delete(request, fall_id):
     """
     fall = get_object_or_404(Fall, fall_id=fall_id)
     
-    # Check permissions via custom PermissionSet
+    # Check permissions via custom PermissionSet (resolved once per request)
     user = request.user
+    permissions = get_request_permissions(request)
     
     # Ensure user has role and permissions
-    if not user.role or not user.role.permissions:
+    if not permissions.is_configured:
         raise PermissionDenied("Benutzer hat keine Berechtigungen konfiguriert.")
     
-    can_soft_delete = user.role.permissions.can_delete_cases
-    can_hard_delete = user.role.permissions.can_hard_delete_cases
+    can_soft_delete = permissions.can_delete_cases
+    can_hard_delete = permissions.can_hard_delete_cases
     
     if not (can_soft_delete or can_hard_delete):
         raise PermissionDenied("Keine Berechtigung zum Löschen von Fällen.")
@@ -10,8 +10,9 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 
 from core.models import Fall, Fall_FolgenDerGewalt
-from core.forms import FolgenDerGewaltForm
+from core.forms import FolgenDerGewaltForm, FolgenBulkAddForm
 from core.decorators import permission_required_custom
+from core.services import FallManager
 
 
 @login_required
@@ -47,18 +48,52 @@ def folgen_add(request, fall_id):
     else:
         form = FolgenDerGewaltForm(fall=fall)
     
-    # Check if there are any available consequences to add
-    available_count = form.fields['folge'].queryset.count()  # type: ignore[union-attr]
-    
     context = {
         'form': form,
         'fall': fall,
         'action': 'Hinzufügen',
-        'no_available_folgen': available_count == 0,
+        # computed by the form from the cached reference snapshot
+        'no_available_folgen': not form.available_folgen,
     }
     return render(request, 'core/folgen_form.html', context)
 
 
+@login_required
+@permission_required_custom('can_edit_cases')
+def folgen_bulk_add(request, fall_id):
+    """
+    Link several consequences to a case at once.
+    
+    Permission: Users with can_edit_cases permission
+    All selected Folgen are inserted with one bulk INSERT (see FallManager.linkFolgen).
+    """
+    fall = get_object_or_404(Fall, fall_id=fall_id)
+    
+    if request.method == 'POST':
+        form = FolgenBulkAddForm(request.POST, fall=fall)
+        
+        if form.is_valid():
+            anzahl = FallManager.linkFolgen(
+                fall,
+                form.cleaned_data['folgen'],
+                form.cleaned_data['weitere_informationen'],
+            )
+            
+            messages.success(request, f'{anzahl} Folge(n) für Fall "{fall}" hinzugefügt.')
+            return redirect('core:case_detail', fall_id=fall.fall_id)
+        else:
+            messages.error(request, 'Bitte korrigieren Sie die Fehler im Formular.')
+    else:
+        form = FolgenBulkAddForm(fall=fall)
+    
+    context = {
+        'form': form,
+        'fall': fall,
+        'no_available_folgen': not form.available_folgen,
+    }
+    return render(request, 'core/folgen_bulk_form.html', context)
+
+
 @login_required
 @permission_required_custom('can_edit_cases')
 def folgen_edit(request, folgen_id):
@@ -0,0 +1,68 @@
+"""
+Views for background PDF reports.
+
+Creating a report only enqueues a ReportJob and redirects to its status
+page, which reloads itself until the PDF is ready for download.
+"""
+
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404
+from django.views.decorators.http import require_POST
+
+from core.models import Fall, ReportJob
+from core.services.report_jobs import ReportJobManager
+from core.decorators import permission_required_custom
+
+
+@login_required
+@permission_required_custom('can_view_cases')
+@require_POST
+def report_dossier_create(request, fall_id):
+    """
+    Start rendering the dossier PDF of a case.
+    
+    Permission: Users with can_view_cases permission
+    """
+    fall = get_object_or_404(Fall, fall_id=fall_id)
+    job = ReportJobManager.submitJob('DOSSIER', {'fall_id': str(fall.fall_id)}, request.user)
+    return redirect('core:report_job_status', job_id=job.job_id)
+
+
+def _get_own_job(request, job_id):
+    # Reports contain case data: only the requesting user gets to see them
+    return get_object_or_404(ReportJob, job_id=job_id, erstellt_von=request.user)
+
+
+@login_required
+@permission_required_custom('can_view_cases')
+def report_job_status(request, job_id):
+    """
+    Show the state of a report job (auto-refreshing while it runs).
+    
+    Permission: Users with can_view_cases permission, own jobs only
+    """
+    job = ReportJobManager.failStaleJob(_get_own_job(request, job_id))
+    return render(request, 'core/report_job_status.html', {'job': job})
+
+
+@login_required
+@permission_required_custom('can_view_cases')
+def report_job_download(request, job_id):
+    """
+    Download the finished PDF of a report job.
+    
+    Permission: Users with can_view_cases permission, own jobs only
+    """
+    job = _get_own_job(request, job_id)
+    if job.status != 'FERTIG' or not job.datei:
+        raise Http404("Report ist noch nicht fertig.")
+    if ReportJobManager.isExpired(job):
+        raise Http404("Report ist abgelaufen, bitte erneut erstellen.")
+    
+    return FileResponse(
+        job.datei.open('rb'),
+        as_attachment=True,
+        filename=job.datei.name.rsplit('/', 1)[-1],
+        content_type='application/pdf',
+    )
@@ -0,0 +1,117 @@
+"""
+Views for the Statistikbogen (annual report).
+
+Reads the materialized tables written by StatistikEngine, so rendering
+never aggregates over the case tables. GET requests only read: a year is
+computed by a POST (statistik_recompute), the background PDF job or
+`manage.py compute_statistik`.
+"""
+
+from django.http import FileResponse
+from django.shortcuts import render, redirect
+from django.urls import reverse
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+
+from core.models import Fall
+from core.services.statistik_engine import StatistikEngine
+from core.services.xlsx_export import XLSX_CONTENT_TYPE, build_statistik_workbook
+from core.services.report_jobs import ReportJobManager
+from core.decorators import permission_required_custom
+
+
+def _get_report_params(params):
+    """Read jahr / beratungsstelle from GET or POST, falling back to sane defaults."""
+    try:
+        jahr = int(params.get('jahr', ''))
+    except ValueError:
+        jahr = timezone.now().year
+    
+    beratungsstelle = params.get('beratungsstelle', '')
+    valid_stellen = [code for code, _label in Fall.BERATUNGSSTELLE_CHOICES]
+    if beratungsstelle not in valid_stellen:
+        beratungsstelle = valid_stellen[0]
+    
+    return jahr, beratungsstelle
+
+
+@login_required
+@permission_required_custom('can_view_cases')
+def statistik_report(request):
+    """
+    Display the Statistikbogen of one Beratungsstelle and year.
+    
+    Permission: Users with can_view_cases permission
+    """
+    jahr, beratungsstelle = _get_report_params(request.GET)
+    
+    # Not computed yet: the page offers the POST button instead of computing here
+    berechnet = StatistikEngine.hasYear(jahr)
+    
+    context = {
+        'jahr': jahr,
+        'beratungsstelle': beratungsstelle,
+        'beratungsstellen': Fall.BERATUNGSSTELLE_CHOICES,
+        'berechnet': berechnet,
+        'report': StatistikEngine.getReport(beratungsstelle, jahr) if berechnet else [],
+    }
+    return render(request, 'core/statistik_report.html', context)
+
+
+@login_required
+@permission_required_custom('can_edit_cases')
+def statistik_recompute(request):
+    """
+    Recompute all Statistikbogen tables of a year (POST only).
+    
+    Permission: Users with can_edit_cases permission
+    """
+    jahr, beratungsstelle = _get_report_params(request.POST)
+    
+    if request.method == 'POST':
+        StatistikEngine.computeYear(jahr)
+        messages.success(request, f'Statistik {jahr} neu berechnet.')
+    
+    return redirect(f"{reverse('core:statistik_report')}?jahr={jahr}&beratungsstelle={beratungsstelle}")
+
+
+@login_required
+@permission_required_custom('can_view_cases')
+def statistik_export_xlsx(request):
+    """
+    Export the Statistikbogen of one Beratungsstelle and year as Excel file.
+    
+    Permission: Users with can_view_cases permission
+    """
+    jahr, beratungsstelle = _get_report_params(request.GET)
+    
+    if not StatistikEngine.hasYear(jahr):
+        messages.error(request, f'Statistik {jahr} wurde noch nicht berechnet.')
+        return redirect(f"{reverse('core:statistik_report')}?jahr={jahr}&beratungsstelle={beratungsstelle}")
+    
+    return FileResponse(
+        build_statistik_workbook(beratungsstelle, jahr),
+        as_attachment=True,
+        filename=f"statistik_{beratungsstelle}_{jahr}.xlsx",
+        content_type=XLSX_CONTENT_TYPE,
+    )
+
+
+@login_required
+@permission_required_custom('can_view_cases')
+@require_POST
+def statistik_pdf(request):
+    """
+    Start rendering the Statistikbogen PDF in the background.
+    
+    Permission: Users with can_view_cases permission
+    """
+    jahr, beratungsstelle = _get_report_params(request.POST)
+    job = ReportJobManager.submitJob(
+        'STATISTIK',
+        {'jahr': jahr, 'beratungsstelle': beratungsstelle},
+        request.user,
+    )
+    return redirect('core:report_job_status', job_id=job.job_id)
@@ -0,0 +1,57 @@
+"""
+Gunicorn settings for the production serving mode (SERVER_MODE=gunicorn / uvicorn
+in entrypoint.sh). Every value can be overridden through the environment.
+
+Graceful reloads: `kill -HUP <master>` restarts the workers one by one after
+their in-flight requests finished (graceful_timeout). With preload_app the
+code is loaded in the master, so a code update needs `kill -USR2 <master>`
+(new master) followed by `kill -TERM <old master>`.
+"""
+import os
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8002')}"
+
+# Upper bound of the default worker count; every worker holds its own copy of
+# the app and its own database connection
+MAX_DEFAULT_WORKERS = 8
+
+
+def default_workers() -> int:
+    """
+    (2 x cores) + 1 is the usual starting point for sync workers. Count the
+    cores this process may run on (a container's cpuset), not the host's.
+    """
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # no sched_getaffinity on macOS
+        cores = os.cpu_count() or 1
+    return min(cores * 2 + 1, MAX_DEFAULT_WORKERS)
+
+
+workers = int(os.getenv('WEB_CONCURRENCY', default_workers()))
+threads = int(os.getenv('GUNICORN_THREADS', '1'))
+
+# SERVER_MODE=uvicorn runs the ASGI app in uvicorn workers under gunicorn
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+
+# Import Django once in the master, workers fork with the app already loaded
+preload_app = True
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = 5
+
+# Recycle workers now and then so slow leaks cannot accumulate
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = 100
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    # a connection opened in the master while preloading must not be shared by workers
+    from django.db import connections
+    connections.close_all()